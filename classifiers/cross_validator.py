@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.metrics import confusion_matrix
+
+from commons.helpers.dataset.splitter import StratifiedSplitter
+from commons.helpers.dtype_policy import as_float_array
+
+
+def _standardize(X_train, X_valid):
+    """ Standardize both sets with the statistics of the training set, in place. """
+    mean = X_train.mean(axis=0)
+    std = X_train.std(axis=0)
+    std[std == 0] = 1.0
+
+    for X in (X_train, X_valid):
+        X -= mean
+        X /= std
+
+    return X_train, X_valid
+
+
+def _discretize(X_train, X_valid, nb_bins=10):
+    """ Discretize both sets into bins spread over the range of the training set. """
+    train_digitized = np.zeros(X_train.shape, dtype=X_train.dtype)
+    valid_digitized = np.zeros(X_valid.shape, dtype=X_valid.dtype)
+
+    for i in range(X_train.shape[1]):
+        bins = np.linspace(X_train[:, i].min(), X_train[:, i].max(), nb_bins)
+        train_digitized[:, i] = np.digitize(X_train[:, i], bins)
+        valid_digitized[:, i] = np.digitize(X_valid[:, i], bins)
+
+    return train_digitized, valid_digitized
+
+
+def _run_fold(features_file, labels_file, fold, train_indices, validation_indices, classifiers, preprocessing, parameters,
+              classes):
+    """ Fit and evaluate every classifier on a fold.
+
+    The fold is preprocessed once, then the preprocessed sets are shared by all the classifiers.
+
+    Args:
+        features_file: The memory-mapped file of the feature vectors.
+        labels_file: The memory-mapped file of the class codes.
+        fold: The number of the fold.
+        train_indices: The indexes of the training set.
+        validation_indices: The indexes of the validation set.
+        classifiers: A dictionary of named classifier wrappers.
+        preprocessing: The name of the preprocessing, or None.
+        parameters: A dictionary of the keyword parameters of the preprocessing.
+        classes: The class codes, in the order of the confusion matrices.
+
+    Returns:
+        A dictionary describing the evaluation of the fold.
+    """
+    features = np.load(features_file, mmap_mode="r")
+    labels = np.load(labels_file, mmap_mode="r")
+
+    start = time.time()
+    X_train, y_train = features[train_indices], labels[train_indices]
+    X_valid, y_valid = features[validation_indices], labels[validation_indices]
+    if preprocessing is not None:
+        X_train, X_valid = CrossValidator.PREPROCESSINGS[preprocessing](X_train, X_valid, **parameters)
+    result = dict(fold=fold, preprocessing_time=time.time() - start, classifiers=dict())
+
+    for name, classifier in classifiers.items():
+        model = clone(classifier.model)
+
+        start = time.time()
+        model.fit(X_train, y_train)
+        fit_time = time.time() - start
+
+        start = time.time()
+        predictions = model.predict(X_valid)
+        predict_time = time.time() - start
+
+        result["classifiers"][name] = dict(fit_time=fit_time, predict_time=predict_time,
+                                           accuracy=np.mean(predictions == y_valid),
+                                           confusion_matrix=confusion_matrix(y_valid, predictions, labels=classes))
+
+    return result
+
+
+class CrossValidator(object):
+    """ Evaluate classifiers with stratified k-fold cross-validation, one worker process per fold.
+
+    The feature matrix is written once to a memory-mapped file, in shared memory when available, and every worker
+    maps it instead of receiving a copy. Workers only receive the indexes of their fold.
+    """
+
+    PREPROCESSINGS = {"standardize": _standardize, "discretize": _discretize}
+
+    def __init__(self, classifiers, nb_folds=10, preprocessing=None, nb_bins=10, n_jobs=-1, random_state=None):
+        """ Initialize the cross-validator.
+
+        Args:
+            classifiers: A dictionary of named classifier wrappers, e.g. {"knn": KNNClassifier(5, "uniform")}. Their
+                         model is cloned for every fold.
+            nb_folds: The number of folds.
+            preprocessing: "standardize", "discretize" or None. The preprocessing is fitted on the training set of
+                           every fold and computed once per fold.
+            nb_bins: The number of bins of the discretization.
+            n_jobs: The number of worker processes, -1 for one per CPU.
+            random_state: A seed used to build the folds.
+        """
+        if preprocessing is not None and preprocessing not in self.PREPROCESSINGS:
+            raise ValueError("Unknown preprocessing: " + str(preprocessing))
+
+        self.classifiers = classifiers
+        self.nb_folds = nb_folds
+        self.preprocessing = preprocessing
+        self.nb_bins = nb_bins
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _get_data(self, data_set):
+        """ Get the feature vectors and the class codes of a data set.
+
+        Args:
+            data_set: A DataSet, or a DataSets object whose training and validation sets are merged.
+
+        Returns:
+            A tuple containing the feature vectors, in the feature floating point type, and the 1-D class codes.
+
+        Raises:
+            ValueError: If the feature vectors are a sparse matrix, which cannot be shared as a memory-mapped file.
+        """
+        parts = (data_set.train, data_set.valid) if hasattr(data_set, "train") else (data_set,)
+        if any(sparse.issparse(part.get_features) for part in parts):
+            raise ValueError("Sparse feature vectors cannot be cross-validated: load them as a dense array, e.g. with "
+                             "SpamDataSetFeatureStrategy(sparse=False), or convert them with toarray().")
+
+        if hasattr(data_set, "train"):
+            features = np.concatenate((data_set.train.get_features, data_set.valid.get_features))
+            labels = np.concatenate((data_set.train.get_labels, data_set.valid.get_labels))
+        else:
+            features = data_set.get_features
+            labels = data_set.get_labels
+
+        labels = np.asarray(labels)
+        if labels.ndim == 2 and labels.shape[1] > 1:
+            labels = labels.argmax(axis=1)
+
+        return as_float_array(np.asarray(features), copy=False), labels.ravel()
+
+    def run(self, data_set):
+        """ Cross-validate every classifier.
+
+        Args:
+            data_set: A DataSet, or a DataSets object whose training and validation sets are merged.
+
+        Returns:
+            A dictionary with the results of every fold ("folds"), the classes of the confusion matrices ("classes"),
+            the mean accuracy of every classifier ("mean_accuracy") and the total confusion matrices ("confusion_matrix").
+        """
+        features, labels = self._get_data(data_set)
+        classes = np.unique(labels)
+        folds = StratifiedSplitter(self.random_state).kfold(labels, self.nb_folds)
+        parameters = dict(nb_bins=self.nb_bins) if self.preprocessing == "discretize" else dict()
+
+        shared_directory = tempfile.mkdtemp(dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+        try:
+            features_file = os.path.join(shared_directory, "features.npy")
+            labels_file = os.path.join(shared_directory, "labels.npy")
+            np.save(features_file, features)
+            np.save(labels_file, labels)
+
+            results = Parallel(n_jobs=self.n_jobs)(
+                delayed(_run_fold)(features_file, labels_file, fold, train_indices, validation_indices,
+                                   self.classifiers, self.preprocessing, parameters, classes)
+                for fold, (train_indices, validation_indices) in enumerate(folds))
+        finally:
+            shutil.rmtree(shared_directory, ignore_errors=True)
+
+        report = dict(folds=results, classes=classes, mean_accuracy=dict(), confusion_matrix=dict())
+        for name in self.classifiers:
+            report["mean_accuracy"][name] = np.mean([result["classifiers"][name]["accuracy"] for result in results])
+            report["confusion_matrix"][name] = sum(result["classifiers"][name]["confusion_matrix"]
+                                                   for result in results)
+
+        return report
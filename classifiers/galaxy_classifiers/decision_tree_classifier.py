@@ -17,6 +17,8 @@ Group :
 
 from sklearn.tree import DecisionTreeClassifier
 
+from commons.helpers.dtype_policy import standardize
+
 
 class TreeClassifier(object):
     """ An object containing a decision tree classifier. """
@@ -24,18 +26,38 @@ class TreeClassifier(object):
     def __init__(self):
         self.model = DecisionTreeClassifier(max_depth=3)
 
-    def standardize(self, X):
+    def standardize(self, X, copy=True):
         """ Standardize the data.
 
         Args:
             X: The input vector [n_sample, n_feature].
+            copy: If False, X may be standardized in place.
 
         Returns:
             X: The input vector with standardized values.
         """
+        return standardize(X, copy)
+
+    def train(self, X, y):
+        """ Train the decision tree.
 
-        mean = X.mean(axis=0)
-        std = X.std(axis=0)
-        X = ((X - mean) / std)
+        Args:
+            X: The input vector [n_sample, n_feature].
+            y: The labels [n_sample].
+
+        Returns:
+            The classifier itself.
+        """
+        self.model.fit(X, y)
+        return self
 
-        return X
\ No newline at end of file
+    def predict(self, X):
+        """ Predict the class of samples.
+
+        Args:
+            X: The input vector [n_sample, n_feature].
+
+        Returns:
+            The predicted classes [n_sample].
+        """
+        return self.model.predict(X)
@@ -17,6 +17,8 @@ Group :
 
 from sklearn.naive_bayes import GaussianNB
 
+from commons.helpers.dtype_policy import standardize
+
 
 class GaussianNaiveBayesClassifier(object):
     """ A Naive Bayes Classifier object."""
@@ -24,18 +26,14 @@ class GaussianNaiveBayesClassifier(object):
     def __init__(self, priors):
         self.model = GaussianNB(priors=priors)
 
-    def standardize(self, X):
+    def standardize(self, X, copy=True):
         """ Standardize the data.
 
         Args:
             X: The input vector [n_sample, n_feature].
+            copy: If False, X may be standardized in place.
 
         Returns:
             X: The input vector with standardized values.
         """
-
-        mean = X.mean(axis=0)
-        std = X.std(axis=0)
-        X = ((X - mean) / std)
-
-        return X
\ No newline at end of file
+        return standardize(X, copy)
@@ -17,6 +17,8 @@ Group :
 
 from sklearn.neighbors import KNeighborsClassifier
 
+from commons.helpers.dtype_policy import standardize
+
 
 class KNNClassifier(object):
     """ An object containing a decision tree classifier. """
@@ -26,18 +28,14 @@ class KNNClassifier(object):
         self.model.n_neighbors = nb_neighbors
         self.model.weights = weights
 
-    def standardize(self, X):
+    def standardize(self, X, copy=True):
         """ Standardize the data.
 
         Args:
             X: The input vector [n_sample, n_feature].
+            copy: If False, X may be standardized in place.
 
         Returns:
             X: The input vector with standardized values.
         """
-
-        mean = X.mean(axis=0)
-        std = X.std(axis=0)
-        X = ((X - mean) / std)
-
-        return X
\ No newline at end of file
+        return standardize(X, copy)
@@ -19,6 +19,8 @@ from __future__ import division, print_function, absolute_import
 
 from sklearn.svm import LinearSVC
 
+from commons.helpers.dtype_policy import standardize
+
 
 class LinearSVMClassifier(object):
     """ An object containing a linear support vector machine classifier. """
@@ -28,18 +30,15 @@ class LinearSVMClassifier(object):
         self.model.C = C
         self.model.class_weight = class_weight
 
-    def standardize(self, X):
+    def standardize(self, X, copy=True):
         """ Standardize the data.
 
         Args:
-            X: The input vector [n_sample, n_feature].
+            X: The input vector [n_sample, n_feature], dense or sparse.
+            copy: If False, X may be standardized in place.
 
         Returns:
             X: The input vector with standardized values.
         """
 
-        mean = X.mean(axis=0)
-        std = X.std(axis=0)
-        X = ((X - mean) / std)
-
-        return X
\ No newline at end of file
+        return standardize(X, copy)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+from __future__ import division, print_function, absolute_import
+
+import threading
+import time
+from concurrent.futures import Future
+from queue import Empty, Queue
+
+import numpy as np
+import tensorflow as tf
+
+# TensorFlow 2 keeps the graph and session API of TensorFlow 1 in tf.compat.v1.
+if hasattr(tf, "compat") and hasattr(tf.compat, "v1"):
+    tf = tf.compat.v1
+
+
+class MLPInferenceServer(object):
+    """ Score feature vectors with a SavedModel exported by MLPClassifierTensorBoard.
+
+    The model is loaded once in a dedicated session which stays open. Concurrent requests are grouped into
+    micro-batches by a background thread, up to a maximum batch size or a maximum waiting time.
+    """
+
+    def __init__(self, export_dir, signature_key=tf.saved_model.signature_constants.DEFAULT_SERVING_SIGNATURE_DEF_KEY,
+                 tags=(tf.saved_model.tag_constants.TRAINING,), max_batch_size=256, max_latency=0.005,
+                 keep_probability_name="input/dropout_keep_probability:0"):
+        """ Load the model and start serving.
+
+        Args:
+            export_dir: The directory of the SavedModel, e.g. MLPClassifierTensorBoard.get_export_path() + "/saved_model".
+            signature_key: The key of the signature to serve.
+            tags: The tags of the meta graph to load.
+            max_batch_size: The maximum number of feature vectors scored at once.
+            max_latency: The maximum time, in seconds, a request waits for other requests to fill a batch.
+            keep_probability_name: The name of the dropout keep probability placeholder, fed with 1.0 if it exists.
+        """
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+        self._graph = tf.Graph()
+        self._session = tf.Session(graph=self._graph)
+        meta_graph = tf.saved_model.loader.load(self._session, list(tags), export_dir)
+        signature = meta_graph.signature_def[signature_key]
+
+        # The served signature has a single input, the feature vectors.
+        input_info = list(signature.inputs.values())[0]
+        self._input = self._graph.get_tensor_by_name(input_info.name)
+        self._outputs = {key: self._graph.get_tensor_by_name(info.name) for key, info in signature.outputs.items()}
+
+        # The width of the input layer is read from the model instead of being hard-coded.
+        self.number_of_features = self._input.shape.as_list()[1]
+
+        self._constant_feed = dict()
+        try:
+            self._constant_feed[self._graph.get_tensor_by_name(keep_probability_name)] = 1.0
+        except KeyError:
+            pass
+
+        self._requests = Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._worker = threading.Thread(target=self._serve, name="MLPInferenceServer")
+        self._worker.daemon = True
+        self._worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def predict(self, X):
+        """ Score a batch of feature vectors synchronously.
+
+        Args:
+            X: The feature vectors [n_sample, n_feature].
+
+        Returns:
+            A dictionary mapping the signature output keys to their values.
+        """
+        feed_dict = dict(self._constant_feed)
+        feed_dict[self._input] = X
+
+        return self._session.run(self._outputs, feed_dict=feed_dict)
+
+    def submit(self, X):
+        """ Schedule the scoring of feature vectors.
+
+        Args:
+            X: A feature vector [n_feature] or a few feature vectors [n_sample, n_feature].
+
+        Returns:
+            A Future whose result is a dictionary mapping the signature output keys to the values of these samples.
+
+        Raises:
+            RuntimeError: If the server is closed.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        if X.shape[1] != self.number_of_features:
+            raise ValueError("Expected feature vectors of size %d, got %d." % (self.number_of_features, X.shape[1]))
+
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The inference server is closed.")
+            self._requests.put((X, future))
+
+        return future
+
+    def close(self):
+        """ Stop serving, once the pending requests are answered, and release the session.
+
+        Requests submitted after close are rejected, and a request which is still queued when the server stops is
+        failed with a RuntimeError.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._requests.put(None)
+
+        self._worker.join()
+        self._session.close()
+
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except Empty:
+                break
+            if request is not None:
+                request[1].set_exception(RuntimeError("The inference server is closed."))
+
+    def _next_batch(self):
+        """ Gather the next micro-batch of requests.
+
+        Returns:
+            A tuple containing the list of requests and a boolean, True if the server must stop afterwards.
+        """
+        request = self._requests.get()
+        if request is None:
+            return [], True
+
+        batch = [request]
+        size = request[0].shape[0]
+        deadline = time.time() + self.max_latency
+
+        while size < self.max_batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=timeout)
+            except Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+            size += request[0].shape[0]
+
+        return batch, False
+
+    def _serve(self):
+        """ Answer the requests, one micro-batch at a time. """
+        stop = False
+
+        while not stop:
+            batch, stop = self._next_batch()
+            if not batch:
+                continue
+
+            X = np.concatenate([request[0] for request in batch])
+            try:
+                outputs = self.predict(X)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            # Split the outputs back between the requests.
+            start = 0
+            for samples, future in batch:
+                end = start + samples.shape[0]
+                future.set_result({key: value[start:end] for key, value in outputs.items()})
+                start = end
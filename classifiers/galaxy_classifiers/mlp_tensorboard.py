@@ -17,13 +17,20 @@ Group :
 
 from __future__ import division, print_function, absolute_import
 
+import numpy as np
 import tensorflow as tf
 import os
 
+# TensorFlow 2 keeps the graph and session API of TensorFlow 1 in tf.compat.v1.
+if hasattr(tf, "compat") and hasattr(tf.compat, "v1"):
+    tf = tf.compat.v1
+
 
 class MLPClassifierTensorBoard(object):
     def __init__(self, number_of_classes, batch_size, number_of_steps,learning_rate, image_size=424, number_of_channels=3,
-                 dropout__keep_probability=0.5, train_path='/tmp'):
+                 dropout__keep_probability=0.5, train_path='/tmp', input_mode="feed_dict", evaluation_frequency=10,
+                 summary_frequency=1, trace_frequency=100, number_of_parallel_calls=4, prefetch_buffer_size=2,
+                 shuffle_buffer_size=10000, number_of_features=None, export_path=None, hidden_units=(100,)):
 
         """ Initialize the default parameters of a Multi-Layer Perceptron.
 
@@ -34,6 +41,18 @@ class MLPClassifierTensorBoard(object):
             number_of_steps: The number of learning steps to run the training.
             learning_rate: The desired learning rate.
             train_path: The path in which the TensorBoard data will be saved.
+            input_mode: "feed_dict" to feed every step from Python, "dataset" to stream the training data through a
+                        tf.data input pipeline.
+            evaluation_frequency: The number of steps between two evaluations on the validation set (0 to disable).
+            summary_frequency: The number of steps between two training summaries (0 to disable).
+            trace_frequency: The number of steps between two FULL_TRACE runs (0 to disable).
+            number_of_parallel_calls: The number of elements parsed in parallel by the input pipeline.
+            prefetch_buffer_size: The number of batches prepared in advance by the input pipeline.
+            shuffle_buffer_size: The number of elements from which the input pipeline samples the next one.
+            number_of_features: The size of a feature vector. If None, it is inferred from the training set.
+            export_path: The directory in which the SavedModel is exported. Defaults to
+                         $VIRTUAL_ENV/data/models/exports/MLP.
+            hidden_units: The number of neurons of every hidden layer.
         """
 
         self.number_of_classes = number_of_classes
@@ -44,43 +63,228 @@ class MLPClassifierTensorBoard(object):
         self.dropout_probability = dropout__keep_probability
         self.learning_rate = learning_rate
         self.train_path = train_path
+        self.input_mode = input_mode
+        self.evaluation_frequency = evaluation_frequency
+        self.summary_frequency = summary_frequency
+        self.trace_frequency = trace_frequency
+        self.number_of_parallel_calls = number_of_parallel_calls
+        self.prefetch_buffer_size = prefetch_buffer_size
+        self.shuffle_buffer_size = shuffle_buffer_size
+        self.number_of_features = number_of_features
+        self.export_path = export_path
+        self.hidden_units = tuple(hidden_units)
+
+    @staticmethod
+    def write_binary_features(features, labels, filename):
+        """ Write feature vectors and their labels to a binary feature file.
+
+        Each record holds the float32 feature values followed by the class code stored as a float32.
+
+        Args:
+            features: The feature vectors [n_sample, n_feature].
+            labels: The associated labels, as class codes or one-hot vectors.
+            filename: The path of the binary feature file.
+        """
+        labels = np.asarray(labels)
+        if labels.ndim == 2 and labels.shape[1] > 1:
+            labels = labels.argmax(axis=1)
+
+        records = np.empty((features.shape[0], features.shape[1] + 1), dtype=np.float32)
+        records[:, :-1] = features
+        records[:, -1] = labels.ravel()
+        records.tofile(filename)
+
+    def _make_dataset(self, number_of_features, binary_file=None):
+        """ Build the training input pipeline.
+
+        Args:
+            number_of_features: The size of a feature vector.
+            binary_file: The path of a binary feature file written by write_binary_features. If None, the pipeline
+                         reads the arrays fed to the "features" and "labels" placeholders when it is initialized.
+
+        Returns:
+            A tuple containing the iterator and the feed dictionary used to initialize it.
+        """
+
+        def parse_record(record):
+            values = tf.decode_raw(record, tf.float32)
+            label = tf.cast(values[number_of_features], tf.int32)
+            return values[:number_of_features], tf.one_hot(label, self.number_of_classes)
+
+        def parse_arrays(features, labels):
+            return tf.cast(features, tf.float32), tf.cast(labels, tf.float32)
+
+        if binary_file is not None:
+            dataset = tf.data.FixedLengthRecordDataset(binary_file, record_bytes=(number_of_features + 1) * 4)
+            parse = parse_record
+            initializer_feed = None
+        else:
+            features = tf.placeholder(tf.float32, [None, number_of_features], name="features")
+            labels = tf.placeholder(tf.float32, [None, self.number_of_classes], name="labels")
+            dataset = tf.data.Dataset.from_tensor_slices((features, labels))
+            parse = parse_arrays
+            initializer_feed = features, labels
+
+        dataset = dataset.shuffle(self.shuffle_buffer_size).repeat()
+        dataset = dataset.map(parse, num_parallel_calls=self.number_of_parallel_calls)
+        dataset = dataset.batch(self.batch_size).prefetch(self.prefetch_buffer_size)
+
+        return tf.data.make_initializable_iterator(dataset), initializer_feed
+
+    def _get_number_of_features(self, dataset, binary_file=None):
+        """ Get the size of the input layer.
+
+        Args:
+            dataset: The DataSets object containing the training and validation sets.
+            binary_file: The binary feature file the training set is streamed from, if any.
+
+        Returns:
+            The configured number of features, or the width of the training feature vectors.
+        """
+        if self.number_of_features is not None:
+            return self.number_of_features
+
+        if binary_file is not None:
+            raise ValueError("number_of_features must be set to stream the training set from a binary feature file.")
+
+        return dataset.train.get_features.shape[1]
+
+    def get_export_path(self):
+        """ Get the directory in which the SavedModel is exported. """
+        if self.export_path is not None:
+            return self.export_path
+
+        return os.environ["VIRTUAL_ENV"] + "/data/models/exports/MLP"
 
-    def train(self, dataset):
-        with tf.Session(graph=tf.Graph()) as sess:
+    @staticmethod
+    def _dense(inputs, units):
+        """ Build a fully connected layer, without activation.
+
+        Args:
+            inputs: The input tensor [n_sample, n_input].
+            units: The number of neurons of the layer.
+
+        Returns:
+            The output tensor [n_sample, units].
+        """
+        number_of_inputs = inputs.shape.as_list()[1]
+        weights = tf.Variable(tf.truncated_normal([number_of_inputs, units], stddev=1.0 / np.sqrt(number_of_inputs)),
+                              name="weights")
+        biases = tf.Variable(tf.zeros([units]), name="biases")
+
+        return tf.matmul(inputs, weights) + biases
+
+    @staticmethod
+    def _is_step(step, frequency):
+        """ Check if a periodic action must be run at a given step (never if the frequency is 0 or None). """
+        return bool(frequency) and step % frequency == 0
+
+    def train(self, dataset, binary_file=None):
+        """ Train the Multi-Layer Perceptron.
+
+        Args:
+            dataset: The DataSets object containing the training and validation sets.
+            binary_file: In "dataset" input mode, an optional binary feature file to stream the training set from.
+        """
+        number_of_features = self._get_number_of_features(dataset, binary_file)
+
+        def feed_dict(train):
+            """ Build the feed dictionary of a training step or of an evaluation on the validation set. """
+            if train:
+                if self.input_mode == "dataset":
+                    return {keep_prob: self.dropout_probability}
+                xs, ys = dataset.train.next_feature_batch(self.batch_size)
+                k = self.dropout_probability
+            else:
+                xs, ys = dataset.valid.get_features, dataset.valid.get_labels
+                k = 1.0
+            return {X: xs, y_: ys, keep_prob: k}
+
+        with tf.Graph().as_default() as graph, tf.Session(graph=graph) as sess:
 
             with tf.name_scope("input"):
-                X = tf.placeholder("float", [None, 74], name="X")
-                y_ = tf.placeholder("float", [None, self.number_of_classes], name="y_ground_truth")
+                if self.input_mode == "dataset":
+                    iterator, initializer_feed = self._make_dataset(number_of_features, binary_file)
+                    next_features, next_labels = iterator.get_next()
+
+                    # The training steps read from the pipeline, the evaluations still feed the validation set.
+                    X = tf.placeholder_with_default(next_features, [None, number_of_features], name="X")
+                    y_ = tf.placeholder_with_default(next_labels, [None, self.number_of_classes],
+                                                     name="y_ground_truth")
+                else:
+                    X = tf.placeholder("float", [None, number_of_features], name="X")
+                    y_ = tf.placeholder("float", [None, self.number_of_classes], name="y_ground_truth")
                 keep_prob = tf.placeholder(tf.float32, name="dropout_keep_probability")
 
+            # Hidden layers, with dropout, then the output layer.
+            layer = X
+            for j, units in enumerate(self.hidden_units):
+                with tf.name_scope("hidden_%d" % (j + 1)):
+                    layer = tf.nn.dropout(tf.nn.relu(self._dense(layer, units)), rate=1.0 - keep_prob)
+            with tf.name_scope("output"):
+                logits = self._dense(layer, self.number_of_classes)
+                y = tf.nn.softmax(logits, name="y")
+                scores = y
+                predictions = tf.argmax(logits, 1, name="predictions")
+                prediction_classes = tf.as_string(predictions, name="prediction_classes")
+
+            with tf.name_scope("loss"):
+                loss = tf.reduce_mean(tf.nn.softmax_cross_entropy_with_logits_v2(labels=y_, logits=logits))
+                tf.summary.scalar("cross_entropy", loss)
+
+            with tf.name_scope("accuracy"):
+                correct_predictions = tf.equal(predictions, tf.argmax(y_, 1))
+                accuracy = tf.reduce_mean(tf.cast(correct_predictions, tf.float32))
+                tf.summary.scalar("accuracy", accuracy)
+
+            with tf.name_scope("train"):
+                train_step = tf.train.AdamOptimizer(self.learning_rate).minimize(loss)
+
+            merged = tf.summary.merge_all()
+            train_writer = tf.summary.FileWriter(self.train_path + "/train", sess.graph)
+            test_writer = tf.summary.FileWriter(self.train_path + "/test")
+            saver = tf.train.Saver()
+
+            sess.run(tf.global_variables_initializer())
+
+            if self.input_mode == "dataset":
+                if initializer_feed is not None:
+                    features, labels = initializer_feed
+                    sess.run(iterator.initializer, feed_dict={features: dataset.train.get_features,
+                                                              labels: dataset.train.get_labels})
+                else:
+                    sess.run(iterator.initializer)
+
             # Training loop
             for i in range(self.number_of_steps):
-                    if i % 10 == 0:  # Record summaries and test-set accuracy
-                        dict = feed_dict(False)
-
+                    if self._is_step(i, self.evaluation_frequency):  # Record summaries and test-set accuracy
                         summary, train_accuracy, train_scores, train_prediction = sess.run(
-                            [merged, accuracy, scores, predictions], feed_dict=dict)
+                            [merged, accuracy, scores, predictions], feed_dict=feed_dict(False))
                         test_writer.add_summary(summary, i)
                         print('Accuracy at step %s: %s' % (i, train_accuracy))
 
-                    else:  # Record train set summaries, and train
-                        if i % 100 == 99:  # Record execution stats
-                            run_options = tf.RunOptions(trace_level=tf.RunOptions.FULL_TRACE)
-                            run_metadata = tf.RunMetadata()
-                            summary, _ = sess.run([merged, train_step],
-                                                  feed_dict=feed_dict(True),
-                                                  options=run_options,
-                                                  run_metadata=run_metadata)
-                            train_writer.add_run_metadata(run_metadata, '-step%04d' % i)
-                            train_writer.add_summary(summary, i)
-                            print('Adding run metadata for', i)
-
-                        else:  # Record a summary
-                            summary, _ = sess.run([merged, train_step], feed_dict=feed_dict(True))
-                            train_writer.add_summary(summary, i)
-            
-            saver.save(sess, os.environ["VIRTUAL_ENV"] + "/data/models/exports/MLP/my_mlp/my_mlp_test")
-            
+                    elif self._is_step(i + 1, self.trace_frequency):  # Record execution stats
+                        run_options = tf.RunOptions(trace_level=tf.RunOptions.FULL_TRACE)
+                        run_metadata = tf.RunMetadata()
+                        summary, _ = sess.run([merged, train_step],
+                                              feed_dict=feed_dict(True),
+                                              options=run_options,
+                                              run_metadata=run_metadata)
+                        train_writer.add_run_metadata(run_metadata, '-step%04d' % i)
+                        train_writer.add_summary(summary, i)
+                        print('Adding run metadata for', i)
+
+                    elif self._is_step(i, self.summary_frequency):  # Record a summary
+                        summary, _ = sess.run([merged, train_step], feed_dict=feed_dict(True))
+                        train_writer.add_summary(summary, i)
+
+                    else:  # Train only
+                        sess.run(train_step, feed_dict=feed_dict(True))
+
+            if not os.path.isdir(self.get_export_path() + "/my_mlp"):
+                os.makedirs(self.get_export_path() + "/my_mlp")
+            saver.save(sess, self.get_export_path() + "/my_mlp/my_mlp_test")
+
             # Build the signature_def_map.
             classification_inputs = tf.saved_model.utils.build_tensor_info(X)
             classification_outputs_classes = tf.saved_model.utils.build_tensor_info(prediction_classes)
@@ -108,6 +312,7 @@ class MLPClassifierTensorBoard(object):
                     method_name=tf.saved_model.signature_constants.PREDICT_METHOD_NAME))
 
             legacy_init_op = tf.group(tf.tables_initializer(), name='legacy_init_op')
+            builder = tf.saved_model.builder.SavedModelBuilder(self.get_export_path() + "/saved_model")
             builder.add_meta_graph_and_variables(
                 sess, [tf.saved_model.tag_constants.TRAINING],
                 signature_def_map={
@@ -17,6 +17,8 @@ Group :
 
 from sklearn.naive_bayes import MultinomialNB
 
+from commons.helpers.dtype_policy import standardize
+
 
 class MultinomialNaiveBayesClassifier(object):
     """ A Naive Bayes Classifier object."""
@@ -24,18 +26,15 @@ class MultinomialNaiveBayesClassifier(object):
     def __init__(self, alpha=1.0, fit_prior=False):
         self.model = MultinomialNB(alpha=alpha, fit_prior=fit_prior)
 
-    def standardize(self, X):
+    def standardize(self, X, copy=True):
         """ Standardize the data.
 
         Args:
-            X: The input vector [n_sample, n_feature].
+            X: The input vector [n_sample, n_feature], dense or sparse.
+            copy: If False, X may be standardized in place.
 
         Returns:
             X: The input vector with standardized values.
         """
 
-        mean = X.mean(axis=0)
-        std = X.std(axis=0)
-        X = ((X - mean) / std)
-
-        return X
\ No newline at end of file
+        return standardize(X, copy)
@@ -19,6 +19,8 @@ from __future__ import division, print_function, absolute_import
 
 from sklearn.svm import SVC
 
+from commons.helpers.dtype_policy import standardize
+
 
 class SVMClassifier(object):
 
@@ -27,18 +29,14 @@ class SVMClassifier(object):
         self.model.C = C
         self.model.gamma = gamma
 
-    def standardize(self, X):
+    def standardize(self, X, copy=True):
         """ Standardize the data.
 
         Args:
             X: The input vector [n_sample, n_feature].
+            copy: If False, X may be standardized in place.
 
         Returns:
             X: The input vector with standardized values.
         """
-
-        mean = X.mean(axis=0)
-        std = X.std(axis=0)
-        X = ((X - mean) / std)
-
-        return X
+        return standardize(X, copy)
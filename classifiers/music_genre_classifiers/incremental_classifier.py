@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+from commons.helpers.dataset.strategies.music_genre_dataset.song_features_strategy import MusicGenreStrategy
+
+
+class IncrementalClassifier(object):
+    """ Train a model on a music genre data set one chunk of songs at a time.
+
+    The model must implement partial_fit, e.g. SGDClassifier, Perceptron, MultinomialNB or GaussianNB. A first pass
+    over the file collects the genres and accumulates the standardization statistics, then every training epoch
+    streams the file again. Only one chunk of songs is in memory at once.
+    """
+
+    def __init__(self, model, standardize=True, chunk_size=10000, nb_epochs=1, strategy=None):
+        """ Initialize the classifier.
+
+        Args:
+            model: A scikit-learn estimator implementing partial_fit.
+            standardize: If True, features are standardized with statistics accumulated over the whole file.
+                         Must be False for MultinomialNB, which requires non-negative features.
+            chunk_size: The number of songs read at once.
+            nb_epochs: The number of passes over the file during training.
+            strategy: The strategy used to read the file. Defaults to a MusicGenreStrategy.
+        """
+        self.model = model
+        self.standardize = standardize
+        self.scaler = None
+        self.chunk_size = chunk_size
+        self.nb_epochs = nb_epochs
+        self.strategy = strategy if strategy is not None else MusicGenreStrategy()
+        self.classes = None
+
+    def _transform(self, X):
+        """ Standardize feature vectors with the accumulated statistics, if standardization is enabled. """
+        if self.scaler is None:
+            return X
+
+        return self.scaler.transform(X)
+
+    def _encode(self, labels):
+        """ Encode raw labels into integers in the same order as a scikit-learn LabelEncoder. """
+        return np.searchsorted(self.classes, labels)
+
+    def _scan(self, csv_file):
+        """ Collect the genres and the standardization statistics of a file in a single pass.
+
+        Args:
+            csv_file: The path to the CSV file containing the songs.
+        """
+        classes = set()
+
+        for features, labels in self.strategy.read_chunks(csv_file, self.chunk_size):
+            classes.update(np.unique(labels))
+            if self.scaler is not None:
+                self.scaler.partial_fit(features)
+
+        self.classes = np.array(sorted(classes))
+
+    def train(self, csv_file):
+        """ Train the model on every song of a file.
+
+        Args:
+            csv_file: The path to the CSV file containing the songs.
+
+        Returns:
+            The classifier itself.
+        """
+        # A fresh scaler, so that the statistics of a previous training are not folded in.
+        self.scaler = StandardScaler() if self.standardize else None
+        self._scan(csv_file)
+        class_codes = np.arange(len(self.classes))
+
+        for epoch in range(self.nb_epochs):
+            for features, labels in self.strategy.read_chunks(csv_file, self.chunk_size):
+                self.model.partial_fit(self._transform(features), self._encode(labels), classes=class_codes)
+
+        return self
+
+    def predict(self, X):
+        """ Predict the genre of songs.
+
+        Args:
+            X: The feature vectors [n_song, n_feature].
+
+        Returns:
+            The predicted genres.
+        """
+        return self.classes[self.model.predict(self._transform(X))]
+
+    def score(self, csv_file):
+        """ Compute the accuracy of the model on every song of a file, one chunk at a time.
+
+        Args:
+            csv_file: The path to the CSV file containing the songs.
+
+        Returns:
+            The mean accuracy.
+
+        Raises:
+            ValueError: If the file contains no song.
+        """
+        nb_correct = 0
+        nb_songs = 0
+
+        for features, labels in self.strategy.read_chunks(csv_file, self.chunk_size):
+            nb_correct += np.sum(self.predict(features) == labels)
+            nb_songs += labels.shape[0]
+
+        if nb_songs == 0:
+            raise ValueError("No song to score in " + csv_file + ".")
+
+        return nb_correct / float(nb_songs)
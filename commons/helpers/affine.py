@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import numpy as np
+
+
+def compose(matrix1, matrix2):
+    """ Composes affine transformations.
+
+    Compute the resulting transformation matrix based on two supplied transformation matrix.
+
+    Args:
+        matrix1: The first matrix transform.
+        matrix2: The second matrix transform.
+
+    Returns:
+        The composition matrix of the affine transforms.
+    """
+    n1 = np.eye(3, dtype='float32')
+    n2 = np.eye(3, dtype='float32')
+    n1[:2] = matrix1
+    n2[:2] = matrix2
+    n3 = np.dot(n1, n2)
+
+    return n3[:2]
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from scipy.fftpack import dct
+from scipy.io import wavfile
+
+
+class AudioFeatureExtractor(object):
+    """ Extract song features from WAV files.
+
+    Each file is cut into overlapping frames. For every frame, the extractor computes the MFCC, the spectral centroid,
+    the spectral rolloff, the zero-crossing rate and the chroma vector. A song is then described by the mean and the
+    standard deviation of these frame features.
+    """
+
+    def __init__(self, frame_length=2048, hop_length=512, nb_mfcc=13, nb_mel_bands=40, rolloff_percent=0.85,
+                 block_frames=1024):
+        """ Initialize the extractor.
+
+        Args:
+            frame_length: The number of samples of a frame.
+            hop_length: The number of samples between the beginning of two consecutive frames.
+            nb_mfcc: The number of MFCC coefficients.
+            nb_mel_bands: The number of bands of the Mel filter bank.
+            rolloff_percent: The fraction of the spectral energy below the rolloff frequency.
+            block_frames: The number of frames processed at once when streaming a file.
+        """
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.nb_mfcc = nb_mfcc
+        self.nb_mel_bands = nb_mel_bands
+        self.rolloff_percent = rolloff_percent
+        self.block_frames = block_frames
+        self.nb_chroma = 12
+
+        self._window = np.hanning(frame_length).astype(np.float32)
+        self._filter_banks = dict()
+
+    @property
+    def feature_names(self):
+        """ The names of the features of a song, in the order of the feature vector. """
+        names = ["mfcc_%d" % i for i in range(self.nb_mfcc)] + ["spectral_centroid", "spectral_rolloff",
+                                                                 "zero_crossing_rate"]
+        names += ["chroma_%d" % i for i in range(self.nb_chroma)]
+
+        return [statistic + "_" + name for statistic in ("mean", "std") for name in names]
+
+    def _get_filter_banks(self, sample_rate):
+        """ Build, or get from the cache, the filter banks for a sample rate.
+
+        Args:
+            sample_rate: The sample rate of the signal.
+
+        Returns:
+            A tuple containing the frequencies of the FFT bins, the Mel filter bank [nb_bins, nb_mel_bands] and
+            the chroma filter bank [nb_bins, 12].
+        """
+        if sample_rate in self._filter_banks:
+            return self._filter_banks[sample_rate]
+
+        frequencies = np.fft.rfftfreq(self.frame_length, 1.0 / sample_rate).astype(np.float32)
+
+        # Triangular filters evenly spaced on the Mel scale.
+        mel_max = 2595.0 * np.log10(1.0 + (sample_rate / 2.0) / 700.0)
+        hz_points = 700.0 * (10.0 ** (np.linspace(0.0, mel_max, self.nb_mel_bands + 2) / 2595.0) - 1.0)
+        lower, center, upper = hz_points[:-2], hz_points[1:-1], hz_points[2:]
+        rising = (frequencies[:, np.newaxis] - lower) / (center - lower)
+        falling = (upper - frequencies[:, np.newaxis]) / (upper - center)
+        mel_bank = np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+        # Each FFT bin contributes to the pitch class of its closest note.
+        chroma_bank = np.zeros((frequencies.shape[0], self.nb_chroma), dtype=np.float32)
+        audible = frequencies > 0
+        notes = np.round(12.0 * np.log2(frequencies[audible] / 440.0) + 69.0).astype(int) % self.nb_chroma
+        chroma_bank[np.nonzero(audible)[0], notes] = 1.0
+
+        self._filter_banks[sample_rate] = frequencies, mel_bank, chroma_bank
+
+        return self._filter_banks[sample_rate]
+
+    def _to_mono(self, samples):
+        """ Convert samples to a mono float32 signal in [-1, 1].
+
+        Args:
+            samples: The samples [n_sample] or [n_sample, n_channel], as read from a WAV file.
+
+        Returns:
+            A 1-D float32 array.
+        """
+        if np.issubdtype(samples.dtype, np.integer):
+            info = np.iinfo(samples.dtype)
+            # Half the number of levels, so that unsigned samples, centered on their offset, are also in [-1, 1].
+            scale = 2.0 / (float(info.max) - float(info.min) + 1)
+            offset = (info.max + info.min + 1) // 2
+            signal = (samples.astype(np.float32) - offset) * scale
+        else:
+            signal = samples.astype(np.float32)
+
+        if signal.ndim == 2:
+            signal = signal.mean(axis=1)
+
+        return signal
+
+    def frame(self, signal):
+        """ Cut a signal into overlapping frames without copying it.
+
+        Args:
+            signal: A 1-D array of at least frame_length samples.
+
+        Returns:
+            A read-only view [n_frame, frame_length] on the signal.
+        """
+        nb_frames = 1 + (signal.shape[0] - self.frame_length) // self.hop_length
+        stride = signal.strides[0]
+
+        frames = as_strided(signal, shape=(nb_frames, self.frame_length), strides=(self.hop_length * stride, stride))
+        frames.flags.writeable = False
+
+        return frames
+
+    def frame_features(self, frames, sample_rate):
+        """ Compute the features of a batch of frames.
+
+        Args:
+            frames: The frames [n_frame, frame_length].
+            sample_rate: The sample rate of the signal.
+
+        Returns:
+            The frame features [n_frame, nb_mfcc + 3 + 12].
+        """
+        frequencies, mel_bank, chroma_bank = self._get_filter_banks(sample_rate)
+        epsilon = 1e-10
+
+        # One batched FFT for all the frames.
+        magnitude = np.abs(np.fft.rfft(frames * self._window, axis=1)).astype(np.float32)
+        power = magnitude ** 2
+        magnitude_sum = magnitude.sum(axis=1) + epsilon
+
+        mfcc = dct(np.log(power.dot(mel_bank) + epsilon), type=2, axis=1, norm="ortho")[:, :self.nb_mfcc]
+
+        centroid = magnitude.dot(frequencies) / magnitude_sum
+
+        cumulative = np.cumsum(magnitude, axis=1)
+        rolloff = frequencies[np.argmax(cumulative >= self.rolloff_percent * cumulative[:, -1:], axis=1)]
+
+        signs = np.signbit(frames)
+        zero_crossing_rate = (signs[:, 1:] != signs[:, :-1]).mean(axis=1)
+
+        chroma = power.dot(chroma_bank)
+        chroma /= chroma.max(axis=1, keepdims=True) + epsilon
+
+        return np.column_stack((mfcc, centroid, rolloff, zero_crossing_rate, chroma)).astype(np.float32)
+
+    def extract(self, wav_file):
+        """ Extract the feature vector of a song.
+
+        The file is memory-mapped and processed in blocks of block_frames frames, so the memory used does not depend
+        on the length of the song.
+
+        Args:
+            wav_file: The path of the WAV file.
+
+        Returns:
+            The feature vector of the song: the mean then the standard deviation of every frame feature.
+        """
+        sample_rate, samples = wavfile.read(wav_file, mmap=True)
+
+        nb_samples = samples.shape[0]
+        nb_frames = max(1, 1 + (nb_samples - self.frame_length) // self.hop_length)
+
+        count = 0
+        total = None
+        total_squares = None
+
+        for first_frame in range(0, nb_frames, self.block_frames):
+            last_frame = min(nb_frames, first_frame + self.block_frames)
+
+            # Consecutive blocks overlap by frame_length - hop_length samples.
+            start = first_frame * self.hop_length
+            end = (last_frame - 1) * self.hop_length + self.frame_length
+            signal = self._to_mono(samples[start:end])
+            if signal.shape[0] < self.frame_length:
+                signal = np.pad(signal, (0, self.frame_length - signal.shape[0]), mode="constant")
+
+            features = self.frame_features(self.frame(signal), sample_rate).astype(np.float64)
+
+            if total is None:
+                total = np.zeros(features.shape[1])
+                total_squares = np.zeros(features.shape[1])
+            count += features.shape[0]
+            total += features.sum(axis=0)
+            total_squares += (features ** 2).sum(axis=0)
+
+        mean = total / count
+        std = np.sqrt(np.maximum(0.0, total_squares / count - mean ** 2))
+
+        return np.append(mean, std).astype(np.float32)
+
+    def extract_files(self, wav_files, max_workers=None):
+        """ Extract the feature vectors of many songs in parallel.
+
+        Args:
+            wav_files: The paths of the WAV files.
+            max_workers: The number of worker processes. If None, one worker per CPU is used.
+
+        Returns:
+            The feature vectors [n_song, n_feature], in the order of the files.
+        """
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            features = list(executor.map(self.extract, wav_files, chunksize=4))
+
+        return np.array(features, dtype=np.float32)
+
+    def write_csv(self, wav_files, genres, csv_file, max_workers=None):
+        """ Extract the features of many songs and write them in the layout read by MusicGenreStrategy.
+
+        Each row holds the sample ID (the file name without extension), the genre, the feature values and the genre
+        again as the last column.
+
+        Args:
+            wav_files: The paths of the WAV files.
+            genres: The genre of each song.
+            csv_file: The path of the CSV file to write.
+            max_workers: The number of worker processes. If None, one worker per CPU is used.
+        """
+        features = self.extract_files(wav_files, max_workers=max_workers)
+
+        with open(csv_file, mode="w", newline="") as features_csv:
+            writer = csv.writer(features_csv, delimiter=",")
+
+            for wav_file, genre, feature_vector in zip(wav_files, genres, features):
+                sample_id = os.path.splitext(os.path.basename(wav_file))[0]
+                writer.writerow([sample_id, genre] + ["%.7g" % value for value in feature_vector] + [genre])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from commons.helpers.affine import compose
+
+
+class AffineAugmenter(object):
+    """ Augment batches of images with random rotations, flips and translations.
+
+    The transforms of an image are composed into a single affine matrix, so every image is warped once, by worker
+    threads (OpenCV releases the GIL), directly into a batch buffer preallocated and reused from batch to batch.
+    """
+
+    def __init__(self, max_angle=180.0, flip=True, max_translation=0.05, interpolation=cv2.INTER_LINEAR,
+                 border_mode=cv2.BORDER_REFLECT_101, max_workers=4, random_state=None):
+        """ Initialize the augmenter.
+
+        Args:
+            max_angle: The maximum angle of the rotations about the image center, in degrees.
+            flip: If True, half of the images are flipped horizontally.
+            max_translation: The maximum translation, as a fraction of the image size.
+            interpolation: The OpenCV interpolation method.
+            border_mode: The OpenCV border mode used to fill the pixels coming from outside the image.
+            max_workers: The number of threads warping the images.
+            random_state: A seed or a numpy RandomState used to sample the transforms.
+        """
+        if not isinstance(random_state, np.random.RandomState):
+            random_state = np.random.RandomState(random_state)
+
+        self.max_angle = max_angle
+        self.flip = flip
+        self.max_translation = max_translation
+        self.interpolation = interpolation
+        self.border_mode = border_mode
+        self.max_workers = max_workers
+        self._random_state = random_state
+        self._buffer = None
+
+    def sample_matrices(self, nb_images, width, height):
+        """ Sample the affine transform of every image of a batch.
+
+        Args:
+            nb_images: The number of images.
+            width: The width of the images.
+            height: The height of the images.
+
+        Returns:
+            The affine matrices [n_image, 2, 3].
+        """
+        angles = self._random_state.uniform(-self.max_angle, self.max_angle, nb_images)
+        flips = self._random_state.rand(nb_images) < 0.5 if self.flip else np.zeros(nb_images, dtype=bool)
+        shifts = self._random_state.uniform(-self.max_translation, self.max_translation, (nb_images, 2))
+
+        cx = float(width) / 2
+        cy = float(height) / 2
+        flip_matrix = np.array([[-1, 0, width - 1], [0, 1, 0]], dtype='float32')
+        matrices = np.empty((nb_images, 2, 3), dtype=np.float32)
+
+        for i in range(nb_images):
+            # Flip, then rotate about the center, then translate.
+            matrix = cv2.getRotationMatrix2D((cx, cy), angles[i], 1.0)
+            if flips[i]:
+                matrix = compose(matrix, flip_matrix)
+            translation_matrix = np.array([[1, 0, shifts[i, 0] * width], [0, 1, shifts[i, 1] * height]],
+                                          dtype='float32')
+            matrices[i] = compose(translation_matrix, matrix)
+
+        return matrices
+
+    def _warp(self, images, matrices, out, start, end):
+        """ Warp a range of images of a batch into the batch buffer. """
+        size = (images.shape[2], images.shape[1])
+        for i in range(start, end):
+            cv2.warpAffine(images[i], matrices[i], size, dst=out[i], flags=self.interpolation,
+                           borderMode=self.border_mode)
+
+    def augment(self, images, out=None):
+        """ Augment a batch of images.
+
+        Args:
+            images: The images [n_image, height, width, n_channel], e.g. uint8 images.
+            out: An optional array of the shape and type of images, receiving the augmented images. Defaults to a
+                 buffer of the augmenter, reused by the next batch.
+
+        Returns:
+            The augmented images.
+        """
+        if out is None:
+            if self._buffer is None or self._buffer.shape != images.shape or self._buffer.dtype != images.dtype:
+                self._buffer = np.empty_like(images)
+            out = self._buffer
+
+        matrices = self.sample_matrices(images.shape[0], images.shape[2], images.shape[1])
+
+        bounds = np.linspace(0, images.shape[0], min(self.max_workers, images.shape[0]) + 1).astype(int)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._warp, images, matrices, out, start, end)
+                       for start, end in zip(bounds[:-1], bounds[1:])]
+            for future in futures:
+                future.result()
+
+        return out
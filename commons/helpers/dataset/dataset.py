@@ -24,9 +24,50 @@ class DataSet(object):
         An object for storing data set elements.
     """
 
-    def __init__(self):
+    def __init__(self, random_state=None):
+        """ Initialize the data set.
+
+        Args:
+            random_state: A seed or a numpy RandomState used to shuffle the samples between epochs.
+        """
+        if not isinstance(random_state, np.random.RandomState):
+            random_state = np.random.RandomState(random_state)
+
+        self._random_state = random_state
         self._epochs_done = 0
         self._index_in_epoch = 0
+        self._indices = None
+        self._nb_classes = None
+        self._one_hot_buffer = None
+
+    def _rows(self, array):
+        """ Get the rows of an array which belong to this data set. """
+        if self._indices is None:
+            return array
+        return array[self._indices]
+
+    def _one_hot(self, labels):
+        """ Expand class codes into one-hot vectors, if the data set loads its labels as one-hot vectors. """
+        if self._nb_classes is None:
+            return labels
+        return np.eye(self._nb_classes, dtype=np.float32)[np.asarray(labels).ravel()]
+
+    def _one_hot_batch(self, labels):
+        """ Expand the class codes of a batch into one-hot vectors, written into a buffer reused from batch to batch.
+
+        The returned array is overwritten by the next batch: consume it, or copy it, before asking for the next one.
+        """
+        if self._nb_classes is None:
+            return labels
+
+        nb_labels = labels.shape[0]
+        if self._one_hot_buffer is None or self._one_hot_buffer.shape[0] < nb_labels:
+            self._one_hot_buffer = np.empty((nb_labels, self._nb_classes), dtype=np.float32)
+
+        batch = self._one_hot_buffer[:nb_labels]
+        batch.fill(0.0)
+        batch[np.arange(nb_labels), labels.ravel()] = 1.0
+        return batch
 
     @property
     def get_images(self):
@@ -34,11 +75,19 @@ class DataSet(object):
 
     @property
     def get_features(self):
-        return self._features
+        return self._rows(self._features)
 
     @property
     def get_labels(self):
-        return self._labels
+        return self._one_hot(self._rows(self._labels))
+
+    @property
+    def get_label_codes(self):
+        return self._rows(self._labels)
+
+    @property
+    def get_indices(self):
+        return self._indices
 
     @property
     def get_num_examples(self):
@@ -68,6 +117,31 @@ class DataSet(object):
         self._num_examples = images.shape[0]
         return self
 
+    def withIndices(self, indices):
+        """ Restrict the data set to some rows of its arrays, which may be shared with other data sets.
+
+        Must be called after the arrays are set. The arrays are never copied: batches gather their rows on demand.
+        The indexes are copied, as they are shuffled between epochs.
+
+        Args:
+            indices: The indexes of the rows belonging to this data set.
+        """
+        self._indices = np.array(indices, dtype=np.intp)
+        self._num_examples = self._indices.shape[0]
+        return self
+
+    def withOneHot(self, nb_classes):
+        """ Load the labels, stored as integer class codes, as one-hot vectors.
+
+        The one-hot vectors are never stored: they are produced on demand, batch by batch, into a float32 buffer which
+        is reused from batch to batch.
+
+        Args:
+            nb_classes: The number of classes, i.e. the length of the one-hot vectors.
+        """
+        self._nb_classes = nb_classes
+        return self
+
     def next_feature_batch(self, batch_size):
         """
         Return the next `batch_size` examples from this data set.
@@ -77,6 +151,7 @@ class DataSet(object):
 
         Returns:
             A tuple containing a list of feature vectors and the associated labels.
+            One-hot labels are written into a buffer reused by the next batch.
         """
         start = self._index_in_epoch
         self._index_in_epoch += batch_size
@@ -84,15 +159,19 @@ class DataSet(object):
             # Finished epoch
             self._epochs_done += 1
             # Shuffle the data
-            perm = np.arange(self._num_examples)
-            self._features = self._features[perm]
-            self._labels = self._labels[perm]
+            if self._indices is None:
+                # Shuffle an index array rather than copying the arrays.
+                self._indices = np.arange(self._num_examples)
+            self._random_state.shuffle(self._indices)
             # Start next epoch
             start = 0
             self._index_in_epoch = batch_size
             assert batch_size <= self._num_examples
         end = self._index_in_epoch
-        return self._features[start:end], self._labels[start:end]
+        if self._indices is not None:
+            rows = self._indices[start:end]
+            return self._features[rows], self._one_hot_batch(self._labels[rows])
+        return self._features[start:end], self._one_hot_batch(self._labels[start:end])
 
     def next_image_batch(self, batch_size):
         """
@@ -103,6 +182,7 @@ class DataSet(object):
 
         Returns:
             A tuple containing a list of img_names (i.e. 1000742) and the associated labels.
+            One-hot labels are written into a buffer reused by the next batch.
         """
         start = self._index_in_epoch
         self._index_in_epoch += batch_size
@@ -110,48 +190,54 @@ class DataSet(object):
             # Finished epoch
             self._epochs_done += 1
             # Shuffle the data
-            perm = np.arange(self._num_examples)
-            self._img_names = self._img_names[perm]
-            self._labels = self._labels[perm]
+            if self._indices is None:
+                # Shuffle an index array rather than copying the arrays.
+                self._indices = np.arange(self._num_examples)
+            self._random_state.shuffle(self._indices)
             # Start next epoch
             start = 0
             self._index_in_epoch = batch_size
             assert batch_size <= self._num_examples
         end = self._index_in_epoch
-        return self._img_names[start:end], self._labels[start:end]
+        if self._indices is not None:
+            rows = self._indices[start:end]
+            return self._img_names[rows], self._one_hot_batch(self._labels[rows])
+        return self._img_names[start:end], self._one_hot_batch(self._labels[start:end])
 
-    def load_images(self, batch):
+    def load_images(self, batch, source=None, augmenter=None):
         """ Load a training image data set.
 
         Args:
             batch: A list of IDs used in the image file names to load.
+            source: An optional image source, e.g. a GalaxyShardStore or a GalaxyHttpSource, which reads the images
+                    in one call. Its images are the center crops of the galaxies, not the full images.
+            augmenter: An optional AffineAugmenter applying random transforms to the images, before normalization.
 
         Return:
              The loaded images.
         """
+        if source is not None:
+            # Read the images as a single uint8 array.
+            images = source.read_many([sample[0] for sample in batch])
+        else:
+            # Declare a list for storing OpenCV images.
+            images = list()
 
-        # Declare a list for storing OpenCV images.
-        images = list()
-
-        for sample in batch:
-            # Create path to image's file.
-
-            path = (os.environ["VIRTUAL_ENV"] + "/data/images/" + str(sample[0]) + ".jpg")
-
-            # Use OpenCV to read the image.
-            image = cv2.imread(path)
+            for sample in batch:
+                # Create path to image's file.
+                path = (os.environ["VIRTUAL_ENV"] + "/data/images/" + str(sample[0]) + ".jpg")
 
-            # Transform image as a 32-bit numpy array.
-            image = image.astype(np.float32)
+                # Use OpenCV to read the image.
+                images.append(cv2.imread(path))
 
-            # Normalize the image.
-            image = np.multiply(image, 1.0 / 255.0)
+            # Put all the loaded images into a numpy array.
+            images = np.array(images)
 
-            # Append the image's name.
-            images.append(image)
+        if augmenter is not None:
+            images = augmenter.augment(images)
 
-        # Put all the loaded images into a numpy array.
-        images = np.array(images)
+        # Transform the images as a 32-bit numpy array and normalize them.
+        images = np.multiply(images, 1.0 / 255.0, dtype=np.float32)
 
         self._images = images
 
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import numpy as np
+
+
+class IntegerLabelEncoder(object):
+    """
+        Encode raw labels into integer class codes, in the same order as a scikit-learn LabelEncoder.
+
+        The codes are stored in the smallest signed integer type holding every class, e.g. int8 up to 128 classes.
+    """
+
+    def __init__(self, column=False):
+        """ Initialize the encoder.
+
+        Args:
+            column: A boolean. If True, the class codes are returned as a column vector [n_sample, 1].
+        """
+        self.column = column
+
+    @staticmethod
+    def code_type(nb_classes):
+        """ Get the smallest signed integer type holding the codes of some classes.
+
+        Args:
+            nb_classes: The number of classes.
+
+        Returns:
+            A numpy integer type.
+        """
+        for code_type in (np.int8, np.int16, np.int32):
+            if nb_classes - 1 <= np.iinfo(code_type).max:
+                return code_type
+
+        return np.int64
+
+    def encode(self, labels):
+        """ Encode raw labels.
+
+        Args:
+            labels: The raw labels.
+
+        Returns:
+            A tuple containing the class codes and the sorted classes.
+        """
+        classes, codes = np.unique(np.asarray(labels).ravel(), return_inverse=True)
+        codes = codes.astype(self.code_type(classes.shape[0]))
+
+        if self.column:
+            codes = codes.reshape(-1, 1)
+
+        return codes, classes
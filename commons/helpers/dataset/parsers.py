@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import csv
+
+import numpy as np
+from scipy import sparse
+
+from commons.exceptions.fileNotFoundException import FileNotFoundException
+from commons.helpers.dtype_policy import get_float_type
+
+
+class CsvParser(object):
+    """
+        Parse a data set CSV file into data and raw labels, one row at a time.
+    """
+
+    def __init__(self, data_columns, label_column, quoting=csv.QUOTE_MINIMAL, header=None):
+        """ Initialize the parser.
+
+        Args:
+            data_columns: A slice selecting the data columns of a row.
+            label_column: The index of the label column of a row.
+            quoting: The quoting of the CSV file. With csv.QUOTE_NONNUMERIC, unquoted fields are read as floats.
+            header: A header row to skip, or None.
+        """
+        self.data_columns = data_columns
+        self.label_column = label_column
+        self.quoting = quoting
+        self.header = header
+
+    def _new_chunk(self):
+        """ Create the storage of the data of a chunk of rows.
+
+        Returns:
+            An empty storage, a list by default.
+        """
+        return list()
+
+    def _append(self, chunk, data):
+        """ Store the data of a row as soon as it is read.
+
+        Args:
+            chunk: The storage of the data of the chunk.
+            data: The data columns of the row.
+        """
+        chunk.append(self._convert(data))
+
+    def _convert(self, data):
+        """ Convert the data of a row as soon as it is read.
+
+        Args:
+            data: The data columns of a row.
+
+        Returns:
+            The data of the row, as stored until its chunk is assembled.
+        """
+        return data
+
+    def _assemble(self, data):
+        """ Assemble the data of a chunk of rows.
+
+        Args:
+            data: The storage of the data of the chunk, by default the list of the data of every row.
+
+        Returns:
+            The data of the chunk as an array.
+        """
+        return np.array(data)
+
+    def parse_chunks(self, csv_file, chunk_size=None):
+        """ Parse a CSV file one chunk of rows at a time.
+
+        Args:
+            csv_file: The path to the CSV file.
+            chunk_size: The maximum number of rows in a chunk, or None to parse the file in a single chunk.
+
+        Yields:
+            Tuples containing the data of a chunk of rows and their raw labels.
+        """
+        data = self._new_chunk()
+        labels = list()
+
+        try:
+            # Open the ground truth file.
+            with open(csv_file, mode="r") as ground_truth_csv:
+                reader = csv.reader(ground_truth_csv, delimiter=",", quoting=self.quoting)
+
+                # For each row, store the data and its associated class.
+                for row in reader:
+                    if row == self.header:
+                        continue
+                    self._append(data, row[self.data_columns])
+                    labels.append(row[self.label_column])
+
+                    if len(labels) == chunk_size:
+                        yield self._assemble(data), np.array(labels)
+                        data = self._new_chunk()
+                        labels = list()
+
+        except FileNotFoundError:
+            raise FileNotFoundException("CSV file not found. Please enter in parameter a valid CSV file.")
+
+        if labels:
+            yield self._assemble(data), np.array(labels)
+
+    def parse(self, csv_file):
+        """ Parse a whole CSV file.
+
+        Args:
+            csv_file: The path to the CSV file.
+
+        Returns:
+            A tuple containing the data of every row and their raw labels.
+        """
+        for data, labels in self.parse_chunks(csv_file):
+            return data, labels
+
+        raise ValueError("CSV file is empty.")
+
+
+class CsvIdParser(CsvParser):
+    """
+        Parse a CSV file of type (ID, class) into a column vector of IDs.
+    """
+
+    def __init__(self, header=("id", "class")):
+        super(CsvIdParser, self).__init__(data_columns=0, label_column=1, header=list(header))
+
+    def _assemble(self, data):
+        return np.array(data).reshape(-1, 1)
+
+
+class CsvFeatureParser(CsvParser):
+    """
+        Parse a CSV file of feature vectors into a dense matrix.
+    """
+
+    def __init__(self, data_columns, label_column, quoting=csv.QUOTE_NONNUMERIC, dtype=None):
+        """ Initialize the parser.
+
+        Args:
+            data_columns: A slice selecting the feature columns of a row.
+            label_column: The index of the label column of a row.
+            quoting: The quoting of the CSV file.
+            dtype: The type of the feature values, or None for the feature floating point type of the dtype policy.
+        """
+        super(CsvFeatureParser, self).__init__(data_columns, label_column, quoting)
+        self.dtype = dtype
+
+    def _assemble(self, data):
+        return np.array(data, dtype=self.dtype if self.dtype is not None else get_float_type())
+
+
+class SparseCsvFeatureParser(CsvParser):
+    """
+        Parse a CSV file of mostly zero feature vectors into a CSR sparse matrix, without building the dense matrix.
+    """
+
+    def __init__(self, data_columns, label_column, quoting=csv.QUOTE_NONNUMERIC):
+        super(SparseCsvFeatureParser, self).__init__(data_columns, label_column, quoting)
+
+    def _new_chunk(self):
+        # The CSR arrays of the chunk, filled row after row.
+        return dict(data=list(), indices=list(), indptr=[0], width=0)
+
+    def _append(self, chunk, data):
+        # Keep only the non-zero values of the row and their column.
+        for column, value in enumerate(data):
+            if value != 0:
+                chunk["data"].append(value)
+                chunk["indices"].append(column)
+        chunk["indptr"].append(len(chunk["indices"]))
+        chunk["width"] = len(data)
+
+    def _assemble(self, data):
+        return sparse.csr_matrix((np.array(data["data"], dtype=get_float_type()),
+                                  np.array(data["indices"], dtype=np.int32), np.array(data["indptr"], dtype=np.int32)),
+                                 shape=(len(data["indptr"]) - 1, data["width"]))
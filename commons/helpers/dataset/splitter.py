@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import numpy as np
+
+from commons.helpers.dataset.dataset import DataSet
+
+
+class StratifiedSplitter(object):
+    """
+        Split data sets into stratified training and validation sets using index arrays.
+    """
+
+    def __init__(self, random_state=None):
+        """ Initialize the splitter.
+
+        Args:
+            random_state: A seed or a numpy RandomState used to shuffle the samples.
+        """
+        if not isinstance(random_state, np.random.RandomState):
+            random_state = np.random.RandomState(random_state)
+
+        self._random_state = random_state
+
+    def _class_codes(self, labels):
+        """ Get the class of every sample as an integer code.
+
+        Args:
+            labels: The labels, as a vector, a column vector or one-hot vectors.
+
+        Returns:
+            A 1-D array of integer class codes.
+        """
+        labels = np.asarray(labels)
+
+        if labels.ndim == 2 and labels.shape[1] > 1:
+            return labels.argmax(axis=1)
+
+        return np.unique(labels.ravel(), return_inverse=True)[1].ravel()
+
+    def _group_by_class(self, class_codes):
+        """ Shuffle the samples, then group them by class.
+
+        Args:
+            class_codes: A 1-D array of integer class codes.
+
+        Returns:
+            A tuple containing the shuffled indexes grouped by class, the rank of each of them inside its class and the
+            number of samples per class.
+        """
+        class_sizes = np.bincount(class_codes)
+        perm = self._random_state.permutation(class_codes.shape[0])
+        order = perm[np.argsort(class_codes[perm], kind="mergesort")]
+        class_starts = np.concatenate(([0], np.cumsum(class_sizes)[:-1]))
+        rank = np.arange(order.shape[0]) - class_starts[class_codes[order]]
+
+        return order, rank, class_sizes
+
+    def holdout(self, labels, validation_size):
+        """ Split samples into stratified training and validation sets.
+
+        The validation set holds round(validation_size * n_samples) samples, spread over the classes proportionally
+        to their size.
+
+        Args:
+            labels: The labels, as a vector, a column vector or one-hot vectors.
+            validation_size: The fraction of the samples in the validation set.
+
+        Returns:
+            A tuple containing the shuffled indexes of the training set and of the validation set.
+        """
+        class_codes = self._class_codes(labels)
+        nb_examples = class_codes.shape[0]
+        nb_validation = int(np.round(validation_size * nb_examples))
+
+        order, rank, class_sizes = self._group_by_class(class_codes)
+
+        # Allocate the validation samples to the classes with the largest remainder method.
+        quotas = class_sizes * float(nb_validation) / max(nb_examples, 1)
+        class_quotas = np.floor(quotas).astype(np.intp)
+        remainders = np.argsort(class_quotas - quotas, kind="mergesort")
+        class_quotas[remainders[:nb_validation - class_quotas.sum()]] += 1
+
+        is_validation = rank < class_quotas[class_codes[order]]
+        train_indices = order[~is_validation]
+        validation_indices = order[is_validation]
+
+        # Mix the classes back.
+        self._random_state.shuffle(train_indices)
+        self._random_state.shuffle(validation_indices)
+
+        return train_indices, validation_indices
+
+    def holdout_order(self, labels, validation_size):
+        """ Get an ordering of the samples which puts a stratified training set before the validation set.
+
+        Reordering the samples once with this permutation makes both sets contiguous slices, i.e. views, of the same
+        arrays.
+
+        Args:
+            labels: The labels, as a vector, a column vector or one-hot vectors.
+            validation_size: The fraction of the samples in the validation set.
+
+        Returns:
+            A tuple containing the permutation and the size of the training set.
+        """
+        train_indices, validation_indices = self.holdout(labels, validation_size)
+
+        return np.concatenate((train_indices, validation_indices)), train_indices.shape[0]
+
+    def kfold(self, labels, nb_folds):
+        """ Split samples into stratified folds.
+
+        Args:
+            labels: The labels, as a vector, a column vector or one-hot vectors.
+            nb_folds: The number of folds.
+
+        Returns:
+            A list containing, for every fold, a tuple of the indexes of the training set and of the validation set.
+        """
+        class_codes = self._class_codes(labels)
+        order, rank, class_sizes = self._group_by_class(class_codes)
+
+        # Deal the samples of every class to the folds in turn.
+        folds = (rank + self._random_state.randint(nb_folds, size=class_sizes.shape[0])[class_codes[order]]) % nb_folds
+
+        return [(np.sort(order[folds != k]), np.sort(order[folds == k])) for k in range(nb_folds)]
+
+    def kfold_datasets(self, features, labels, nb_folds):
+        """ Create stratified cross-validation data sets.
+
+        Every data set references the same feature and label arrays; a fold costs only its index arrays.
+
+        Args:
+            features: The feature vectors.
+            labels: The labels, as a vector, a column vector or one-hot vectors.
+            nb_folds: The number of folds.
+
+        Returns:
+            A list of DataSets objects, each with a training and a validation DataSet.
+        """
+
+        # Creates inner DataSets class.
+        class DataSets(object):
+            pass
+
+        folds = list()
+
+        for train_indices, validation_indices in self.kfold(labels, nb_folds):
+            data_sets = DataSets()
+            data_sets.train = DataSet(self._random_state).withFeatures(features).withLabels(labels)
+            data_sets.train.withIndices(train_indices)
+            data_sets.valid = DataSet(self._random_state).withFeatures(features).withLabels(labels)
+            data_sets.valid.withIndices(validation_indices)
+            folds.append(data_sets)
+
+        return folds
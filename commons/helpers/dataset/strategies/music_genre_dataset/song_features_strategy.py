@@ -14,144 +14,48 @@ Students :
 Group :
     GTI770-H18-0X
 """
-import csv
 
-import numpy as np
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder
-from sklearn.utils import shuffle
+import csv
 
-from commons.exceptions.fileNotFoundException import FileNotFoundException
-from commons.exceptions.unableToLoadDatasetException import UnableToLoadDatasetException
-from commons.exceptions.validationSizeException import ValidationSizeException
-from commons.helpers.dataset.dataset import DataSet
+from commons.helpers.dataset.encoders import IntegerLabelEncoder
+from commons.helpers.dataset.parsers import CsvFeatureParser
+from commons.helpers.dataset.strategy import DataSetStrategy
 
 
-class MusicGenreStrategy:
+class MusicGenreStrategy(DataSetStrategy):
     """
         A class for handling data set files of type (song's features, class).
     """
 
-    def _is_positive(self, number):
-        """ Verify the type of a variable.
-
-        Make a comparison of the type of a variable to insure it is a float.
-
-        Args:
-            number: a floating point number.
-
-        Returns:
-            A boolean; true if number passed in argument is of type numpy.float32, false if type is not matched.
-        """
-
-        try:
-            if number < 0.0:
-                raise ValidationSizeException(
-                    "Validation size must be a positive floating point number or equals to 0.0.")
-            if number >= 0.0:
-                return number
-
-        except AttributeError:
-            raise ValidationSizeException("Validation size is not a valid floating point number.")
-
-    def _is_type(self, number, type=np.float32):
-        """ Verify the type of a variable.
-
-        Make a comparison of the type of a variable to insure it is a float.
+    def __init__(self, parser=None, encoder=None, splitter=None):
+        """ Initialize the strategy.
 
         Args:
-            number: a floating point number.
-
-        Returns:
-            A boolean; true if number passed in argument is of type numpy.float32, false if type is not matched.
+            parser: The parser of the CSV file. Defaults to rows of type (sample ID, genre, features..., genre).
+            encoder: The label encoder. Defaults to an IntegerLabelEncoder of column vectors.
+            splitter: The training and validation splitter. Defaults to a StratifiedSplitter.
         """
+        if parser is None:
+            parser = CsvFeatureParser(data_columns=slice(2, -1), label_column=1, quoting=csv.QUOTE_MINIMAL)
+        if encoder is None:
+            encoder = IntegerLabelEncoder(column=True)
 
-        try:
-            return number.dtype.num == np.dtype(type).num
-
-        except AttributeError:
-            raise ValidationSizeException("Validation size is not a valid floating point number.")
-
-    def _create_datasets(self, features, labels, validation_size):
-
-        # Creates inner DataSets class.
-        class DataSets(object):
-            pass
-
-        # Create an instance of a DataSets object.
-        data_sets = DataSets()
+        super(MusicGenreStrategy, self).__init__(parser, encoder, splitter, name="music")
 
-        # Check if the parameter is of type numpy.float64.
-        self._is_type(validation_size)
-        self._is_positive(validation_size)
+    def read_chunks(self, csv_file, chunk_size=10000):
+        """ Read the songs of a CSV file one chunk at a time.
 
-        # Calculates the training set and validation set size.
-        train_size = int(np.round((1 - validation_size) * features.shape[0]))
-        validation_size = int(np.round(validation_size * features.shape[0]))
-
-        # Assign the songs to the training and validation data sets.
-        train_features = features[:train_size]
-        train_labels = labels[:train_size]
-        validation_features = features[-validation_size:]
-        validation_labels = labels[-validation_size:]
-
-        # Create the data sets.
-        data_sets.train = DataSet().withFeatures(train_features).withLabels(train_labels)
-        data_sets.valid = DataSet().withFeatures(validation_features).withLabels(validation_labels)
-
-        return data_sets
-
-    def _read_labels(self, csv_file, one_hot):
-        """ Read the labels associated to a song.
-
-        Read the label associated to a song in the reference CSV file.
+        Only one chunk of feature vectors is held in memory at once, whatever the size of the file.
 
         Args:
             csv_file (str): The file path to the CSV file containing the ground truth.
+            chunk_size: The maximum number of songs in a chunk.
 
         Returns:
-            The extracted music feature vectors with their associated encoded labels.
+            A generator of tuples containing the feature vectors of a chunk of songs [n_song, n_feature] and their raw
+            labels [n_song].
         """
-
-        # Declare two lists for holding song feature vector and the associated class label.
-        features = list()
-        labels = list()
-
-        try:
-            # Open the ground truth file.
-            with open(csv_file, mode="r") as ground_truth_csv:
-                reader = csv.reader(ground_truth_csv, delimiter=",")
-
-                # For each row, store the song features and its associated class.
-                for row in reader:
-                    features.append(np.float32(row[2:(len(row) -1)]))
-                    labels.append(row[1])
-
-        except FileNotFoundError:
-            raise FileNotFoundException("CSV file not found. Please enter in parameter a valid CSV file.")
-
-        # Transforms the lists into a vertical numpy array.
-        features = np.array(features)
-        labels = np.array(labels).reshape(-1, 1)
-
-        # Declare a label encoder from scikit-learn.
-        label_encoder = LabelEncoder()
-
-        # Fit label encoder and return the classes encoded into integer in range [0,2]
-        encoded_labels = label_encoder.fit_transform(labels).reshape(-1, 1)
-
-        if one_hot == True:
-            # Declare a one-hot encoder from scikit-learn.
-            one_hot_encoder = OneHotEncoder(sparse=False)
-
-            encoded_labels = encoded_labels.reshape(-1, 1)
-
-            # Fit label encoder and return the classes encoded into integer in range [0,2]
-            encoded_labels = one_hot_encoder.fit_transform(encoded_labels)
-
-        # Shuffle the data.
-        features, encoded_labels = shuffle(features, encoded_labels)
-
-        return features, encoded_labels
+        return self.parser.parse_chunks(csv_file, chunk_size)
 
     def load_dataset(self, csv_file, one_hot, validation_size):
         """ Load a data set.
@@ -164,10 +68,4 @@ class MusicGenreStrategy:
         Returns:
             A DataSet object containing training and validation set.
         """
-        
-        try:
-            features, labels = self._read_labels(csv_file, one_hot)
-            return self._create_datasets(features, labels, validation_size)
-
-        except Exception as e:
-            raise UnableToLoadDatasetException("Unable to load music data set with cause: " + str(e))
+        return super(MusicGenreStrategy, self).load_dataset(csv_file, one_hot, validation_size)
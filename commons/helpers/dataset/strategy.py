@@ -17,6 +17,14 @@ Group :
 
 import abc
 
+import numpy as np
+
+from commons.exceptions.unableToLoadDatasetException import UnableToLoadDatasetException
+from commons.exceptions.validationSizeException import ValidationSizeException
+from commons.helpers.dataset.dataset import DataSet
+from commons.helpers.dataset.encoders import IntegerLabelEncoder
+from commons.helpers.dataset.splitter import StratifiedSplitter
+
 
 class Strategy(metaclass=abc.ABCMeta):
     """
@@ -27,3 +35,139 @@ class Strategy(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def load_dataset(self):
         pass
+
+
+class DataSetStrategy(Strategy):
+    """
+        Build training and validation data sets from a CSV file in three swappable stages: a parser reads the data and
+        the raw labels, an encoder turns the labels into integer class codes and a splitter separates the samples.
+
+        Labels stay integer-coded; one-hot vectors are only produced by the data sets, batch by batch.
+    """
+
+    def __init__(self, parser, encoder=None, splitter=None, name=None):
+        """ Initialize the strategy.
+
+        Args:
+            parser: The parser of the CSV file, e.g. a CsvFeatureParser.
+            encoder: The label encoder. Defaults to an IntegerLabelEncoder.
+            splitter: The training and validation splitter. Defaults to a StratifiedSplitter.
+            name: The name of the data set in the error messages, e.g. "spam".
+        """
+        self.name = name
+        self.parser = parser
+        self.encoder = encoder if encoder is not None else IntegerLabelEncoder()
+        self.splitter = splitter if splitter is not None else StratifiedSplitter()
+
+    def _is_positive(self, number):
+        """ Verify the type of a variable.
+
+        Make a comparison of the type of a variable to insure it is a float.
+
+        Args:
+            number: a floating point number.
+
+        Returns:
+            A boolean; true if number passed in argument is of type numpy.float32, false if type is not matched.
+        """
+
+        try:
+            if number < 0.0:
+                raise ValidationSizeException(
+                    "Validation size must be a positive floating point number or equals to 0.0.")
+            if number >= 0.0:
+                return number
+
+        except AttributeError:
+            raise ValidationSizeException("Validation size is not a valid floating point number.")
+
+    def _is_type(self, number, type=np.float32):
+        """ Verify the type of a variable.
+
+        Make a comparison of the type of a variable to insure it is a float.
+
+        Args:
+            number: a floating point number.
+
+        Returns:
+            A boolean; true if number passed in argument is of type numpy.float32, false if type is not matched.
+        """
+
+        try:
+            return number.dtype.num == np.dtype(type).num
+
+        except AttributeError:
+            raise ValidationSizeException("Validation size is not a valid floating point number.")
+
+    def _new_dataset(self, data):
+        """ Create a data set holding the parsed data of some samples.
+
+        Args:
+            data: The parsed data of the samples.
+
+        Returns:
+            A DataSet object.
+        """
+        return DataSet().withFeatures(data)
+
+    def _create_datasets(self, data, labels, validation_size, nb_classes=None):
+        """ Create a data set.
+
+          Args:
+              data: The parsed data of the samples.
+              labels: The associated label (class) of the samples.
+              validation_size: The desired amount of samples needed to build the validation set.
+              nb_classes: The number of classes if the labels are class codes to load as one-hot vectors, else None.
+
+          Returns:
+              data_sets: A DataSet object containing data from previously parsed CSV files.
+        """
+
+        # Creates inner DataSets class.
+        class DataSets(object):
+            pass
+
+        # Create an instance of a DataSets object.
+        data_sets = DataSets()
+
+        # Check if the parameter is of type numpy.float64.
+        self._is_type(validation_size)
+        self._is_positive(validation_size)
+
+        # Calculates a stratified ordering of the samples which puts the training set first.
+        order, train_size = self.splitter.holdout_order(labels, validation_size)
+
+        # Reorder the samples once, then assign them to the training and validation data sets as views.
+        data = data[order]
+        labels = labels[order]
+
+        # Create the data sets.
+        data_sets.train = self._new_dataset(data[:train_size]).withLabels(labels[:train_size])
+        data_sets.valid = self._new_dataset(data[train_size:]).withLabels(labels[train_size:])
+
+        if nb_classes is not None:
+            data_sets.train.withOneHot(nb_classes)
+            data_sets.valid.withOneHot(nb_classes)
+
+        return data_sets
+
+    def load_dataset(self, csv_file, one_hot, validation_size):
+        """ Load a data set.
+
+        Args:
+            csv_file: a CSV file containing ground truth and file names.
+            one_hot: a boolean. It True, will load the data set labels as a one-hot vector e.g. [0, 1, 0].
+                            If False, will load the data set labels as integers.
+            validation_size: the specified user's validation data set size.
+
+        Returns:
+            A DataSet object containing training and validation set.
+        """
+        try:
+            data, labels = self.parser.parse(csv_file)
+            labels, classes = self.encoder.encode(labels)
+            return self._create_datasets(data, labels, validation_size, len(classes) if one_hot else None)
+
+        except Exception as e:
+            data_set = "data set" if self.name is None else self.name + " data set"
+            raise UnableToLoadDatasetException("Unable to load " + data_set + " with cause: " + str(e))
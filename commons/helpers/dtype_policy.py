@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import numpy as np
+from scipy import sparse
+
+# The floating point type of features, from their extraction to the classifiers.
+_float_type = np.float32
+
+
+def get_float_type():
+    """ Get the floating point type of the features.
+
+    Returns:
+        A numpy floating point type; numpy.float32 unless changed with set_float_type.
+    """
+    return _float_type
+
+
+def set_float_type(float_type):
+    """ Set the floating point type of the features.
+
+    Args:
+        float_type: A numpy floating point type, e.g. numpy.float64 to reproduce double precision results.
+    """
+    global _float_type
+
+    if np.dtype(float_type).kind != "f":
+        raise ValueError("Feature type must be a floating point type: " + str(float_type))
+
+    _float_type = np.dtype(float_type).type
+
+
+def as_float_array(X, copy=True):
+    """ Convert an array to the floating point type of the features.
+
+    Args:
+        X: A numpy array or a scipy sparse matrix.
+        copy: If False, X itself is returned when it already has the right type.
+
+    Returns:
+        The converted array.
+    """
+    return X.astype(_float_type, copy=copy)
+
+
+def standardize(X, copy=True):
+    """ Standardize feature vectors to zero mean and unit variance, in the floating point type of the features.
+
+    Centering would fill a sparse matrix, so sparse feature vectors are only scaled to unit variance.
+
+    Args:
+        X: The feature vectors [n_sample, n_feature], as a numpy array or a scipy sparse matrix.
+        copy: If False and X is a dense array which already has the feature floating point type, X is standardized
+              in place.
+
+    Returns:
+        The standardized feature vectors; a CSR matrix for sparse feature vectors.
+    """
+    if sparse.issparse(X):
+        X = as_float_array(X, copy=False)
+        mean = np.asarray(X.mean(axis=0)).ravel()
+        std = np.sqrt(np.maximum(0.0, np.asarray(X.multiply(X).mean(axis=0)).ravel() - mean ** 2))
+        std[std == 0] = 1.0
+        return X.dot(sparse.diags((1.0 / std).astype(X.dtype))).tocsr()
+
+    X = as_float_array(X, copy=copy)
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    X -= mean
+    X /= std
+
+    return X
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+def render_figure(draw, filename, figsize=(6.4, 4.8), dpi=100, **kwargs):
+    """ Render a figure with the Agg backend and save it to a file.
+
+    The figure is created with the object-oriented API, so it is never registered in the global pyplot state, and it
+    is cleared as soon as it is saved.
+
+    Args:
+        draw: A function drawing on the figure passed as first argument. Keyword arguments are forwarded to it.
+        filename: The desired file name to save the plot.
+        figsize: The (width, height) of the figure in inches.
+        dpi: The resolution of the figure in dots per inch.
+
+    Returns:
+        The file name of the saved plot.
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+
+    try:
+        draw(fig, **kwargs)
+        fig.savefig(filename)
+    finally:
+        fig.clf()
+
+    return filename
+
+
+class PlotExporter(object):
+    """ Export plots to files, optionally offloading the rendering to a pool of worker processes. """
+
+    def __init__(self, max_workers=0):
+        """ Initialize the exporter.
+
+        Args:
+            max_workers: The number of worker processes. If 0, plots are rendered synchronously in the calling process.
+                         If None, one worker per CPU is used.
+        """
+        self._executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers != 0 else None
+        self._futures = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=exc_type is None)
+
+    def submit(self, draw, filename, figsize=(6.4, 4.8), dpi=100, **kwargs):
+        """ Schedule the rendering of a plot.
+
+        The drawing function and its arguments must be picklable when worker processes are used, e.g. a static method
+        of Plot.
+
+        Args:
+            draw: A function drawing on the figure passed as first argument.
+            filename: The desired file name to save the plot.
+            figsize: The (width, height) of the figure in inches.
+            dpi: The resolution of the figure in dots per inch.
+
+        Returns:
+            A Future whose result is the file name of the saved plot.
+        """
+        if self._executor is not None:
+            future = self._executor.submit(render_figure, draw, filename, figsize, dpi, **kwargs)
+        else:
+            future = Future()
+            try:
+                future.set_result(render_figure(draw, filename, figsize, dpi, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+        self._futures.append(future)
+
+        return future
+
+    def wait(self):
+        """ Wait for every scheduled plot to be saved.
+
+        Returns:
+            The list of saved file names, in submission order.
+
+        Raises:
+            The first exception raised while rendering a plot.
+        """
+        futures, self._futures = self._futures, list()
+        wait(futures)
+
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait=True):
+        """ Release the worker processes.
+
+        Args:
+            wait: If True, wait for the scheduled plots to be saved.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
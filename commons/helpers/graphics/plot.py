@@ -15,40 +15,141 @@ Group :
     GTI770-H18-0X
 """
 
-import matplotlib.pyplot as plt
+from matplotlib import cm
+from matplotlib.colors import to_rgb
+from matplotlib.patches import Patch
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 
 from classifiers.galaxy_classifiers.decision_tree_classifier import TreeClassifier
+from commons.helpers.graphics.export import render_figure
 
 
 class Plot(object):
     """ Class to plot graphics. """
 
     @staticmethod
-    def plot_feature_comparison(feature1, feature2, class_labels, filename="/tmp/feature_comparison.png"):
-        """ Plot a graphics to evaluate features.
+    def _stratified_sample(class_codes, nb_samples, random_state=None):
+        """ Draw a stratified sample of indexes.
+
+        Every class keeps the same proportion of samples it has in the full set, and at least one sample unless there
+        are more classes than samples. The sample never holds more than nb_samples indexes.
+
+        Args:
+            class_codes: A 1-D array of integer class codes.
+            nb_samples: The desired number of samples.
+            random_state: A seed or a numpy RandomState used to draw the samples.
+
+        Returns:
+            A sorted 1-D array of indexes.
+        """
+        if not isinstance(random_state, np.random.RandomState):
+            random_state = np.random.RandomState(random_state)
+
+        nb_examples = class_codes.shape[0]
+        class_sizes = np.bincount(class_codes)
+        nb_samples = min(nb_samples, nb_examples)
+        shares = class_sizes * float(nb_samples) / nb_examples
+        quotas = np.minimum(class_sizes, np.maximum(class_sizes > 0, np.floor(shares))).astype(np.intp)
+
+        # Give the samples left by the rounding down to the largest remainders, then take the excess due to the minimum
+        # of one sample per class from the smallest remainders.
+        while quotas.sum() < nb_samples:
+            quotas[np.argmax(np.where(quotas < class_sizes, shares - quotas, -np.inf))] += 1
+        while quotas.sum() > nb_samples:
+            minimum = 1 if np.any(quotas > 1) else 0
+            quotas[np.argmin(np.where(quotas > minimum, shares - quotas, np.inf))] -= 1
+
+        # Shuffle, then group the indexes by class and keep the first ones of each class.
+        perm = random_state.permutation(nb_examples)
+        order = perm[np.argsort(class_codes[perm], kind="mergesort")]
+        sorted_codes = class_codes[order]
+        class_starts = np.concatenate(([0], np.cumsum(class_sizes)[:-1]))
+        rank = np.arange(nb_examples) - class_starts[sorted_codes]
+
+        return np.sort(order[rank < quotas[sorted_codes]])
+
+    @staticmethod
+    def _density_image(x, y, class_codes, nb_classes, bins, colors):
+        """ Rasterize points into a RGBA image.
+
+        Points are aggregated in a 2-D histogram per class. The color of a cell is the mix of the class colors weighted
+        by their counts, and its opacity grows with the logarithm of the number of points in the cell.
+
+        Args:
+            x: A 1-D array of values for the first feature.
+            y: A 1-D array of values for the second feature.
+            class_codes: A 1-D array of integer class codes.
+            nb_classes: The number of classes.
+            bins: The number of bins along each axis.
+            colors: A [nb_classes, 3] array of RGB colors.
+
+        Returns:
+            A tuple containing the RGBA image [bins, bins, 4] and its extent (x_min, x_max, y_min, y_max).
+        """
+        x_min, x_max = x.min(), x.max()
+        y_min, y_max = y.min(), y.max()
+        x_span = (x_max - x_min) or 1.0
+        y_span = (y_max - y_min) or 1.0
+
+        ix = np.minimum(((x - x_min) * (bins / x_span)).astype(np.intp), bins - 1)
+        iy = np.minimum(((y - y_min) * (bins / y_span)).astype(np.intp), bins - 1)
+
+        # One histogram per class, computed in a single pass.
+        counts = np.bincount((class_codes * bins + iy) * bins + ix, minlength=nb_classes * bins * bins)
+        counts = counts.reshape(nb_classes, bins, bins).astype(np.float32)
+        total = counts.sum(axis=0)
+
+        image = np.zeros((bins, bins, 4), dtype=np.float32)
+        occupied = total > 0
+        image[..., :3] = np.tensordot(counts, colors, axes=([0], [0]))
+        image[occupied, :3] /= total[occupied, np.newaxis]
+        image[..., 3] = np.log1p(total) / np.log1p(total.max())
+
+        return image, (x_min, x_min + x_span, y_min, y_min + y_span)
+
+    @staticmethod
+    def draw_feature_comparison(fig, feature1, feature2, class_labels, mode="scatter", bins=256, max_points=10000,
+                                random_state=None):
+        """ Draw a graphics to evaluate features on a figure.
 
         Args:
+            fig: The matplotlib figure to draw on.
             feature1: A numpy array of values for the first feature to evaluate.
             feature2: A numpy array of values for the second feature to evaluate.
             class_labels: The labels associated to the feature vector.
-            filename: The desired file name to save the plot.
-
-        Returns:
-            None, but save plot to a file.
+            mode: "scatter" to draw every sample, "sample" to draw a stratified sample of at most max_points samples
+                  or "density" to draw a 2-D histogram per class as an image.
+            bins: The number of bins along each axis in density mode.
+            max_points: The number of samples drawn in sample mode.
+            random_state: A seed used to draw the samples in sample mode.
         """
-        x = feature1
-        y = feature2
+        x = np.asarray(feature1).ravel()
+        y = np.asarray(feature2).ravel()
+        class_labels = np.asarray(class_labels).ravel()
 
         # Set graphics properties
-        fig = plt.figure(figsize=(6, 6))
         ax = fig.add_subplot(111)
         ax.set_title("Feature comparison", fontsize=14)
         ax.set_xlabel("Feature 1", fontsize=12)
         ax.set_ylabel("Feature 2", fontsize=12)
         ax.grid(True, linestyle='-', color='0.75')
 
+        if mode == "density":
+            classes, class_codes = np.unique(class_labels, return_inverse=True)
+            colors = np.array([to_rgb("C%d" % (i % 10)) for i in range(len(classes))], dtype=np.float32)
+            image, extent = Plot._density_image(x, y, class_codes, len(classes), bins, colors)
+
+            ax.imshow(image, extent=extent, origin="lower", aspect="auto", interpolation="nearest")
+            ax.legend(handles=[Patch(color=color, label=name) for name, color in zip(classes, colors)])
+            return
+
+        if mode == "sample" and x.shape[0] > max_points:
+            _, class_codes = np.unique(class_labels, return_inverse=True)
+            idx = Plot._stratified_sample(class_codes, max_points, random_state)
+            x, y, class_labels = x[idx], y[idx], class_labels[idx]
+
         # Wrap X, Y and labels.
         df = pd.DataFrame(dict(x=x, y=y, label=class_labels))
         groups = df.groupby('label')
@@ -58,61 +159,196 @@ class Plot(object):
         for name, group in groups:
             ax.plot(group.x, group.y, marker='o', linestyle='', ms=12, label=name)
         ax.legend()
-        plt.savefig(filename)
 
     @staticmethod
-    def plot_tree_decision_surface(X, y, feature_name1, feature_name2, filename="/tmp/decision_tree.png"):
-        """ Plot the surface of decision of a decision tree.
+    def plot_feature_comparison(feature1, feature2, class_labels, filename="/tmp/feature_comparison.png",
+                                mode="scatter", bins=256, max_points=10000, random_state=None, exporter=None):
+        """ Plot a graphics to evaluate features.
+
+        Args:
+            feature1: A numpy array of values for the first feature to evaluate.
+            feature2: A numpy array of values for the second feature to evaluate.
+            class_labels: The labels associated to the feature vector.
+            filename: The desired file name to save the plot.
+            mode: "scatter" to draw every sample, "sample" to draw a stratified sample of at most max_points samples
+                  or "density" to draw a 2-D histogram per class as an image.
+            bins: The number of bins along each axis in density mode.
+            max_points: The number of samples drawn in sample mode.
+            random_state: A seed used to draw the samples in sample mode.
+            exporter: A PlotExporter used to render the plot asynchronously. If None, the plot is rendered immediately.
+
+        Returns:
+            None if the plot is rendered immediately, else a Future whose result is the file name of the saved plot.
+        """
+        kwargs = dict(feature1=feature1, feature2=feature2, class_labels=class_labels, mode=mode, bins=bins,
+                      max_points=max_points, random_state=random_state)
+
+        if exporter is not None:
+            return exporter.submit(Plot.draw_feature_comparison, filename, figsize=(6, 6), **kwargs)
+
+        render_figure(Plot.draw_feature_comparison, filename, figsize=(6, 6), **kwargs)
+
+    @staticmethod
+    def _predict_in_chunks(model, points, chunk_size):
+        """ Predict the class of a large number of points, one chunk at a time.
 
         Args:
+            model: A trained classifier, e.g. a TreeClassifier.
+            points: A 2-D array of points [n_points, n_features].
+            chunk_size: The maximum number of points predicted at once.
+
+        Returns:
+            A 1-D array of predicted classes.
+        """
+        return np.concatenate([model.predict(points[start:start + chunk_size])
+                               for start in range(0, points.shape[0], chunk_size)])
+
+    @staticmethod
+    def _decision_surface(X, y, pair, plot_step, pixel_budget, refine_factor, chunk_size):
+        """ Train a decision tree on a pair of features and compute its decision surface.
+
+        The surface is first evaluated on a coarse grid of cells. Cells whose four corners share the same class are
+        filled with that class, while cells straddling a decision boundary are refined at full resolution.
+
+        Args:
+            X: the feature vector.
+            y: ground truth labels.
+            pair: the indexes of the two features to use.
+            plot_step: the desired distance between two points of the grid.
+            pixel_budget: the maximum number of points of the full resolution grid.
+            refine_factor: the number of full resolution points per coarse cell side.
+            chunk_size: the maximum number of points predicted at once.
+
+        Returns:
+            A tuple containing the extent (x_min, x_max, y_min, y_max) of the surface and the predicted classes grid.
+        """
+        # Arranges the data in pair of features.
+        x_features_train = X[:, pair]
+
+        # Train a decision tree.
+        clf = TreeClassifier().train(x_features_train, y)
+
+        x_min, x_max = x_features_train[:, 0].min() - 1, x_features_train[:, 0].max() + 1
+        y_min, y_max = x_features_train[:, 1].min() - 1, x_features_train[:, 1].max() + 1
+
+        # Honour the plot step, but never exceed the pixel budget.
+        nx = max(2, int(np.ceil((x_max - x_min) / plot_step)))
+        ny = max(2, int(np.ceil((y_max - y_min) / plot_step)))
+        if nx * ny > pixel_budget:
+            scale = np.sqrt(float(pixel_budget) / (nx * ny))
+            nx = max(2, int(nx * scale))
+            ny = max(2, int(ny * scale))
+
+        # Round the grid to a whole number of coarse cells.
+        cells_x = max(1, int(np.ceil((nx - 1) / float(refine_factor))))
+        cells_y = max(1, int(np.ceil((ny - 1) / float(refine_factor))))
+        nx = cells_x * refine_factor + 1
+        ny = cells_y * refine_factor + 1
+        xs = np.linspace(x_min, x_max, nx)
+        ys = np.linspace(y_min, y_max, ny)
+
+        # Predict the corners of the coarse cells.
+        xx, yy = np.meshgrid(xs[::refine_factor], ys[::refine_factor])
+        coarse = Plot._predict_in_chunks(clf, np.c_[xx.ravel(), yy.ravel()], chunk_size).reshape(xx.shape)
+
+        # A cell is uniform when its four corners are predicted in the same class.
+        uniform = ((coarse[:-1, :-1] == coarse[1:, :-1]) &
+                   (coarse[:-1, :-1] == coarse[:-1, 1:]) &
+                   (coarse[:-1, :-1] == coarse[1:, 1:]))
+
+        # Fill the full resolution grid with the class of the upper left corner of each cell.
+        Z = np.empty((ny, nx), dtype=coarse.dtype)
+        Z[:-1, :-1] = np.repeat(np.repeat(coarse[:-1, :-1], refine_factor, axis=0), refine_factor, axis=1)
+        Z[-1, :-1] = np.repeat(coarse[-1, :-1], refine_factor)
+        Z[:-1, -1] = np.repeat(coarse[:-1, -1], refine_factor)
+        Z[-1, -1] = coarse[-1, -1]
+
+        # Refine only the cells crossed by a decision boundary.
+        refine = np.zeros((ny, nx), dtype=bool)
+        refine[:-1, :-1] = np.repeat(np.repeat(~uniform, refine_factor, axis=0), refine_factor, axis=1)
+        refine[-1, :-1] = refine[-2, :-1]
+        refine[:, -1] = refine[:, -2]
+        rows, cols = np.nonzero(refine)
+        if rows.shape[0] > 0:
+            Z[rows, cols] = Plot._predict_in_chunks(clf, np.c_[xs[cols], ys[rows]], chunk_size)
+
+        return (x_min, x_max, y_min, y_max), Z
+
+    @staticmethod
+    def draw_tree_decision_surface(fig, X, y, feature_name1, feature_name2, pixel_budget=250000, refine_factor=8,
+                                   chunk_size=65536, n_jobs=-1):
+        """ Draw the surface of decision of a decision tree on a figure.
+
+        Args:
+            fig : the matplotlib figure to draw on.
             X : the feature vector.
             y : ground truth labels.
             feature_name1 : a string defining the name of the first feature.
             feature_name2 : a string defining the name of the second feature.
-            filename : path where the plot is saved.
-
-        Returns:
-            None, but saves plot to a file.
+            pixel_budget : the maximum number of points predicted for each decision surface.
+            refine_factor : the side, in points, of the coarse cells used to locate the decision boundaries.
+            chunk_size : the maximum number of points predicted at once.
+            n_jobs : the number of parallel jobs used to fit the pairwise decision trees.
         """
         # Plot parameters.
         n_classes = 3
         plot_colors = "ryb"
         plot_step = 0.02
         target_names = ["smooth", "spiral", "artifact"]
+        pairs = [[0, 1], [0, 2], [0, 3], [1, 2], [1, 3], [2, 3]]
+
+        # Fit the pairwise decision trees and compute their decision surfaces in parallel.
+        surfaces = Parallel(n_jobs=n_jobs)(
+            delayed(Plot._decision_surface)(X, y, pair, plot_step, pixel_budget, refine_factor, chunk_size)
+            for pair in pairs)
 
-        for pairidx, pair in enumerate([[0, 1], [0, 2], [0, 3],
-                                        [1, 2], [1, 3], [2, 3]]):
+        for pairidx, (pair, (extent, Z)) in enumerate(zip(pairs, surfaces)):
 
             # Arranges the data in pair of features.
             x_features_train = X[:, pair]
 
-            # Train a decision tree.
-            clf = TreeClassifier()
-            clf.train(X=x_features_train, y=y)
-
             # Plot the decision boundary
-            plt.subplot(2, 3, pairidx + 1)
+            ax = fig.add_subplot(2, 3, pairidx + 1)
+            ax.imshow(Z, extent=extent, origin="lower", aspect="auto", interpolation="nearest", cmap=cm.RdYlBu)
 
-            x_min, x_max = x_features_train[:, 0].min() - 1, x_features_train[:, 0].max() + 1
-            y_min, y_max = x_features_train[:, 1].min() - 1, x_features_train[:, 1].max() + 1
-            xx, yy = np.meshgrid(np.arange(x_min, x_max, plot_step),
-                                 np.arange(y_min, y_max, plot_step))
-            plt.tight_layout(h_pad=0.5, w_pad=0.5, pad=2.5)
-
-            Z = clf.predict(np.c_[xx.ravel(), yy.ravel()])
-            Z = Z.reshape(xx.shape)
-            cs = plt.contourf(xx, yy, Z, cmap=plt.cm.RdYlBu)
-
-            plt.xlabel(feature_name1)
-            plt.ylabel(feature_name2)
+            ax.set_xlabel(feature_name1)
+            ax.set_ylabel(feature_name2)
 
             # Plot the training points
             for i, color in zip(range(n_classes), plot_colors):
                 idx = np.where(y == i)
-                plt.scatter(x_features_train[idx, 0], x_features_train[idx, 1], c=color, label=target_names[i],
-                            cmap=plt.cm.RdYlBu, edgecolor='black', s=15)
+                ax.scatter(x_features_train[idx, 0], x_features_train[idx, 1], c=color, label=target_names[i],
+                           edgecolor='black', s=15)
+
+        fig.tight_layout(h_pad=0.5, w_pad=0.5, pad=2.5)
+        fig.suptitle("Decision surface of a decision tree using paired features")
+        ax.legend(loc='lower right', borderpad=0, handletextpad=0)
+        ax.axis("tight")
+
+    @staticmethod
+    def plot_tree_decision_surface(X, y, feature_name1, feature_name2, filename="/tmp/decision_tree.png",
+                                   pixel_budget=250000, refine_factor=8, chunk_size=65536, n_jobs=-1, exporter=None):
+        """ Plot the surface of decision of a decision tree.
+
+        Args:
+            X : the feature vector.
+            y : ground truth labels.
+            feature_name1 : a string defining the name of the first feature.
+            feature_name2 : a string defining the name of the second feature.
+            filename : path where the plot is saved.
+            pixel_budget : the maximum number of points predicted for each decision surface.
+            refine_factor : the side, in points, of the coarse cells used to locate the decision boundaries.
+            chunk_size : the maximum number of points predicted at once.
+            n_jobs : the number of parallel jobs used to fit the pairwise decision trees.
+            exporter : a PlotExporter used to render the plot asynchronously. If None, the plot is rendered immediately.
+
+        Returns:
+            None if the plot is rendered immediately, else a Future whose result is the file name of the saved plot.
+        """
+        kwargs = dict(X=X, y=y, feature_name1=feature_name1, feature_name2=feature_name2, pixel_budget=pixel_budget,
+                      refine_factor=refine_factor, chunk_size=chunk_size, n_jobs=n_jobs)
+
+        if exporter is not None:
+            return exporter.submit(Plot.draw_tree_decision_surface, filename, **kwargs)
 
-        plt.suptitle("Decision surface of a decision tree using paired features")
-        plt.legend(loc='lower right', borderpad=0, handletextpad=0)
-        plt.axis("tight")
-        plt.savefig(filename)
+        render_figure(Plot.draw_tree_decision_surface, filename, **kwargs)
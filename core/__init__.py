@@ -1 +1,7 @@
-from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
\ No newline at end of file
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+from core.feature_extraction.galaxy.duplicate_index import DuplicateIndex
+from core.feature_extraction.galaxy.extraction_job import ExtractionJob
+from core.feature_extraction.galaxy.feature_registry import FeatureMatrix, FeatureRegistry, default_registry
+from core.feature_extraction.galaxy.image_decoder import GalaxyImageDecoder
+from core.feature_extraction.galaxy.shard_store import GalaxyShardStore, GalaxyShardWriter
+from core.feature_extraction.galaxy.similarity_index import SimilarityIndex
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import cv2
+import numpy as np
+
+
+class DuplicateIndex(object):
+    """ Find duplicate and near-duplicate galaxy images with perceptual hashes.
+
+    An image is hashed into 64 bits from the low frequencies of the DCT of its downsampled grayscale center crop, so
+    re-observations of a galaxy with slight changes in noise, brightness or compression have hashes a few bits apart.
+
+    The hashes are indexed by multi-index hashing: they are cut into max_distance + 1 blocks, and every block is the
+    key of a bucket. Two hashes at a Hamming distance of at most max_distance share at least one identical block, so a
+    lookup only verifies the hashes of max_distance + 1 buckets instead of the whole catalog.
+    """
+
+    HASH_BITS = 64
+
+    def __init__(self, processor, max_distance=4, crop=75, resize=32):
+        """ Initialize the index.
+
+        Args:
+            processor: The GalaxyProcessor used to load, crop and convert the images to grayscale.
+            max_distance: The maximum Hamming distance, in bits, between the hashes of two near duplicates.
+            crop: Half the size of the center crop hashed, in pixels of the 424x424 images.
+            resize: The size of the downsampled crop whose DCT is computed.
+        """
+        if not 0 <= max_distance < self.HASH_BITS:
+            raise ValueError("Maximum distance must be in range [0, 63]: " + str(max_distance))
+
+        self.processor = processor
+        self.max_distance = max_distance
+        self.crop = crop
+        self.resize = resize
+
+        # Cut the hashes into max_distance + 1 blocks of almost equal size.
+        bounds = np.linspace(0, self.HASH_BITS, max_distance + 2).astype(int)
+        self._blocks = [(int(start), (1 << int(end - start)) - 1) for start, end in zip(bounds[:-1], bounds[1:])]
+
+        self._ids = list()
+        self._hashes = list()
+        self._buckets = [dict() for _ in self._blocks]
+
+    def __len__(self):
+        return len(self._ids)
+
+    def perceptual_hash(self, image):
+        """ Compute the perceptual hash of a galaxy image.
+
+        Args:
+            image: An OpenCV standard color image format.
+
+        Returns:
+            The hash as a 64-bit integer.
+        """
+        gray = self.processor.get_gray_image(image)
+        center = gray.shape[0] // 2
+        gray = self.processor.crop_image(gray, center - self.crop, center + self.crop)
+        small = cv2.resize(gray, (self.resize, self.resize), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+        # Keep the 8x8 lowest frequencies, and one bit per frequency: above or below their median.
+        frequencies = cv2.dct(small)[:8, :8]
+        bits = (frequencies > np.median(frequencies)).ravel()
+
+        return int.from_bytes(np.packbits(bits).tobytes(), byteorder="big")
+
+    def hash_image(self, img_id):
+        """ Read the center crop of a galaxy image from the image source of the processor and compute its perceptual hash.
+
+        Args:
+            img_id: The ID of the galaxy.
+
+        Returns:
+            The hash as a 64-bit integer.
+        """
+        return self.perceptual_hash(self.processor.image_source.read(img_id))
+
+    def _keys(self, image_hash):
+        """ Cut a hash into the keys of its buckets. """
+        return [(image_hash >> start) & mask for start, mask in self._blocks]
+
+    def add(self, img_id, image_hash):
+        """ Add a hash to the index.
+
+        Args:
+            img_id: The ID of the galaxy.
+            image_hash: The perceptual hash of its image.
+        """
+        position = len(self._ids)
+        self._ids.append(img_id)
+        self._hashes.append(image_hash)
+
+        for bucket, key in zip(self._buckets, self._keys(image_hash)):
+            bucket.setdefault(key, list()).append(position)
+
+    def query(self, image_hash, max_distance=None):
+        """ Find the indexed images near an image.
+
+        Args:
+            image_hash: The perceptual hash of the image.
+            max_distance: The maximum Hamming distance, at most the one of the index. Defaults to the one of the index.
+
+        Returns:
+            A list of tuples (galaxy ID, Hamming distance), sorted by distance.
+
+        Raises:
+            ValueError: If max_distance exceeds the one of the index, as the buckets would miss some near images.
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        elif max_distance > self.max_distance:
+            raise ValueError("Maximum distance must be at most the one of the index, " + str(self.max_distance) +
+                             ": " + str(max_distance))
+
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._keys(image_hash)):
+            candidates.update(bucket.get(key, ()))
+
+        if not candidates:
+            return list()
+
+        # Verify the candidates by counting the bits of their difference.
+        candidates = np.fromiter(candidates, dtype=np.intp)
+        hashes = np.array([self._hashes[i] for i in candidates], dtype=np.uint64)
+        differences = (hashes ^ np.uint64(image_hash)).astype(">u8").view(np.uint8).reshape(-1, 8)
+        distances = np.unpackbits(differences, axis=1).sum(axis=1)
+
+        near = np.flatnonzero(distances <= max_distance)
+        near = near[np.argsort(distances[near], kind="mergesort")]
+
+        return [(self._ids[candidates[i]], int(distances[i])) for i in near]
+
+    def find_duplicates(self, img_ids):
+        """ Hash and index images, and find which of them duplicate an image seen before.
+
+        Args:
+            img_ids: The IDs of the galaxies.
+
+        Returns:
+            A dictionary mapping the ID of every duplicate to the ID of the nearest image indexed before it.
+        """
+        duplicates = dict()
+
+        for img_id in img_ids:
+            image_hash = self.hash_image(img_id)
+            near = self.query(image_hash)
+            if near:
+                original_id = near[0][0]
+                duplicates[img_id] = duplicates.get(original_id, original_id)
+            self.add(img_id, image_hash)
+
+        return duplicates
+
+    def save(self, filename):
+        """ Save the galaxy IDs and the hashes of the index.
+
+        Args:
+            filename: The path to the .npz file.
+        """
+        np.savez(filename, ids=np.array(self._ids), hashes=np.array(self._hashes, dtype=np.uint64))
+
+    def load(self, filename):
+        """ Add the galaxy IDs and the hashes saved in a file to the index.
+
+        Args:
+            filename: The path to the .npz file.
+
+        Returns:
+            The index itself.
+        """
+        with np.load(filename) as saved:
+            for img_id, image_hash in zip(saved["ids"].tolist(), saved["hashes"].tolist()):
+                self.add(img_id, image_hash)
+
+        return self
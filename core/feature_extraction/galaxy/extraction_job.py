@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from commons.helpers.dtype_policy import get_float_type
+from core.feature_extraction.galaxy.feature_registry import FeatureMatrix
+
+
+class ExtractionJob(object):
+    """ Extract the features of a catalog of galaxies in checkpointed chunks, so that a job can be resumed.
+
+    The IDs are processed one chunk at a time. The features of a completed chunk are written to their own file, then
+    the manifest, which lists the completed chunks, is updated. Both are written to a temporary file first, then
+    atomically renamed, so that a crash never leaves a partial chunk or manifest behind. A galaxy whose features cannot
+    be extracted, e.g. because of a corrupt image, is recorded in the failures file instead of stopping the job.
+    Running the job again on the same IDs skips the completed chunks.
+    """
+
+    MANIFEST = "manifest.json"
+    FAILURES = "failures.json"
+    IDS = "ids.npy"
+
+    def __init__(self, processor, directory, chunk_size=1000):
+        """ Initialize the job.
+
+        Args:
+            processor: The GalaxyProcessor extracting the features.
+            directory: The directory of the checkpoints of the job.
+            chunk_size: The number of galaxies of a chunk.
+        """
+        self.processor = processor
+        self.directory = directory
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def chunk_file(index):
+        """ Get the name of the file of a chunk. """
+        return "chunk_%05d.npz" % index
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _replace(self, name, write):
+        """ Write a file atomically: write and flush a temporary file, then rename it.
+
+        Args:
+            name: The name of the file in the directory of the job.
+            write: A function writing the content to an open binary file.
+        """
+        temporary = self._path(name + ".tmp")
+        with open(temporary, mode="wb") as output:
+            write(output)
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(temporary, self._path(name))
+
+    def _write_json(self, name, content):
+        self._replace(name, lambda output: output.write(json.dumps(content, indent=2, sort_keys=True).encode("utf-8")))
+
+    def _read_json(self, name, default=None):
+        if not os.path.isfile(self._path(name)):
+            return default
+
+        with open(self._path(name), mode="r") as input_file:
+            return json.load(input_file)
+
+    @property
+    def manifest(self):
+        """ The manifest of the job, or None if the job never started. """
+        return self._read_json(self.MANIFEST)
+
+    @property
+    def failures(self):
+        """ A dictionary mapping the ID of every galaxy whose extraction failed to its error. """
+        return self._read_json(self.FAILURES, dict())
+
+    def _start(self, img_ids):
+        """ Create the manifest of a new job, or check that the job being resumed has the same IDs and features.
+
+        Args:
+            img_ids: The IDs of the galaxies, as strings.
+
+        Returns:
+            The manifest.
+        """
+        columns = dict((name, [block.start, block.stop]) for name, block in self.processor.feature_blocks.items())
+        manifest = self.manifest
+
+        if manifest is None:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            self._replace(self.IDS, lambda output: np.save(output, img_ids))
+            manifest = dict(nb_ids=len(img_ids), chunk_size=self.chunk_size, features=list(self.processor.features),
+                            columns=columns, chunks=dict())
+            self._write_json(self.MANIFEST, manifest)
+            return manifest
+
+        if (manifest["chunk_size"] != self.chunk_size or manifest["features"] != list(self.processor.features) or
+                not np.array_equal(np.load(self._path(self.IDS)), img_ids)):
+            raise ValueError("The job in " + self.directory + " was started with other IDs, chunk size or features.")
+
+        return manifest
+
+    def _extract_chunk(self, img_ids):
+        """ Extract the features of the galaxies of a chunk, one at a time.
+
+        Args:
+            img_ids: The IDs of the galaxies of the chunk.
+
+        Returns:
+            A tuple containing the feature vectors, NaN for the failed galaxies, and a dictionary mapping the ID of
+            every failed galaxy to its error.
+        """
+        nb_features = sum(block.stop - block.start for block in self.processor.feature_blocks.values())
+        features = np.full((len(img_ids), nb_features), np.nan, dtype=get_float_type())
+        failures = dict()
+
+        for i, img_id in enumerate(img_ids):
+            try:
+                features[i] = self.processor.get_features(img_id)
+            except Exception as error:
+                failures[img_id] = type(error).__name__ + ": " + str(error)
+
+        return features, failures
+
+    def run(self, img_ids):
+        """ Extract the features of every galaxy, resuming from the last completed chunk.
+
+        Args:
+            img_ids: The IDs of the galaxies.
+
+        Returns:
+            The job itself.
+        """
+        img_ids = np.array([str(img_id) for img_id in img_ids])
+        manifest = self._start(img_ids)
+        failures = self.failures
+
+        for index, start in enumerate(range(0, len(img_ids), self.chunk_size)):
+            if str(index) in manifest["chunks"]:
+                continue
+
+            chunk_ids = img_ids[start:start + self.chunk_size]
+            features, chunk_failures = self._extract_chunk(list(chunk_ids))
+            valid = np.array([img_id not in chunk_failures for img_id in chunk_ids], dtype=bool)
+            self._replace(self.chunk_file(index),
+                          lambda output: np.savez(output, ids=chunk_ids, features=features, valid=valid))
+
+            # The manifest is written last: a chunk only counts as completed once it is listed.
+            failures.update(chunk_failures)
+            self._write_json(self.FAILURES, failures)
+            manifest["chunks"][str(index)] = dict(file=self.chunk_file(index), nb_images=len(chunk_ids),
+                                                  nb_failures=len(chunk_failures))
+            self._write_json(self.MANIFEST, manifest)
+
+        return self
+
+    def load(self):
+        """ Load the features of the galaxies of the completed chunks, failed galaxies excluded.
+
+        Returns:
+            A tuple containing the IDs of the galaxies and a FeatureMatrix of their feature vectors.
+        """
+        manifest = self.manifest
+        if manifest is None:
+            raise ValueError("No extraction job in " + self.directory)
+
+        ids = list()
+        values = list()
+        for index in sorted(manifest["chunks"], key=int):
+            with np.load(self._path(manifest["chunks"][index]["file"])) as chunk:
+                ids.append(chunk["ids"][chunk["valid"]])
+                values.append(chunk["features"][chunk["valid"]])
+
+        columns = OrderedDict((name, slice(*manifest["columns"][name])) for name in manifest["features"])
+        nb_features = sum(block.stop - block.start for block in columns.values())
+        values = np.concatenate(values) if values else np.empty((0, nb_features), dtype=get_float_type())
+
+        return (np.concatenate(ids) if ids else np.empty(0, dtype=str)), FeatureMatrix(values, columns)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from commons.helpers.dtype_policy import get_float_type
+
+
+class Intermediate(object):
+    """
+        An intermediate image computed from other intermediate images, e.g. the gray scale image.
+    """
+
+    def __init__(self, name, function, depends=("image",)):
+        """ Initialize the intermediate.
+
+        Args:
+            name: The name of the intermediate.
+            function: A function(processor, *inputs, scale=scale) computing the intermediate from its inputs.
+            depends: The names of the intermediates given as inputs, "image" being the decoded center crop.
+        """
+        self.name = name
+        self.function = function
+        self.depends = tuple(depends)
+
+
+class FeatureExtractor(object):
+    """
+        A block of features computed from intermediate images.
+    """
+
+    def __init__(self, name, width, function, depends=("image",), parameters=None):
+        """ Initialize the extractor.
+
+        Args:
+            name: The name of the block of features.
+            width: The number of columns of the block.
+            function: A function(processor, *inputs, scale=scale, **parameters) computing the features.
+            depends: The names of the intermediates given as inputs, "image" being the decoded center crop.
+            parameters: A dictionary of the keyword parameters of the function.
+        """
+        self.name = name
+        self.width = width
+        self.function = function
+        self.depends = tuple(depends)
+        self.parameters = dict(parameters or dict())
+
+
+class FeatureMatrix(object):
+    """
+        A feature matrix whose blocks of columns are named.
+    """
+
+    def __init__(self, values, columns):
+        """ Initialize the matrix.
+
+        Args:
+            values: The feature vectors [n_galaxy, n_feature].
+            columns: An ordered dictionary mapping the name of every block of features to its slice of columns.
+        """
+        self.values = values
+        self.columns = columns
+
+    @property
+    def names(self):
+        """ The name of every column, the columns of blocks wider than one being numbered, e.g. "ccv_0". """
+        names = list()
+        for name, columns in self.columns.items():
+            width = columns.stop - columns.start
+            names.extend([name] if width == 1 else ["%s_%d" % (name, i) for i in range(width)])
+
+        return names
+
+    def __getitem__(self, name):
+        return self.values[:, self.columns[name]]
+
+    def __len__(self):
+        return self.values.shape[0]
+
+
+class FeatureRegistry(object):
+    """ Declare the feature extractors of the galaxy images and the intermediate images they depend on.
+
+    The extraction of a selection of features walks the dependency graph whose nodes are (intermediate, scale): every
+    intermediate is computed once per image and scale, and the intermediates no selected feature depends on are never
+    computed.
+    """
+
+    IMAGE = "image"
+
+    def __init__(self):
+        self.intermediates = dict()
+        self.extractors = OrderedDict()
+
+    def add_intermediate(self, name, function, depends=(IMAGE,)):
+        """ Register an intermediate image.
+
+        Args:
+            name: The name of the intermediate.
+            function: A function(processor, *inputs, scale=scale) computing the intermediate from its inputs.
+            depends: The names of the intermediates given as inputs.
+
+        Returns:
+            The registry itself.
+        """
+        if name == self.IMAGE:
+            raise ValueError("The name " + self.IMAGE + " is reserved for the decoded image.")
+
+        self.intermediates[name] = Intermediate(name, function, depends)
+        return self
+
+    def add_feature(self, name, width, function, depends=(IMAGE,), parameters=None):
+        """ Register a block of features. Blocks are ordered in the feature vectors by registration order.
+
+        Args:
+            name: The name of the block of features.
+            width: The number of columns of the block.
+            function: A function(processor, *inputs, scale=scale, **parameters) computing the features.
+            depends: The names of the intermediates given as inputs.
+            parameters: A dictionary of the keyword parameters of the function.
+
+        Returns:
+            The registry itself.
+        """
+        self.extractors[name] = FeatureExtractor(name, width, function, depends, parameters)
+        return self
+
+    def _selection(self, selection):
+        """ Get the extractors of a selection of features, in registration order. """
+        if selection is None:
+            return list(self.extractors.values())
+
+        unknown = set(selection) - set(self.extractors)
+        if unknown:
+            raise KeyError("Unknown features: " + ", ".join(sorted(unknown)))
+
+        return [extractor for name, extractor in self.extractors.items() if name in selection]
+
+    def columns(self, selection=None):
+        """ Get the columns of the blocks of features of a selection.
+
+        Args:
+            selection: The names of the selected features, or None for every registered feature.
+
+        Returns:
+            An ordered dictionary mapping the name of every selected block to its slice of columns.
+        """
+        columns = OrderedDict()
+        start = 0
+        for extractor in self._selection(selection):
+            columns[extractor.name] = slice(start, start + extractor.width)
+            start += extractor.width
+
+        return columns
+
+    def scales(self, selection=None, scale_policy=None):
+        """ Get the scales at which the images must be decoded to extract a selection of features.
+
+        Args:
+            selection: The names of the selected features, or None for every registered feature.
+            scale_policy: A dictionary of the decoding scale of some features. The other ones are at full scale.
+
+        Returns:
+            The sorted list of the scales.
+        """
+        scale_policy = scale_policy or dict()
+        return sorted(set(scale_policy.get(extractor.name, 1) for extractor in self._selection(selection)))
+
+    def plan(self, selection=None, scale_policy=None):
+        """ Get the nodes of the dependency graph of a selection of features, in the order they are computed.
+
+        Args:
+            selection: The names of the selected features, or None for every registered feature.
+            scale_policy: A dictionary of the decoding scale of some features. The other ones are at full scale.
+
+        Returns:
+            The list of the (intermediate, scale) nodes, dependencies first.
+        """
+        scale_policy = scale_policy or dict()
+        order = list()
+        done = set()
+        visiting = set()
+
+        def visit(name, scale):
+            node = (name, scale)
+            if node in done:
+                return
+            if node in visiting:
+                raise ValueError("Cyclic dependency of the intermediate " + name)
+            visiting.add(node)
+
+            if name != self.IMAGE:
+                if name not in self.intermediates:
+                    raise KeyError("Unknown intermediate: " + name)
+                for dependency in self.intermediates[name].depends:
+                    visit(dependency, scale)
+
+            visiting.remove(node)
+            done.add(node)
+            order.append(node)
+
+        for extractor in self._selection(selection):
+            for dependency in extractor.depends:
+                visit(dependency, scale_policy.get(extractor.name, 1))
+
+        return order
+
+    def extract(self, processor, images, selection=None, scale_policy=None):
+        """ Extract a selection of features from the images of a galaxy.
+
+        Args:
+            processor: The GalaxyProcessor given to the functions of the intermediates and the extractors.
+            images: A dictionary mapping every needed scale to the center crop decoded at that scale.
+            selection: The names of the selected features, or None for every registered feature.
+            scale_policy: A dictionary of the decoding scale of some features. The other ones are at full scale.
+
+        Returns:
+            The feature vector, in the feature floating point type.
+        """
+        scale_policy = scale_policy or dict()
+        values = dict()
+
+        for name, scale in self.plan(selection, scale_policy):
+            if name == self.IMAGE:
+                values[(name, scale)] = images[scale]
+            else:
+                intermediate = self.intermediates[name]
+                inputs = [values[(dependency, scale)] for dependency in intermediate.depends]
+                values[(name, scale)] = intermediate.function(processor, *inputs, scale=scale)
+
+        columns = self.columns(selection)
+        features = np.empty(sum(extractor.width for extractor in self._selection(selection)), dtype=get_float_type())
+
+        for extractor in self._selection(selection):
+            scale = scale_policy.get(extractor.name, 1)
+            inputs = [values[(dependency, scale)] for dependency in extractor.depends]
+            block = np.ravel(extractor.function(processor, *inputs, scale=scale, **extractor.parameters))
+            if block.shape[0] != extractor.width:
+                raise ValueError("The feature " + extractor.name + " has " + str(block.shape[0]) +
+                                 " columns instead of " + str(extractor.width))
+            features[columns[extractor.name]] = block
+
+        return features
+
+
+def _gray(processor, image, scale):
+    return processor.get_gray_image(image)
+
+
+def _ratio(processor, image, scale):
+    return processor.get_ratio_aspect(image, scale)[0]
+
+
+def _circularity(processor, image, scale):
+    return processor.calculate_circularity(image, scale)
+
+
+def _ccv(processor, image, scale, threshold, nb_colors):
+    return processor.get_ccv(image, threshold / scale ** 2, nb_colors, scale)
+
+
+def _gini(processor, gray, scale):
+    return processor.gini(gray.astype(get_float_type()))
+
+
+def _entropy(processor, gray, scale):
+    return processor.get_entropy(gray)
+
+
+def _light_radius(processor, gray, scale, r):
+    return processor.get_light_radius(gray, list(r))
+
+
+def default_registry():
+    """ Create a registry of the features of the galaxy images.
+
+    Returns:
+        A new FeatureRegistry, which can be extended without changing the one of other processors.
+    """
+    registry = FeatureRegistry()
+    registry.add_intermediate("gray", _gray)
+    registry.add_feature("ratio", 1, _ratio)
+    registry.add_feature("circularity", 1, _circularity)
+    registry.add_feature("ccv", 2 * 64, _ccv, parameters=dict(threshold=160 ** 2 * 0.01, nb_colors=64))
+    registry.add_feature("gini", 1, _gini, depends=("gray",))
+    registry.add_feature("entropy", 1, _entropy, depends=("gray",))
+    registry.add_feature("light_radius", 2, _light_radius, depends=("gray",), parameters=dict(r=(0.1, 0.8)))
+
+    return registry
@@ -24,44 +24,78 @@ import scipy.ndimage as nd
 from scipy.stats.mstats import mquantiles, kurtosis, skew
 from sklearn.preprocessing import LabelEncoder
 
+from commons.helpers.affine import compose
+from commons.helpers.dtype_policy import get_float_type
+from core.feature_extraction.galaxy.feature_registry import FeatureMatrix, default_registry
+from core.feature_extraction.galaxy.image_decoder import GalaxyImageDecoder, crop_center
+
 
 class GalaxyProcessor(object):
     """ Process galaxy images and extract the features."""
 
-    def __init__(self, path):
+    # The features extracted by default, among the ones of the feature registry.
+    DEFAULT_FEATURES = ("ratio", "circularity", "ccv")
+
+    # The scale at which the image of every block of features is decoded. 1 is the exact full scale decoding.
+    DEFAULT_SCALE_POLICY = {"ratio": 1, "circularity": 1, "ccv": 1}
+
+    def __init__(self, path, scale_policy=None, image_source=None, features=None, registry=None):
+        """ Initialize the processor.
+
+        Args:
+            path: The directory of the galaxy images.
+            scale_policy: A dictionary of the decoding scale (1, 2, 4 or 8) of some blocks of features, e.g.
+                          {"ccv": 2}. The other blocks are decoded at full scale.
+            image_source: The source of the center crops of the images, e.g. a GalaxyShardStore or a
+                          GalaxyHttpSource. Defaults to a GalaxyImageDecoder of the JPEG files in path.
+            features: The names of the extracted blocks of features, e.g. ("ratio", "gini", "light_radius").
+                      Defaults to DEFAULT_FEATURES.
+            registry: The FeatureRegistry declaring the features. Defaults to the default registry.
+        """
         self._img_path = path
         self._exts = ".jpg"
+        self.image_source = image_source if image_source is not None else GalaxyImageDecoder(path, self._exts)
+        self.scale_policy = dict(self.DEFAULT_SCALE_POLICY)
+        self.scale_policy.update(scale_policy or dict())
+        self.registry = registry if registry is not None else default_registry()
+        self.features = tuple(features if features is not None else self.DEFAULT_FEATURES)
+        self.feature_blocks = self.registry.columns(self.features)
 
-    def process_galaxy(self, dataset):
-        """ Process a galaxy image.
+    def process_galaxy(self, dataset, duplicates=None):
+        """ Process the galaxy images of a data set.
 
-        Get all the features from a galaxy image.
+        Get all the features from the galaxy images of the training set, then of the validation set.
 
         Args:
-            galaxy_id: a string containing the galaxy ID
+            dataset: A DataSets object of galaxy IDs, with a training and a validation set.
+            duplicates: An optional dictionary mapping the ID of known duplicate galaxies to the ID of their original,
+                        as found by a DuplicateIndex. The features of a duplicate are not extracted again: the ones of
+                        its original are reused.
 
         Returns:
-             An array containing the image's features.
+             A list containing the feature vector of every galaxy, in the order of the data sets.
         """
-        features = list()
-
-        for sample, label in zip(dataset.train._img_names, dataset.train._labels):
+        if duplicates is None:
+            duplicates = dict()
 
-            # Get the file name associated with the galaxy ID.
-            file = self.get_image_path() + str(sample[0]) + ".jpg"
-
-            # Compute the features and append to the list.
-            feature_vector = self.get_features(file, sample[0], label[0])
-            features.append(feature_vector)
+        features = list()
 
-        for sample, label in zip(dataset.valid._img_names, dataset.valid._labels):
+        # The features of the originals of duplicates are kept to be reused.
+        originals = set(duplicates.values())
+        extracted = dict()
 
-            # Get the file name associated with the galaxy ID.
-            file = self.get_image_path() + str(sample[0]) + ".jpg"
+        for data_set in (dataset.train, dataset.valid):
+            for sample in data_set._img_names:
 
-            # Compute the features and append to the list.
-            feature_vector = self.get_features(file, sample[0], label[0])
-            features.append(feature_vector)
+                # Compute the features of the galaxy, or of its original if it is a known duplicate.
+                img_id = duplicates.get(sample[0], sample[0])
+                if img_id in extracted:
+                    feature_vector = extracted[img_id]
+                else:
+                    feature_vector = self.get_features(img_id)
+                    if img_id in originals:
+                        extracted[img_id] = feature_vector
+                features.append(feature_vector)
 
         return features
 
@@ -93,6 +127,18 @@ class GalaxyProcessor(object):
         """
         return image[width:height, width:height]
 
+    def crop_center(self, image, half_size):
+        """ Crop the center of an image.
+
+        Args:
+            image: an OpenCV standard image format.
+            half_size: half the size of the crop, in pixels.
+
+        Returns:
+             The center of the image, as a view.
+        """
+        return crop_center(image, half_size)
+
     def gaussian_filter(self, image, kernel_width, kernel_height):
         """ Apply a gaussian filter.
 
@@ -121,10 +167,11 @@ class GalaxyProcessor(object):
         Returns:
             The image with rescaled colors.
         """
-        image = image.astype('float')
+        image = image.astype(get_float_type())
         image -= image.min()
         image /= image.max()
-        image = image * (max - min) + min
+        image *= max - min
+        image += min
 
         return image
 
@@ -141,40 +188,141 @@ class GalaxyProcessor(object):
         Returns:
             The image with saturated contrasts.
         """
-        image = image.astype('float')
         if q0 is None:
             q0 = 0
         if q1 is None:
             q1 = 1
-        q = mquantiles(image[np.nonzero(image)].flatten(), [q0, q1])
-        image[image < q[0]] = q[0]
-        image[image > q[1]] = q[1]
+        if image.dtype == np.uint8:
+            # Same quantiles as mquantiles, read from the histogram of the nonzero pixels.
+            histogram = self.get_uint8_histograms(image[np.newaxis])[0]
+            histogram[0] = 0
+            q = self.histogram_quantiles(histogram, [q0, q1])
+            image = image.astype(get_float_type())
+        else:
+            image = image.astype(get_float_type())
+            q = np.ma.filled(mquantiles(image[np.nonzero(image)].flatten(), [q0, q1]), np.nan)
+        # Without nonzero pixel, the quantiles are undefined and the image is left unclipped.
+        if not np.isnan(q).any():
+            np.clip(image, q[0], q[1], out=image)
 
         return image
 
-    def largest_connected_component(self, image, labels, nb_labels):
+    def get_uint8_histograms(self, images, mask=None):
+        """ Count the values of a stack of 8-bit images.
+
+        Args:
+            images: a uint8 array [n_image, ...].
+            mask: an optional boolean array of the shape of an image, or of the stack, selecting the pixels counted.
+
+        Returns:
+            The histograms [n_image, 256].
+        """
+        # One cv2.calcHist call per image: on 8-bit values, it is faster than a single np.bincount over the stack.
+        nb_images = images.shape[0]
+        if mask is not None:
+            mask = np.broadcast_to(mask, images.shape).reshape(nb_images, 1, -1).astype(np.uint8)
+
+        histograms = np.empty((nb_images, 256), dtype=np.int64)
+        for i in range(nb_images):
+            # calcHist counts in C, without sorting nor gathering the masked pixels.
+            values = np.ascontiguousarray(images[i]).reshape(1, -1)
+            histograms[i] = cv2.calcHist([values], [0], None if mask is None else mask[i], [256], [0, 256]).ravel()
+
+        return histograms
+
+    def _order_statistics(self, histograms, ranks):
+        """ Get the values of given ranks (0-based) in the sorted values counted by histograms [..., 256]. """
+        cumulative = np.cumsum(histograms, axis=-1)
+        return (cumulative[..., np.newaxis, :] <= ranks[..., np.newaxis]).sum(axis=-1)
+
+    def histogram_quantiles(self, histograms, probabilities, alphap=0.4, betap=0.4):
+        """ Compute quantiles from histograms, exactly as scipy.stats.mstats.mquantiles on the counted values.
+
+        Args:
+            histograms: the histograms of 8-bit values [..., 256], e.g. from get_uint8_histograms.
+            probabilities: the probabilities of the quantiles.
+            alphap: the plotting positions parameter alpha of mquantiles.
+            betap: the plotting positions parameter beta of mquantiles.
+
+        Returns:
+            The quantiles [..., n_probability], NaN for empty histograms.
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        counts = np.asarray(histograms).sum(axis=-1)[..., np.newaxis].astype(np.float64)
+
+        # The plotting positions of mquantiles, between the order statistics k - 1 and k.
+        position = counts * probabilities + (alphap + probabilities * (1.0 - alphap - betap))
+        k = np.floor(np.clip(position, 1, np.maximum(counts - 1, 1)))
+        gamma = np.clip(position - k, 0.0, 1.0)
+        k = np.minimum(k, counts - 1).astype(np.intp)
+
+        lower = self._order_statistics(histograms, np.maximum(k - 1, 0))
+        upper = self._order_statistics(histograms, np.maximum(k, 0))
+
+        quantiles = (1.0 - gamma) * lower + gamma * upper
+        quantiles[np.broadcast_to(counts == 0, quantiles.shape)] = np.nan
+
+        return quantiles
+
+    def histogram_medians(self, histograms):
+        """ Compute medians from histograms, exactly as numpy.median on the counted values.
+
+        Args:
+            histograms: the histograms of 8-bit values [..., 256], e.g. from get_uint8_histograms.
+
+        Returns:
+            The medians [...], NaN for empty histograms.
+        """
+        counts = np.asarray(histograms).sum(axis=-1)
+        ranks = np.stack(((counts - 1) // 2, counts // 2), axis=-1)
+
+        return np.where(counts == 0, np.nan, self._order_statistics(histograms, ranks).mean(axis=-1))
+
+    def largest_connected_component(self, image, labels, nb_labels, stats=None, centroids=None):
         """ Select the largest connected component.
 
         Select the largest connected component which is closest to the center using a weighting size/distance**2.
+        The sizes and the centers of mass of all the components are computed at once with np.bincount.
 
         Args:
             image: an OpenCV standard image format.
             labels: image labels.
             nb_labels: number of image labels.
+            stats: optional component statistics returned by cv2.connectedComponentsWithStats, used as sizes.
+            centroids: optional component centroids returned by cv2.connectedComponentsWithStats, used as centers
+                       instead of the centers of mass weighted by the image.
 
         Returns:
             A thresholded image of the largest connected component.
         """
-        sizes = np.bincount(labels.flatten(),
-                            minlength=nb_labels + 1)
-        centers = nd.center_of_mass(image, labels, range(1, nb_labels + 1))
+        flat_labels = labels.ravel()
 
-        distances = list(map(lambda args:
-                             (image.shape[0] / 2 - args[1]) ** 2 + (image.shape[1] / 2 - args[0]) ** 2,
-                             centers))
+        if stats is not None:
+            sizes = stats[:nb_labels + 1, cv2.CC_STAT_AREA].astype(np.float64)
+        else:
+            sizes = np.bincount(flat_labels, minlength=nb_labels + 1)[:nb_labels + 1].astype(np.float64)
+
+        if centroids is not None:
+            center_x = centroids[:nb_labels + 1, 0]
+            center_y = centroids[:nb_labels + 1, 1]
+        else:
+            # Centers of mass weighted by the image, as with scipy.ndimage.center_of_mass.
+            def label_sums(weights):
+                return np.bincount(flat_labels, weights=weights, minlength=nb_labels + 1)[:nb_labels + 1]
+
+            weights = image.ravel().astype(np.float64)
+            rows, columns = np.divmod(np.arange(flat_labels.shape[0]), labels.shape[1])
+            masses = label_sums(weights)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                center_y = label_sums(weights * rows) / masses
+                center_x = label_sums(weights * columns) / masses
+
+        distances = (image.shape[0] / 2 - center_x) ** 2 + (image.shape[1] / 2 - center_y) ** 2
+        distances[0] = 1.0
+
+        # Components without any mass have no center; they are never selected.
+        distances[np.isnan(distances)] = np.inf
 
-        distances = [1.0] + distances
-        distances = np.array(distances)
         sizes[0] = 0
         sizes[sizes < 20] = 0
         sizes = sizes / (distances + 0.000001)
@@ -204,7 +352,8 @@ class GalaxyProcessor(object):
         translation_matrix = np.array([[1, 0, cx - x], [0, 1, cy - y]], dtype='float32')
 
         # Compute the afine transform.
-        recentered_image = cv2.warpAffine(image, translation_matrix, image.shape[:2], flags=interpolation)
+        recentered_image = cv2.warpAffine(image, translation_matrix, (image.shape[1], image.shape[0]),
+                                          flags=interpolation)
 
         return recentered_image
 
@@ -220,13 +369,7 @@ class GalaxyProcessor(object):
         Returns:
             The composition matrix of the affine transforms.
         """
-        n1 = np.eye(3, dtype='float32')
-        n2 = np.eye(3, dtype='float32')
-        n1[:2] = matrix1
-        n2[:2] = matrix2
-        n3 = np.dot(n1, n2)
-
-        return n3[:2]
+        return compose(matrix1, matrix2)
 
     def rotate(self, image, x, y, angle, interpolation=cv2.INTER_LINEAR):
         """ Rotate an image.
@@ -259,7 +402,7 @@ class GalaxyProcessor(object):
         m = self.compose(rotation_matrix, translation_matrix)
 
         # Compute the rotation.
-        rotated_image = cv2.warpAffine(image, m, image.shape[:2], flags=interpolation)
+        rotated_image = cv2.warpAffine(image, m, (image.shape[1], image.shape[0]), flags=interpolation)
 
         return rotated_image
 
@@ -294,20 +437,118 @@ class GalaxyProcessor(object):
             factor: the 1.96 factor in order to contain 95% of the galaxy.
 
         Returns:
-            The center of the ellipse, the singular values, and the angle.
+            The center of the ellipse, the singular values, and the angle in range (-90, 90].
+
+        """
+        centers, axes, angles = self.fit_ellipse_batch([points], factor)
+
+        return centers[0], axes[0], angles[0]
+
+    def fit_ellipse_batch(self, points, factor=1.96):
+        """ Fit ellipses to several sets of points at once.
+
+        The covariance of every set of points is a 2x2 symmetric matrix [[a, b], [b, c]], whose eigenvalues and
+        principal axis have a closed form: no SVD is needed.
+
+        Args:
+            points: a list of arrays of image points [n_point, 2].
+            factor: the 1.96 factor in order to contain 95% of the galaxy.
+
+        Returns:
+            The centers of the ellipses [n_set, 2], their axes [n_set, 2], the major axis first, and the angles of
+            their major axis in degrees, in range (-90, 90].
+        """
+        counts = np.array([len(p) for p in points])
+        sets = np.repeat(np.arange(len(points)), counts)
+        points = np.concatenate(points).astype(np.float64)
+
+        def set_sums(values):
+            return np.bincount(sets, weights=values, minlength=len(counts))
+
+        centers = np.column_stack((set_sums(points[:, 0]), set_sums(points[:, 1]))) / counts[:, np.newaxis]
+        points -= centers[sets]
+
+        # The covariance matrices, with the same normalization as the singular values divided by sqrt(n - 1).
+        degrees_of_freedom = np.maximum(counts - 1, 1)
+        a = set_sums(points[:, 0] ** 2) / degrees_of_freedom
+        b = set_sums(points[:, 0] * points[:, 1]) / degrees_of_freedom
+        c = set_sums(points[:, 1] ** 2) / degrees_of_freedom
+
+        half_trace = (a + c) / 2
+        delta = np.sqrt(((a - c) / 2) ** 2 + b ** 2)
+        eigenvalues = np.column_stack((half_trace + delta, np.maximum(half_trace - delta, 0.0)))
+        angles = np.degrees(np.arctan2(2 * b, a - c) / 2)
+
+        return centers, 2 * factor * np.sqrt(eigenvalues), angles
+
+    def canonical_matrix(self, center, angle, crop_size):
+        """ Compute the affine matrix bringing a galaxy to its canonical position in a crop.
+
+        The rotation about the galaxy center aligns its major axis with the X axis, then a translation moves the
+        galaxy center to the crop center.
+
+        Args:
+            center: the (x, y) coordinates of the galaxy center.
+            angle: the angle of the major axis of the galaxy, in degrees.
+            crop_size: the (width, height) of the crop.
+
+        Returns:
+            The affine matrix.
+        """
+        rotation_matrix = cv2.getRotationMatrix2D((float(center[0]), float(center[1])), float(angle), 1.0)
+        translation_matrix = np.array([[1, 0, crop_size[0] / 2.0 - center[0]],
+                                       [0, 1, crop_size[1] / 2.0 - center[1]]], dtype='float32')
+
+        return self.compose(translation_matrix, rotation_matrix)
+
+    def canonicalize(self, image, mask, crop_size=(300, 300), factor=1.96, interpolation=cv2.INTER_LINEAR):
+        """ Center, rotate and crop a galaxy image in a single warp.
+
+        Args:
+            image: an OpenCV standard image format.
+            mask: the galaxy pixels, e.g. the thresholded image of get_center_of_mass.
+            crop_size: the (width, height) of the canonical crop.
+            factor: the 1.96 factor in order to contain 95% of the galaxy.
+            interpolation: interpolation method.
+
+        Returns:
+            The canonical crop of the galaxy, and its fitted ellipse as a tuple (center, axes, angle).
+        """
+        rows, columns = np.nonzero(mask)
+        center, axes, angle = self.fit_ellipse(np.column_stack((columns, rows)), factor)
+        matrix = self.canonical_matrix(center, angle, crop_size)
+
+        return cv2.warpAffine(image, matrix, tuple(crop_size), flags=interpolation), (center, axes, angle)
+
+    def canonicalize_batch(self, images, masks, crop_size=(300, 300), factor=1.96, interpolation=cv2.INTER_LINEAR,
+                           out=None):
+        """ Center, rotate and crop a batch of galaxy images, warping every image once into the batch of crops.
+
+        Args:
+            images: the galaxy images [n_image, height, width, ...].
+            masks: the galaxy pixels of every image [n_image, height, width].
+            crop_size: the (width, height) of the canonical crops.
+            factor: the 1.96 factor in order to contain 95% of the galaxy.
+            interpolation: interpolation method.
+            out: an optional array [n_image, crop height, crop width, ...] receiving the crops.
 
+        Returns:
+            The canonical crops, and the fitted ellipses as a tuple (centers, axes, angles).
         """
-        points = points.astype('float')
-        center = points.mean(axis=0)
-        points -= center
+        if out is None:
+            out = np.empty((len(images), crop_size[1], crop_size[0]) + images.shape[3:], dtype=images.dtype)
 
-        U, S, V = np.linalg.svd(points, full_matrices=False)
+        points = list()
+        for mask in masks:
+            rows, columns = np.nonzero(mask)
+            points.append(np.column_stack((columns, rows)))
+        centers, axes, angles = self.fit_ellipse_batch(points, factor)
 
-        S /= np.sqrt(len(points) - 1)
-        S *= factor
-        angle = math.atan2(V[0, 1], V[0, 0]) / math.pi * 180
+        for i in range(len(images)):
+            matrix = self.canonical_matrix(centers[i], angles[i], crop_size)
+            cv2.warpAffine(images[i], matrix, tuple(crop_size), dst=out[i], flags=interpolation)
 
-        return center, 2 * S, angle
+        return out, (centers, axes, angles)
 
     def gini(self, x):
         """ Get the Gini coefficient.
@@ -364,7 +605,7 @@ class GalaxyProcessor(object):
         Returns:
              Image in gray scale in floating point values.
         """
-        return cv2.cvtColor(image.astype("uint8"), cv2.COLOR_BGR2GRAY).astype("float")
+        return cv2.cvtColor(image.astype("uint8"), cv2.COLOR_BGR2GRAY).astype(get_float_type())
 
     def get_gray_image(self, image):
         """ Get an image in gray scales.
@@ -391,8 +632,17 @@ class GalaxyProcessor(object):
         Returns:
             An image cleaned from star light.
         """
-        t = np.max(np.median(image_color[np.nonzero(image_gray)], axis=0))
-        image_color[image_color < t] = t
+        if image_color.dtype == np.uint8:
+            # Same medians as numpy.median, read from the histograms of the channels over the nonzero gray pixels.
+            histograms = self.get_uint8_histograms(np.moveaxis(image_color, -1, 0), mask=image_gray != 0)
+            t = np.max(self.histogram_medians(histograms))
+            # Raising the pixels below t to t, truncated to an integer, is a maximum. Without nonzero gray pixel, t is
+            # NaN and no pixel is raised.
+            if not np.isnan(t):
+                np.maximum(image_color, np.uint8(t), out=image_color)
+        else:
+            t = np.max(np.median(image_color[np.nonzero(image_gray)], axis=0))
+            image_color[image_color < t] = t
 
         return self.rescale(image_color).astype("uint8")
 
@@ -423,7 +673,7 @@ class GalaxyProcessor(object):
         Returns:
             The light radius as a floating point value.
         """
-        image = image.astype('float')
+        image = image.astype(get_float_type())
         idx = np.nonzero(image)
         s = image[idx].sum()
         mask = np.ones(image.shape)
@@ -447,36 +697,127 @@ class GalaxyProcessor(object):
         Returns:
             The BGR color histograms.
         """
-        blue_histogram = cv2.calcHist(img_color, [0], None, [256], [0, 256])
-        green_histogram = cv2.calcHist(img_color, [1], None, [256], [0, 256])
-        red_histogram = cv2.calcHist(img_color, [2], None, [256], [0, 256])
+        histograms = self.get_color_histograms(img_color[np.newaxis])[0]
+
+        return histograms[..., np.newaxis].astype(np.float32)
 
-        return np.array([blue_histogram, green_histogram, red_histogram])
+    def get_color_histograms(self, images, bins=256, joint=False, mask=None, normalize=False):
+        """ Get the per-channel or the joint color histograms of a stack of color images.
+
+        Every pixel is mapped to a single packed bin index (channel and bin, or the 3-D bin of its color), offset by
+        the image it belongs to, so that a chunk of images is counted by a single np.bincount.
+
+        Args:
+            images: a uint8 array of BGR images [n_image, height, width, 3].
+            bins: the number of bins per channel, at most 256. The bin of a value v is v * bins // 256.
+            joint: if True, compute the joint 3-D color histograms instead of the histograms of every channel.
+            mask: an optional array of the shape of an image [height, width], or of the stack
+                  [n_image, height, width], selecting the pixels counted where it is nonzero, e.g. an OpenCV 0/255
+                  uint8 mask.
+            normalize: if True, divide the counts by the number of pixels counted in every image.
+
+        Returns:
+            The histograms [n_image, 3, bins] of the blue, green and red channels, or the joint histograms
+            [n_image, bins, bins, bins] indexed by blue, green and red bins.
+        """
+        images = np.asarray(images)
+        if images.dtype != np.uint8 or images.shape[-1] != 3:
+            raise ValueError("Color histograms need a uint8 stack of BGR images.")
+        if not 0 < bins <= 256:
+            raise ValueError("The number of bins must be between 1 and 256.")
+
+        nb_images = images.shape[0]
+        pixels = images.reshape(nb_images, -1, 3)
+        if mask is not None:
+            mask = np.broadcast_to(np.asarray(mask, dtype=bool), images.shape[:-1]).reshape(nb_images, -1)
+
+        nb_cells = bins ** 3 if joint else 3 * bins
+        histograms = np.empty((nb_images, nb_cells), dtype=np.int64)
+
+        # Count a few million pixels at once, to bound the memory of the packed indexes.
+        chunk_size = max(1, min((1 << 22) // max(pixels.shape[1], 1), (1 << 31) // nb_cells))
+        for start in range(0, nb_images, chunk_size):
+            chunk = pixels[start:start + chunk_size]
+            # 32-bit packed indexes halve the memory traffic; they fit since a chunk has less than 2^31 cells.
+            indexes = chunk.astype(np.int32)
+            indexes *= bins
+            indexes >>= 8
+            if joint:
+                indexes = (indexes[..., 0] * bins + indexes[..., 1]) * bins + indexes[..., 2]
+            else:
+                indexes += np.arange(3, dtype=np.int32) * bins
+            indexes += (np.arange(chunk.shape[0], dtype=np.int32) * nb_cells).reshape((-1,) + (1,) * (indexes.ndim - 1))
+
+            if mask is not None:
+                indexes = indexes[mask[start:start + chunk_size]]
+
+            histograms[start:start + chunk.shape[0]] = np.bincount(
+                indexes.ravel(), minlength=chunk.shape[0] * nb_cells).reshape(-1, nb_cells)
+
+        histograms = histograms.reshape((nb_images,) + ((bins, bins, bins) if joint else (3, bins)))
+        if normalize:
+            counted = pixels.shape[1] if mask is None else mask.sum(axis=1)
+            counted = np.maximum(counted, 1).reshape((-1,) + (1,) * (histograms.ndim - 1))
+            histograms = (histograms / counted).astype(get_float_type())
+
+        return histograms
 
     def get_features(self, img_id):
         """ Get the image's features.
 
-        A wrapping method to get the image's features.
-
-        Place your code here.
+        A wrapping method to get the image's features. The image is decoded once per scale of the scale policy, and
+        only its center crop is kept.
 
         Args:
-            image_file: the image's file being processed.
+            img_id: the ID of the galaxy being processed.
 
         Returns:
             features: a feature vector of N dimensions for N features.
         """
+        images = self.image_source.read_scales(img_id, self.registry.scales(self.features, self.scale_policy))
+        return self.compute_features(images)
 
-        coherence_threshold = 160**2*0.01
-        nb_colors = 64
-        img_color = cv2.imread(self._img_path + str(img_id) + self._exts)
-        ratio, values  = self.get_ratio_aspect(img_color)
-        circularity = self.calculate_circularity(img_color)
-        ccv = self.get_ccv(img_color,coherence_threshold,nb_colors)
-        features = np.append([ratio, circularity],ccv)
-        return features
+    def get_feature_matrix(self, img_ids):
+        """ Get the features of several galaxies.
+
+        Args:
+            img_ids: the IDs of the galaxies.
+
+        Returns:
+            A FeatureMatrix of the feature vectors, whose blocks of columns are named after the features.
+        """
+        values = np.empty((len(img_ids), sum(columns.stop - columns.start for columns in self.feature_blocks.values())),
+                          dtype=get_float_type())
+        scales = self.registry.scales(self.features, self.scale_policy)
+
+        # Sources reading ahead, e.g. a GalaxyHttpSource, download the next images while the features are computed.
+        iter_scales = getattr(self.image_source, "iter_scales", None)
+        if iter_scales is not None:
+            images = iter_scales(img_ids, scales)
+        else:
+            images = ((img_id, self.image_source.read_scales(img_id, scales)) for img_id in img_ids)
+
+        for i, (img_id, scale_images) in enumerate(images):
+            values[i] = self.compute_features(scale_images)
+
+        return FeatureMatrix(values, self.feature_blocks)
+
+    def compute_features(self, images, scale_policy=None):
+        """ Compute the image's features from its decoded center crops.
+
+        Args:
+            images: a dictionary mapping every scale of the scale policy to the center crop decoded at that scale.
+            scale_policy: the scale of every block of features. Defaults to the scale policy of the processor.
+
+        Returns:
+            features: a feature vector of N dimensions for N features, whose columns are given by feature_blocks.
+        """
+        if scale_policy is None:
+            scale_policy = self.scale_policy
+
+        return self.registry.extract(self, images, self.features, scale_policy)
 
-    def get_ccv(self, image, threshold, nb_colors):
+    def get_ccv(self, image, threshold, nb_colors, scale=1):
 
         """
         This feature mark each pixel as belonging to a coherent or incoherent regions.
@@ -492,10 +833,11 @@ class GalaxyProcessor(object):
             image     : an OpenCV standard color image format.
             threshold : minimum area size for coherent regions
             nb_colors : size of the Color space to discretize the image
+            scale     : the reduction factor of the decoded image
 
         Returns:
 
-            The CCV vector of length 2 * nb_colors.
+            The CCV vector of length 2 * nb_colors, counted in full scale pixels.
 
               C1          |        C2    |...|         CN    |       I1          |      I2    |... | IN
         nb coherent pix   |              |   |               |nb incoherent pix  |            |    |
@@ -516,9 +858,8 @@ class GalaxyProcessor(object):
             d_img = cv2.merge(quantized_list)
             return d_img
 
-        img = image.copy()
-        im_color = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img=self.crop_image(im_color, 212-80, 212+80)
+        img = self.crop_center(image, 80 // scale)
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
         # blur to eliminate slight variations between the adjacent pixels
         img = cv2.GaussianBlur(img, (3, 3), 0)
@@ -546,49 +887,56 @@ class GalaxyProcessor(object):
                     else:
                         # INCOHERENT PIXELS (belong to area < Threshold pixels )
                         incoherent_pixels[bin_idx]+= area_size
+        if scale != 1:
+            # Count the pixels in full scale units.
+            coherent_pixels *= scale**2
+            incoherent_pixels *= scale**2
         return [coherent_pixels, incoherent_pixels]
 
-    def get_ratio_aspect(self, image):
+    def get_ratio_aspect(self, image, scale=1):
         """
         Calculate the ratio of the bounding revtangle containing the largest contoured element. Most of the time the galaxy.
-        Args : image read by the cv2.imread function.
+        Args : image read by the cv2.imread function, and the reduction factor of its decoding.
         Returns the ratio and the values of width and lenght
         """
-        crop = 150
+        crop = 150 // scale
         epsilon = 0.0000000001
-        img = image.copy()
-        if not isinstance(img, np.ndarray):
+        if not isinstance(image, np.ndarray):
             return -1, (None, None)
-        img = img[212-crop:212+crop, 212-crop:212+crop]
+        img = self.crop_center(image, crop)
         img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         ret,thresh = cv2.threshold(img,0,255,cv2.THRESH_BINARY+cv2.THRESH_OTSU)
-        im2,contours,hierarchy = cv2.findContours(thresh, 2, 2)
+        # OpenCV 3 returns the image, the contours and the hierarchy, OpenCV 4 only the contours and the hierarchy.
+        contours = cv2.findContours(thresh, 2, 2)[-2]
         cnt = max(contours, key = lambda cnt : len(cnt))
         rect = cv2.minAreaRect(cnt)
         ratio = rect[1][0]/(rect[1][1]+epsilon)
         #print("ratio = {}".format(ratio))
         return ratio, (rect[1][0], rect[1][1])
 
-    def calculate_circularity(self, image):
+    def calculate_circularity(self, image, scale=1):
         """calculateCircularity
         Fonction calculant la circularité d'une image de galaxie grâce à la fonction C = 4pi * A/P2.
         Args:
             img: L'image pour laquelle nous voulons calculer la circularité.
+            scale: Le facteur de réduction du décodage de l'image.
         Returns:
             circularity: La valeur de retour. Elle est définie entre 0 et 1.
                         Plus la valeur est proche de 1, plus la galaxie est circulaire.
+                        -1 si l'image est absente, comme pour get_ratio_aspect.
 
         """
-        img = image.copy()
-        img = self.crop_image(img, 212-85, 212+85)
-        log = nd.gaussian_laplace(img, sigma=20)
+        if not isinstance(image, np.ndarray):
+            return -1
+        img = self.crop_center(image, 85 // scale)
+        log = nd.gaussian_laplace(img, sigma=20.0 / scale)
         img = img - log
         gray_img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY);
         ret, thresh = cv2.threshold(gray_img, 0, 255, cv2.THRESH_BINARY+cv2.THRESH_OTSU)
         kernel = np.ones((3,3),np.uint8)
         dilation = cv2.dilate(thresh,kernel,iterations = 1)
         # Get moment to calculate area
-        img2, contours, hierarchy = cv2.findContours(dilation, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        contours = cv2.findContours(dilation, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)[-2]
         contour = max(contours, key = lambda cnt : len(cnt))
         area = cv2.moments(contour)['m00']
         #Get perimeter :
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+import cv2
+import numpy as np
+
+from commons.exceptions.fileNotFoundException import FileNotFoundException
+from core.feature_extraction.galaxy.image_decoder import GalaxyImageDecoder, crop_center
+
+
+class GalaxyHttpSource(object):
+    """ Download galaxy JPEG images from an HTTP object store and decode their center crop.
+
+    The downloads run on an asyncio event loop in a background thread, through a pooled HTTP client which keeps its
+    connections alive. At most max_connections downloads are in flight, and failed downloads are retried. The
+    downloaded bytes are decoded by a pool of threads, so that the network latency overlaps the decoding, and the
+    feature extraction of the caller when iter_scales is used.
+
+    The source implements read, read_scales and read_many like a GalaxyImageDecoder, and can be given to a
+    GalaxyProcessor or to DataSet.load_images.
+    """
+
+    def __init__(self, url, exts=".jpg", half_size=150, max_connections=16, max_retries=3, retry_delay=0.1,
+                 timeout=30.0, max_workers=4):
+        """ Initialize the source.
+
+        Args:
+            url: The URL of the directory of the galaxy images, e.g. "http://store/galaxies/".
+            exts: The extension of the image files.
+            half_size: Half the size, at full scale, of the center crop returned.
+            max_connections: The maximum number of downloads in flight, and of pooled connections.
+            max_retries: The number of times a download failing with a connection error, a timeout or a server error is
+                         retried. Other HTTP errors, e.g. a missing image, are not retried.
+            retry_delay: The delay before the first retry, in seconds, doubled at every retry.
+            timeout: The timeout of a download, in seconds.
+            max_workers: The number of threads decoding the images.
+        """
+        self.url = url if url.endswith("/") else url + "/"
+        self._exts = exts
+        self.half_size = half_size
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._executor = None
+        self._session = None
+        self._semaphore = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def _open(self):
+        """ Create the pooled HTTP client, on the event loop. """
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self._semaphore = asyncio.Semaphore(self.max_connections)
+
+    def _start(self):
+        """ Start the event loop, the HTTP client and the decoding threads on first use.
+
+        Returns:
+            The event loop.
+        """
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, daemon=True)
+                thread.start()
+                asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+
+                self._executor = ThreadPoolExecutor(self.max_workers)
+                self._loop = loop
+                self._thread = thread
+
+        return self._loop
+
+    def _run(self, coroutine):
+        """ Run a coroutine on the event loop and wait for its result. """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._start()).result()
+
+    def close(self):
+        """ Close the HTTP client and stop the event loop and the decoding threads. """
+        with self._lock:
+            if self._loop is None:
+                return
+
+            asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._executor.shutdown()
+            self._loop = None
+
+    def image_url(self, img_id):
+        """ Get the URL of a galaxy image. """
+        return self.url + str(img_id) + self._exts
+
+    async def fetch(self, img_id):
+        """ Download a galaxy image, retrying on connection errors, timeouts and server errors.
+
+        Args:
+            img_id: The ID of the galaxy.
+
+        Returns:
+            The bytes of the image file.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    async with self._session.get(self.image_url(img_id)) as response:
+                        if response.status == 404:
+                            raise FileNotFoundException("Image not found for galaxy ID: " + str(img_id))
+                        response.raise_for_status()
+                        return await response.read()
+
+            except aiohttp.ClientResponseError as error:
+                # Client errors, e.g. 403 Forbidden, would fail the same way again: only server errors are retried.
+                if error.status < 500 or attempt == self.max_retries:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+
+            await asyncio.sleep(self.retry_delay * 2 ** attempt)
+
+    def _decode(self, img_id, data, scales):
+        """ Decode the center crop of a downloaded image once per scale. """
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        images = dict()
+
+        for scale in scales:
+            if scale not in GalaxyImageDecoder.FLAGS:
+                raise ValueError("Scale must be one of 1, 2, 4 or 8: " + str(scale))
+
+            image = cv2.imdecode(buffer, GalaxyImageDecoder.FLAGS[scale])
+            if image is None:
+                raise FileNotFoundException("Unable to decode the image of galaxy ID: " + str(img_id))
+            images[scale] = crop_center(image, self.half_size // scale)
+
+        return images
+
+    async def read_scales_async(self, img_id, scales):
+        """ Download a galaxy image once, then decode its center crop once per scale in the decoding threads.
+
+        Args:
+            img_id: The ID of the galaxy.
+            scales: The reduction factors of the decoding.
+
+        Returns:
+            A dictionary mapping every scale to the center crop decoded at that scale.
+        """
+        data = await self.fetch(img_id)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._decode, img_id, data,
+                                                                set(scales))
+
+    def read(self, img_id, scale=1):
+        """ Download and decode the center crop of a galaxy image.
+
+        Args:
+            img_id: The ID of the galaxy.
+            scale: The reduction factor of the decoding: 1, 2, 4 or 8.
+
+        Returns:
+            The center crop of the decoded image, as a view.
+        """
+        return self.read_scales(img_id, (scale,))[scale]
+
+    def read_scales(self, img_id, scales):
+        """ Download a galaxy image once and decode its center crop once per scale.
+
+        Args:
+            img_id: The ID of the galaxy.
+            scales: The reduction factors of the decoding.
+
+        Returns:
+            A dictionary mapping every scale to the center crop decoded at that scale.
+        """
+        return self._run(self.read_scales_async(img_id, scales))
+
+    def read_many(self, img_ids, scale=1):
+        """ Download and decode the center crops of several galaxy images concurrently.
+
+        Args:
+            img_ids: The IDs of the galaxies.
+            scale: The reduction factor of the decoding: 1, 2, 4 or 8.
+
+        Returns:
+            The center crops stacked into an array [n_image, height, width, 3], in the order of the IDs.
+        """
+        async def read_all():
+            return await asyncio.gather(*[self.read_scales_async(img_id, (scale,)) for img_id in img_ids])
+
+        return np.array([images[scale] for images in self._run(read_all())])
+
+    def iter_scales(self, img_ids, scales, prefetch=None):
+        """ Iterate over the center crops of galaxy images while the next ones are downloaded and decoded.
+
+        Args:
+            img_ids: The IDs of the galaxies.
+            scales: The reduction factors of the decoding.
+            prefetch: The number of images downloaded and decoded ahead. Defaults to twice max_connections.
+
+        Yields:
+            Tuples containing the ID of a galaxy and a dictionary mapping every scale to its center crop, in the
+            order of the IDs.
+        """
+        loop = self._start()
+        prefetch = prefetch if prefetch is not None else 2 * self.max_connections
+        img_ids = iter(img_ids)
+        pending = deque()
+
+        def submit():
+            for img_id in img_ids:
+                pending.append((img_id, asyncio.run_coroutine_threadsafe(self.read_scales_async(img_id, scales),
+                                                                         loop)))
+                return
+
+        for _ in range(prefetch):
+            submit()
+
+        while pending:
+            img_id, future = pending.popleft()
+            submit()
+            yield img_id, future.result()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+from commons.exceptions.fileNotFoundException import FileNotFoundException
+
+
+class GalaxyImageDecoder(object):
+    """ Decode galaxy JPEG images, possibly at a reduced scale, and keep only the center crop used by the features.
+
+    With a scale of 2, 4 or 8, libjpeg decodes directly to a reduced image by skipping the high frequencies of the
+    DCT blocks, which is several times faster than decoding the full image and resizing it.
+    """
+
+    # The OpenCV decode flags of every supported scale.
+    FLAGS = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4,
+             8: cv2.IMREAD_REDUCED_COLOR_8}
+
+    def __init__(self, path, exts=".jpg", half_size=150):
+        """ Initialize the decoder.
+
+        Args:
+            path: The directory of the galaxy images.
+            exts: The extension of the image files.
+            half_size: Half the size, at full scale, of the center crop returned: the union of the crops of all the
+                       features. 212±150 covers the aspect ratio (±150), circularity (±85) and CCV (±80) features.
+        """
+        self._img_path = path
+        self._exts = exts
+        self.half_size = half_size
+
+    def read(self, img_id, scale=1):
+        """ Decode the center crop of a galaxy image.
+
+        Args:
+            img_id: The ID of the galaxy.
+            scale: The reduction factor of the decoding: 1, 2, 4 or 8.
+
+        Returns:
+            The center crop of the decoded image, as a view.
+        """
+        if scale not in self.FLAGS:
+            raise ValueError("Scale must be one of 1, 2, 4 or 8: " + str(scale))
+
+        image = cv2.imread(self._img_path + str(img_id) + self._exts, self.FLAGS[scale])
+        if image is None:
+            raise FileNotFoundException("Image not found for galaxy ID: " + str(img_id))
+
+        return crop_center(image, self.half_size // scale)
+
+    def read_scales(self, img_id, scales):
+        """ Decode the center crop of a galaxy image once per scale.
+
+        Args:
+            img_id: The ID of the galaxy.
+            scales: The reduction factors of the decoding.
+
+        Returns:
+            A dictionary mapping every scale to the center crop decoded at that scale.
+        """
+        return {scale: self.read(img_id, scale) for scale in set(scales)}
+
+    def read_many(self, img_ids, scale=1):
+        """ Decode the center crops of several galaxy images.
+
+        Args:
+            img_ids: The IDs of the galaxies.
+            scale: The reduction factor of the decoding: 1, 2, 4 or 8.
+
+        Returns:
+            The center crops stacked into an array [n_image, height, width, 3].
+        """
+        return np.array([self.read(img_id, scale) for img_id in img_ids])
+
+
+def crop_center(image, half_size):
+    """ Crop the center of an image.
+
+    Args:
+        image: An OpenCV standard image format.
+        half_size: Half the size of the crop, in pixels.
+
+    Returns:
+        The center of the image, as a view.
+    """
+    cy = image.shape[0] // 2
+    cx = image.shape[1] // 2
+
+    return image[max(cy - half_size, 0):cy + half_size, max(cx - half_size, 0):cx + half_size]
+
+
+def benchmark_policies(processor, img_ids, policies, reference=None):
+    """ Measure the decode time, the feature extraction time and the feature drift of scale policies.
+
+    Args:
+        processor: The GalaxyProcessor used to decode the images and extract the features.
+        img_ids: The IDs of the galaxies of the benchmark.
+        policies: A dictionary of named scale policies, e.g. {"fast": {"ratio": 2, "circularity": 2, "ccv": 4}}.
+        reference: The name of the policy used as a reference for the drift. Defaults to full scale everywhere.
+
+    Returns:
+        A dictionary mapping every policy name to a dictionary with the mean decode time ("decode_time") and
+        extraction time ("extract_time") per image, in seconds, and the mean absolute drift of every feature block
+        from the reference ("drift"), relative to the mean magnitude of the block in the reference.
+    """
+    policies = dict(policies)
+    if reference is None:
+        reference = "full_scale"
+        policies[reference] = dict((name, 1) for name in processor.features)
+
+    results = dict()
+    features = dict()
+
+    for name, policy in policies.items():
+        decode_time = 0.0
+        extract_time = 0.0
+        vectors = list()
+
+        for img_id in img_ids:
+            start = time.time()
+            images = processor.image_source.read_scales(img_id, processor.registry.scales(processor.features, policy))
+            decode_time += time.time() - start
+
+            start = time.time()
+            vectors.append(processor.compute_features(images, policy))
+            extract_time += time.time() - start
+
+        features[name] = np.array(vectors, dtype=np.float64)
+        results[name] = dict(decode_time=decode_time / len(img_ids), extract_time=extract_time / len(img_ids))
+
+    for name in policies:
+        results[name]["drift"] = dict()
+        for block, columns in processor.feature_blocks.items():
+            expected = features[reference][:, columns]
+            drift = np.abs(features[name][:, columns] - expected).mean()
+            results[name]["drift"][block] = drift / max(np.abs(expected).mean(), np.finfo(np.float64).eps)
+
+    return results
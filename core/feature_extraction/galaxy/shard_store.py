@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from commons.exceptions.fileNotFoundException import FileNotFoundException
+from core.feature_extraction.galaxy.image_decoder import GalaxyImageDecoder
+
+
+class GalaxyShardWriter(object):
+    """ Pack the center crops of galaxy images into shard files, once.
+
+    Every JPEG is decoded and only its center crop is kept, as raw uint8 pixels. The crops are written one after the
+    other into large shard files, so that reading them back is a sequential read of pre-decoded pixels instead of a
+    random open and decode of a JPEG file.
+    """
+
+    def __init__(self, directory, half_size=150, images_per_shard=4096, max_workers=4):
+        """ Initialize the writer.
+
+        Args:
+            directory: The directory of the shard store, created if needed.
+            half_size: Half the size of the crops, in pixels. 150 keeps the union of the crops of all the features.
+            images_per_shard: The number of crops per shard file.
+            max_workers: The number of threads decoding the JPEG files.
+        """
+        self.directory = directory
+        self.half_size = half_size
+        self.images_per_shard = images_per_shard
+        self.max_workers = max_workers
+
+    def pack(self, path, img_ids, exts=".jpg"):
+        """ Decode galaxy images and pack their center crops.
+
+        Args:
+            path: The directory of the galaxy images.
+            img_ids: The IDs of the galaxies.
+            exts: The extension of the image files.
+
+        Returns:
+            A GalaxyShardStore reading the packed crops.
+        """
+        decoder = GalaxyImageDecoder(path, exts, self.half_size)
+        shape = (2 * self.half_size, 2 * self.half_size, 3)
+        img_ids = [str(img_id) for img_id in img_ids]
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        def read(img_id):
+            crop = decoder.read(img_id)
+            if crop.shape != shape:
+                raise ValueError("Image of galaxy ID " + img_id + " is smaller than the crop: " + str(crop.shape))
+            return crop
+
+        nb_shards = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for start in range(0, len(img_ids), self.images_per_shard):
+                shard_ids = img_ids[start:start + self.images_per_shard]
+
+                # The JPEG files are decoded in parallel, then the crops are written in order.
+                with open(GalaxyShardStore.shard_file(self.directory, nb_shards), mode="wb") as shard:
+                    for crop in executor.map(read, shard_ids):
+                        shard.write(np.ascontiguousarray(crop).tobytes())
+                nb_shards += 1
+
+        np.save(os.path.join(self.directory, "ids.npy"), np.array(img_ids))
+        with open(os.path.join(self.directory, "meta.json"), mode="w") as meta_file:
+            json.dump(dict(shape=shape, images_per_shard=self.images_per_shard, nb_images=len(img_ids),
+                           nb_shards=nb_shards), meta_file)
+
+        return GalaxyShardStore(self.directory)
+
+
+class GalaxyShardStore(object):
+    """ Read the center crops of galaxy images packed by a GalaxyShardWriter.
+
+    The shard files are memory-mapped: a crop read at full scale is a view of the file, without any decoding. The
+    store is an image source of GalaxyProcessor and DataSet.load_images, like a GalaxyImageDecoder.
+    """
+
+    def __init__(self, directory):
+        """ Open a shard store.
+
+        Args:
+            directory: The directory of the shard store.
+        """
+        try:
+            with open(os.path.join(directory, "meta.json"), mode="r") as meta_file:
+                meta = json.load(meta_file)
+        except FileNotFoundError:
+            raise FileNotFoundException("Shard store not found. Please enter in parameter a valid directory.")
+
+        self.directory = directory
+        self.shape = tuple(meta["shape"])
+        self.images_per_shard = meta["images_per_shard"]
+        self.nb_shards = meta["nb_shards"]
+        self._positions = dict((img_id, position)
+                               for position, img_id in enumerate(np.load(os.path.join(directory, "ids.npy"))))
+        self._shards = [None] * self.nb_shards
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, img_id):
+        return str(img_id) in self._positions
+
+    @staticmethod
+    def shard_file(directory, shard):
+        """ Get the path to a shard file.
+
+        Args:
+            directory: The directory of the shard store.
+            shard: The number of the shard.
+
+        Returns:
+            The path to the shard file.
+        """
+        return os.path.join(directory, "shard_%05d.bin" % shard)
+
+    def _shard(self, shard):
+        """ Memory-map a shard file on first use. """
+        if self._shards[shard] is None:
+            self._shards[shard] = np.memmap(self.shard_file(self.directory, shard), dtype=np.uint8, mode="r")
+            self._shards[shard] = self._shards[shard].reshape((-1,) + self.shape)
+        return self._shards[shard]
+
+    def _position(self, img_id):
+        """ Get the position of a crop in the store. """
+        try:
+            return self._positions[str(img_id)]
+        except KeyError:
+            raise FileNotFoundException("Image not found in shard store for galaxy ID: " + str(img_id))
+
+    def read(self, img_id, scale=1):
+        """ Read the center crop of a galaxy image.
+
+        Args:
+            img_id: The ID of the galaxy.
+            scale: The reduction factor of the crop: 1, 2, 4 or 8. Reduced crops are resized with area
+                   interpolation, which differs slightly from a reduced JPEG decoding.
+
+        Returns:
+            The center crop, as a read-only view of the shard file at full scale.
+        """
+        position = self._position(img_id)
+        crop = self._shard(position // self.images_per_shard)[position % self.images_per_shard]
+
+        if scale == 1:
+            return crop
+
+        return cv2.resize(crop, (self.shape[1] // scale, self.shape[0] // scale), interpolation=cv2.INTER_AREA)
+
+    def read_scales(self, img_id, scales):
+        """ Read the center crop of a galaxy image once per scale.
+
+        Args:
+            img_id: The ID of the galaxy.
+            scales: The reduction factors of the crop.
+
+        Returns:
+            A dictionary mapping every scale to the center crop at that scale.
+        """
+        return {scale: self.read(img_id, scale) for scale in set(scales)}
+
+    def read_many(self, img_ids, scale=1):
+        """ Read the center crops of several galaxy images, in the order of the shard files.
+
+        Args:
+            img_ids: The IDs of the galaxies.
+            scale: The reduction factor of the crops: 1, 2, 4 or 8.
+
+        Returns:
+            The center crops stacked into an array [n_image, height, width, 3], in the order of img_ids.
+        """
+        positions = np.array([self._position(img_id) for img_id in img_ids], dtype=np.intp)
+        shape = self.shape if scale == 1 else (self.shape[0] // scale, self.shape[1] // scale, self.shape[2])
+        crops = np.empty((positions.shape[0],) + shape, dtype=np.uint8)
+
+        # Visit the crops in the order of the files, so that the reads are sequential.
+        for i in np.argsort(positions, kind="mergesort"):
+            position = positions[i]
+            crop = self._shard(position // self.images_per_shard)[position % self.images_per_shard]
+            crops[i] = crop if scale == 1 else cv2.resize(crop, (shape[1], shape[0]), interpolation=cv2.INTER_AREA)
+
+        return crops
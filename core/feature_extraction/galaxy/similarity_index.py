@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Course :
+    GTI770 — Systèmes intelligents et apprentissage machine
+
+Project :
+    Lab # X - Lab's name
+
+Students :
+    Names — Permanent Code
+
+Group :
+    GTI770-H18-0X
+"""
+
+import json
+import os
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+from commons.exceptions.fileNotFoundException import FileNotFoundException
+from commons.helpers.dtype_policy import get_float_type
+from core.feature_extraction.galaxy.feature_registry import FeatureMatrix, default_registry
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+
+
+class SimilarityIndex(object):
+    """ Find similar galaxies from their feature vectors.
+
+    The feature vectors of GalaxyProcessor.get_features are standardized and every block of features, as given by
+    the columns of the FeatureMatrix, is weighted so that its contribution to the distance is proportional to its weight, whatever its
+    number of columns. The weighted vectors are clustered into inverted lists by mini-batch k-means and stored
+    sorted by list in memory-mapped files: a query only scans the nearest lists, i.e. about sqrt(n) vectors for a
+    catalog of n galaxies, instead of the whole catalog.
+    """
+
+    def __init__(self, directory):
+        """ Open an index built by SimilarityIndex.build.
+
+        Args:
+            directory: The directory of the index.
+        """
+        try:
+            with open(os.path.join(directory, "meta.json"), mode="r") as meta_file:
+                self.meta = json.load(meta_file)
+        except FileNotFoundError:
+            raise FileNotFoundException("Similarity index not found. Please enter in parameter a valid directory.")
+
+        with np.load(os.path.join(directory, "index.npz")) as index:
+            self._offsets = index["offsets"]
+            self._centroids = index["centroids"]
+            self._mean = index["mean"]
+            self._scale = index["scale"]
+
+        self._vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        self._norms = np.load(os.path.join(directory, "norms.npy"), mmap_mode="r")
+        self._ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode="r")
+        self._id_order = np.load(os.path.join(directory, "id_order.npy"), mmap_mode="r")
+        self._sorted_ids = np.load(os.path.join(directory, "sorted_ids.npy"), mmap_mode="r")
+        self.nprobe = self.meta["nprobe"]
+
+    def __len__(self):
+        return self._ids.shape[0]
+
+    @staticmethod
+    def _column_weights(columns, nb_features, weights):
+        """ Get the weight of every column so that every block contributes proportionally to its weight. """
+        width = sum(block.stop - block.start for block in columns.values())
+        if width != nb_features:
+            raise ValueError("The feature vectors have " + str(nb_features) + " columns, but their blocks of features "
+                             "have " + str(width) + " columns.")
+        unknown = sorted(set(weights) - set(columns))
+        if unknown:
+            raise ValueError("Unknown blocks of features in the weights: " + ", ".join(unknown) + ".")
+
+        column_weights = np.zeros(nb_features)
+        for name, block in columns.items():
+            column_weights[block] = np.sqrt(weights.get(name, 1.0) / float(max(block.stop - block.start, 1)))
+
+        return column_weights
+
+    @staticmethod
+    def _batches(nb_vectors, batch_size):
+        """ Get the bounds of the batches of vectors. """
+        return [(start, min(start + batch_size, nb_vectors)) for start in range(0, nb_vectors, batch_size)]
+
+    @classmethod
+    def build(cls, directory, features, ids, weights=None, nb_lists=None, nprobe=8, batch_size=10000,
+              random_state=None, columns=None):
+        """ Build an index, one batch of feature vectors at a time.
+
+        Args:
+            directory: The directory of the index, created if needed.
+            features: A FeatureMatrix, or the feature vectors [n_galaxy, n_feature], e.g. a memory-mapped array.
+            ids: The galaxy IDs [n_galaxy].
+            weights: A dictionary of the weight of every block of features, e.g. {"ccv": 2.0}. Defaults to 1.
+            nb_lists: The number of inverted lists. Defaults to sqrt(n_galaxy).
+            nprobe: The default number of lists scanned by a query.
+            batch_size: The number of feature vectors processed at once.
+            random_state: A seed for the clustering.
+            columns: An ordered dictionary mapping the name of every block of features to its slice of columns, e.g.
+                     GalaxyProcessor.feature_blocks. Defaults to the columns of the FeatureMatrix, or to the ones of
+                     GalaxyProcessor.DEFAULT_FEATURES.
+
+        Returns:
+            The opened index.
+
+        Raises:
+            ValueError: If the blocks of features do not match the width of the feature vectors.
+        """
+        if weights is None:
+            weights = dict()
+        if isinstance(features, FeatureMatrix):
+            if columns is None:
+                columns = features.columns
+            features = features.values
+        if columns is None:
+            columns = default_registry().columns(GalaxyProcessor.DEFAULT_FEATURES)
+
+        nb_vectors, nb_features = features.shape
+        if nb_lists is None:
+            nb_lists = max(1, int(np.sqrt(nb_vectors)))
+        nb_lists = min(nb_lists, nb_vectors)
+        batch_size = max(batch_size, nb_lists)
+        batches = cls._batches(nb_vectors, batch_size)
+        float_type = get_float_type()
+
+        # Accumulate the standardization statistics.
+        total = np.zeros(nb_features)
+        squares = np.zeros(nb_features)
+        for start, end in batches:
+            batch = np.asarray(features[start:end], dtype=np.float64)
+            total += batch.sum(axis=0)
+            squares += (batch ** 2).sum(axis=0)
+        mean = total / nb_vectors
+        std = np.sqrt(np.maximum(squares / nb_vectors - mean ** 2, 0.0))
+        std[std == 0] = 1.0
+        scale = cls._column_weights(columns, nb_features, weights) / std
+
+        def transform(batch):
+            return ((np.asarray(batch, dtype=np.float64) - mean) * scale).astype(float_type)
+
+        # Cluster the weighted vectors into inverted lists, then assign every vector to its list.
+        kmeans = MiniBatchKMeans(n_clusters=nb_lists, batch_size=batch_size, n_init=3, random_state=random_state)
+        for start, end in batches:
+            kmeans.partial_fit(transform(features[start:end]))
+        lists = np.concatenate([kmeans.predict(transform(features[start:end])) for start, end in batches])
+        order = np.argsort(lists, kind="mergesort")
+        ids = np.asarray(ids)[order]
+
+        # Write the vectors sorted by list, so that every list is a contiguous slice of the memory-mapped files.
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        vectors = np.lib.format.open_memmap(os.path.join(directory, "vectors.npy"), mode="w+", dtype=float_type,
+                                            shape=(nb_vectors, nb_features))
+        norms = np.lib.format.open_memmap(os.path.join(directory, "norms.npy"), mode="w+", dtype=float_type,
+                                          shape=(nb_vectors,))
+        for start, end in batches:
+            vectors[start:end] = transform(features[order[start:end]])
+            norms[start:end] = np.einsum("ij,ij->i", vectors[start:end], vectors[start:end])
+        vectors.flush()
+        norms.flush()
+        del vectors, norms
+
+        np.save(os.path.join(directory, "ids.npy"), ids)
+        id_order = np.argsort(ids, kind="mergesort")
+        np.save(os.path.join(directory, "id_order.npy"), id_order)
+        np.save(os.path.join(directory, "sorted_ids.npy"), ids[id_order])
+        np.savez(os.path.join(directory, "index.npz"),
+                 offsets=np.searchsorted(lists[order], np.arange(nb_lists + 1)),
+                 centroids=kmeans.cluster_centers_.astype(float_type), mean=mean, scale=scale)
+
+        with open(os.path.join(directory, "meta.json"), mode="w") as meta_file:
+            json.dump(dict(nb_vectors=nb_vectors, nb_features=nb_features, nb_lists=nb_lists, nprobe=nprobe,
+                           weights=weights,
+                           columns=dict((name, [block.start, block.stop]) for name, block in columns.items())),
+                      meta_file)
+
+        return cls(directory)
+
+    def transform(self, features):
+        """ Standardize and weight feature vectors like the indexed ones.
+
+        Args:
+            features: The feature vectors [n_query, n_feature].
+
+        Returns:
+            The weighted vectors.
+        """
+        features = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        return ((features - self._mean) * self._scale).astype(self._vectors.dtype)
+
+    def _search(self, vector, k, nprobe):
+        """ Find the k nearest indexed vectors of a weighted vector in its nprobe nearest lists. """
+        centroid_distances = ((self._centroids - vector) ** 2).sum(axis=1)
+        nprobe = min(nprobe, centroid_distances.shape[0])
+        probed = np.argpartition(centroid_distances, nprobe - 1)[:nprobe]
+
+        positions = np.concatenate([np.arange(self._offsets[i], self._offsets[i + 1]) for i in probed])
+        if positions.shape[0] == 0:
+            return positions, np.zeros(0)
+
+        # Squared Euclidean distances with one matrix-vector product per list.
+        distances = np.concatenate([self._norms[self._offsets[i]:self._offsets[i + 1]] -
+                                    2 * self._vectors[self._offsets[i]:self._offsets[i + 1]].dot(vector)
+                                    for i in probed]) + vector.dot(vector)
+
+        k = min(k, positions.shape[0])
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind="mergesort")]
+
+        return positions[nearest], np.sqrt(np.maximum(distances[nearest], 0.0))
+
+    def query(self, features, k=10, nprobe=None):
+        """ Find the galaxies most similar to some feature vectors.
+
+        Args:
+            features: The feature vectors [n_query, n_feature], as returned by GalaxyProcessor.get_features.
+            k: The number of similar galaxies per query.
+            nprobe: The number of inverted lists scanned. More lists are slower, but closer to an exhaustive search.
+
+        Returns:
+            A list containing, for every query, a tuple of the IDs of the similar galaxies and of their distances.
+        """
+        if nprobe is None:
+            nprobe = self.nprobe
+
+        results = list()
+        for vector in self.transform(features):
+            positions, distances = self._search(vector, k, nprobe)
+            results.append((np.asarray(self._ids[positions]), distances))
+
+        return results
+
+    def query_ids(self, img_ids, k=10, nprobe=None):
+        """ Find the galaxies most similar to indexed galaxies.
+
+        Args:
+            img_ids: The IDs of indexed galaxies.
+            k: The number of similar galaxies per query, the galaxy itself excluded.
+            nprobe: The number of inverted lists scanned.
+
+        Returns:
+            A list containing, for every galaxy, a tuple of the IDs of the similar galaxies and of their distances.
+        """
+        if nprobe is None:
+            nprobe = self.nprobe
+
+        img_ids = np.asarray(img_ids)
+        ranks = np.minimum(np.searchsorted(self._sorted_ids, img_ids), len(self) - 1)
+        if np.any(self._sorted_ids[ranks] != img_ids):
+            raise KeyError("Galaxy IDs not found in the similarity index.")
+
+        results = list()
+        for position in self._id_order[ranks]:
+            positions, distances = self._search(np.asarray(self._vectors[position]), k + 1, nprobe)
+            others = positions != position
+            results.append((np.asarray(self._ids[positions[others][:k]]), distances[others][:k]))
+
+        return results
@@ -0,0 +1,90 @@
+from unittest import TestCase, skipIf
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from commons.helpers.dataset.dataset import DataSet
+
+try:
+    import tensorflow
+except ImportError:
+    tensorflow = None
+
+if tensorflow is not None:
+    from classifiers.galaxy_classifiers.mlp_inference import MLPInferenceServer
+    from classifiers.galaxy_classifiers.mlp_tensorboard import MLPClassifierTensorBoard
+
+
+@skipIf(tensorflow is None, "TensorFlow is not installed.")
+class TestMLPClassifierTensorBoard(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+        # Two well separated classes of 4 features.
+        rng = np.random.RandomState(0)
+        codes = rng.randint(2, size=200)
+        features = (rng.normal(0, 0.5, (200, 4)) + codes[:, np.newaxis] * 2.0).astype(np.float32)
+        labels = np.eye(2, dtype=np.float32)[codes]
+
+        class DataSets(object):
+            pass
+
+        self.dataset = DataSets()
+        self.dataset.train = DataSet().withFeatures(features[:150]).withLabels(labels[:150])
+        self.dataset.valid = DataSet().withFeatures(features[150:]).withLabels(labels[150:])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def classifier(self, name, **kwargs):
+        return MLPClassifierTensorBoard(number_of_classes=2, batch_size=32, number_of_steps=60, learning_rate=0.01,
+                                        train_path=os.path.join(self.directory, name),
+                                        export_path=os.path.join(self.directory, name, "export"),
+                                        evaluation_frequency=20, trace_frequency=30, hidden_units=(8,), **kwargs)
+
+    def test_feed_dict_training_exports_a_served_model(self):
+        classifier = self.classifier("feed_dict")
+        classifier.train(self.dataset)
+
+        self.assertTrue(os.listdir(os.path.join(self.directory, "feed_dict", "train")))
+        self.assertTrue(os.listdir(os.path.join(self.directory, "feed_dict", "test")))
+
+        X = self.dataset.valid.get_features
+        with MLPInferenceServer(classifier.get_export_path() + "/saved_model", max_latency=0.05) as server:
+            self.assertEqual(server.number_of_features, 4)
+            expected = server.predict(X)
+
+            futures = [server.submit(x) for x in X[:10]] + [server.submit(X[10:])]
+            scores = np.concatenate([future.result(timeout=10)["scores"] for future in futures])
+
+            with self.assertRaises(ValueError):
+                server.submit(np.zeros(3))
+
+        np.testing.assert_allclose(scores, expected["scores"], rtol=1e-5, atol=1e-6)
+        accuracy = np.mean(scores.argmax(axis=1) == self.dataset.valid.get_labels.argmax(axis=1))
+        self.assertGreater(accuracy, 0.9)
+
+        # A closed server rejects new requests instead of queuing them forever.
+        with self.assertRaises(RuntimeError):
+            server.submit(X[0])
+        server.close()
+
+    def test_dataset_input_mode_from_binary_file(self):
+        binary_file = os.path.join(self.directory, "train.bin")
+        MLPClassifierTensorBoard.write_binary_features(self.dataset.train.get_features, self.dataset.train.get_labels,
+                                                       binary_file)
+
+        classifier = self.classifier("binary", input_mode="dataset", number_of_features=4)
+        classifier.train(self.dataset, binary_file=binary_file)
+
+        self.assertTrue(os.path.isdir(os.path.join(classifier.get_export_path(), "saved_model")))
+
+    def test_dataset_input_mode_from_arrays(self):
+        classifier = self.classifier("arrays", input_mode="dataset", summary_frequency=0)
+        classifier.train(self.dataset)
+
+        self.assertTrue(os.path.isdir(os.path.join(classifier.get_export_path(), "saved_model")))
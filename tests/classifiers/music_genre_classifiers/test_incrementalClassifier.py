@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+import csv
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import GaussianNB, MultinomialNB
+
+from classifiers.music_genre_classifiers.incremental_classifier import IncrementalClassifier
+from commons.helpers.dataset.strategies.music_genre_dataset.song_features_strategy import MusicGenreStrategy
+
+
+class TestIncrementalClassifier(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "songs.csv")
+
+        # Three well separated genres with 10 non-negative features each.
+        rng = np.random.RandomState(0)
+        self.genres = np.array(["blues", "jazz", "rock"])
+        self.labels = self.genres[rng.randint(0, 3, 900)]
+        codes = np.searchsorted(self.genres, self.labels)
+        self.features = (rng.rand(900, 10) + 3.0 * np.eye(3, 10)[codes]).astype(np.float32)
+
+        with open(self.path, mode="w", newline="") as songs_csv:
+            writer = csv.writer(songs_csv)
+            for i, (feature_vector, label) in enumerate(zip(self.features, self.labels)):
+                writer.writerow([i, label] + list(feature_vector) + [label])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_read_chunks(self):
+        chunks = list(MusicGenreStrategy().read_chunks(self.path, chunk_size=250))
+
+        self.assertEqual([labels.shape[0] for _, labels in chunks], [250, 250, 250, 150])
+        np.testing.assert_array_equal(np.concatenate([features for features, _ in chunks]), self.features)
+
+    def test_train_sgd(self):
+        classifier = IncrementalClassifier(SGDClassifier(random_state=0), chunk_size=100, nb_epochs=3)
+        classifier.train(self.path)
+
+        np.testing.assert_array_equal(classifier.classes, self.genres)
+        np.testing.assert_allclose(classifier.scaler.mean_, self.features.mean(axis=0), rtol=1e-5)
+        self.assertGreater(classifier.score(self.path), 0.95)
+
+    def test_train_gaussian_naive_bayes_matches_batch_fit(self):
+        classifier = IncrementalClassifier(GaussianNB(), standardize=False, chunk_size=100).train(self.path)
+        reference = GaussianNB().fit(self.features, np.searchsorted(self.genres, self.labels))
+
+        np.testing.assert_allclose(classifier.model.theta_, reference.theta_, rtol=1e-4)
+
+    def test_train_multinomial_naive_bayes(self):
+        classifier = IncrementalClassifier(MultinomialNB(), standardize=False, chunk_size=100).train(self.path)
+
+        self.assertGreater(classifier.score(self.path), 0.95)
+
+    def test_train_twice_resets_the_scaler(self):
+        other_path = os.path.join(self.directory, "other_songs.csv")
+        with open(other_path, mode="w", newline="") as songs_csv:
+            writer = csv.writer(songs_csv)
+            for i, (feature_vector, label) in enumerate(zip(self.features * 10.0, self.labels)):
+                writer.writerow([i, label] + list(feature_vector) + [label])
+
+        classifier = IncrementalClassifier(SGDClassifier(random_state=0), chunk_size=100)
+        classifier.train(other_path)
+        classifier.train(self.path)
+
+        np.testing.assert_allclose(classifier.scaler.mean_, self.features.mean(axis=0), rtol=1e-5)
+        self.assertEqual(classifier.scaler.n_samples_seen_, 900)
+
+    def test_score_empty_file(self):
+        classifier = IncrementalClassifier(SGDClassifier(random_state=0), chunk_size=100).train(self.path)
+        empty_path = os.path.join(self.directory, "empty.csv")
+        open(empty_path, mode="w").close()
+
+        with self.assertRaises(ValueError):
+            classifier.score(empty_path)
@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+import numpy as np
+from scipy import sparse
+
+from classifiers.cross_validator import CrossValidator
+from classifiers.galaxy_classifiers.gaussian_naive_bayes_classifier import GaussianNaiveBayesClassifier
+from classifiers.galaxy_classifiers.knn_classifier import KNNClassifier
+from commons.helpers.dataset.dataset import DataSet
+
+
+class TestCrossValidator(TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        labels = rng.randint(0, 3, 600)
+        features = rng.randn(600, 4) + 4.0 * np.eye(3, 4)[labels]
+        self.dataset = DataSet().withFeatures(features).withLabels(np.eye(3)[labels])
+
+        self.classifiers = {"knn": KNNClassifier(nb_neighbors=5, weights="uniform"),
+                            "naive_bayes": GaussianNaiveBayesClassifier(priors=None)}
+
+    def test_run(self):
+        report = CrossValidator(self.classifiers, nb_folds=5, preprocessing="standardize", n_jobs=2,
+                                random_state=0).run(self.dataset)
+
+        self.assertEqual(len(report["folds"]), 5)
+        for name in self.classifiers:
+            self.assertGreater(report["mean_accuracy"][name], 0.9)
+            self.assertEqual(report["confusion_matrix"][name].sum(), 600)
+            for fold in report["folds"]:
+                self.assertGreaterEqual(fold["classifiers"][name]["fit_time"], 0.0)
+
+    def test_parallel_run_matches_serial_run(self):
+        serial = CrossValidator(self.classifiers, nb_folds=4, preprocessing="discretize", n_jobs=1,
+                                random_state=1).run(self.dataset)
+        parallel = CrossValidator(self.classifiers, nb_folds=4, preprocessing="discretize", n_jobs=2,
+                                  random_state=1).run(self.dataset)
+
+        for name in self.classifiers:
+            np.testing.assert_array_equal(serial["confusion_matrix"][name], parallel["confusion_matrix"][name])
+
+    def test_sparse_features_are_rejected(self):
+        dataset = DataSet().withFeatures(sparse.csr_matrix(self.dataset.get_features)).withLabels(
+            self.dataset.get_labels)
+
+        with self.assertRaises(ValueError):
+            CrossValidator(self.classifiers, nb_folds=4, n_jobs=1).run(dataset)
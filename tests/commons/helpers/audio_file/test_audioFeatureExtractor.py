@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from scipy.io import wavfile
+
+from commons.helpers.audio_file.audio_feature_extractor import AudioFeatureExtractor
+from commons.helpers.dataset.context import Context
+from commons.helpers.dataset.strategies.music_genre_dataset.song_features_strategy import MusicGenreStrategy
+
+
+class TestAudioFeatureExtractor(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.sample_rate = 22050
+
+        # Two seconds of A4 (440 Hz), as 16-bit stereo.
+        t = np.arange(2 * self.sample_rate) / float(self.sample_rate)
+        tone = (0.5 * np.sin(2 * np.pi * 440.0 * t) * 32767).astype(np.int16)
+        self.wav_file = os.path.join(self.directory, "tone.wav")
+        wavfile.write(self.wav_file, self.sample_rate, np.column_stack((tone, tone)))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_extract_sine(self):
+        extractor = AudioFeatureExtractor()
+        features = dict(zip(extractor.feature_names, extractor.extract(self.wav_file)))
+
+        self.assertAlmostEqual(features["mean_spectral_centroid"], 440.0, delta=25.0)
+        self.assertAlmostEqual(features["mean_zero_crossing_rate"], 2 * 440.0 / self.sample_rate, delta=0.005)
+
+        chroma = [features["mean_chroma_%d" % i] for i in range(12)]
+        self.assertEqual(int(np.argmax(chroma)), 9)
+
+    def test_to_mono_scales_integer_samples(self):
+        extractor = AudioFeatureExtractor()
+
+        np.testing.assert_allclose(extractor._to_mono(np.array([0, 128, 255], dtype=np.uint8)),
+                                   [-1.0, 0.0, 127 / 128.0])
+        np.testing.assert_allclose(extractor._to_mono(np.array([-32768, 0, 32767], dtype=np.int16)),
+                                   [-1.0, 0.0, 32767 / 32768.0])
+
+    def test_extract_unsigned_8_bit(self):
+        t = np.arange(2 * self.sample_rate) / float(self.sample_rate)
+        tone = np.round(128 + 0.5 * np.sin(2 * np.pi * 440.0 * t) * 127).astype(np.uint8)
+        wav_file = os.path.join(self.directory, "tone_u8.wav")
+        wavfile.write(wav_file, self.sample_rate, tone)
+
+        extractor = AudioFeatureExtractor()
+        signal = extractor._to_mono(wavfile.read(wav_file)[1])
+        self.assertAlmostEqual(float(np.abs(signal).max()), 0.5, delta=0.01)
+
+        features = dict(zip(extractor.feature_names, extractor.extract(wav_file)))
+        chroma = [features["mean_chroma_%d" % i] for i in range(12)]
+        self.assertEqual(int(np.argmax(chroma)), 9)
+
+    def test_streaming_does_not_change_features(self):
+        whole = AudioFeatureExtractor(block_frames=100000).extract(self.wav_file)
+        streamed = AudioFeatureExtractor(block_frames=7).extract(self.wav_file)
+
+        np.testing.assert_allclose(whole, streamed, rtol=1e-4, atol=1e-4)
+
+    def test_write_csv_for_music_genre_strategy(self):
+        wav_files = list()
+        for i in range(4):
+            wav_file = os.path.join(self.directory, "song_%d.wav" % i)
+            shutil.copy(self.wav_file, wav_file)
+            wav_files.append(wav_file)
+
+        csv_file = os.path.join(self.directory, "songs.csv")
+        extractor = AudioFeatureExtractor()
+        extractor.write_csv(wav_files, ["rock", "jazz", "rock", "jazz"], csv_file, max_workers=2)
+
+        context = Context(MusicGenreStrategy())
+        dataset = context.load_dataset(csv_file=csv_file, one_hot=False, validation_size=np.float32(0.5))
+
+        self.assertEqual(dataset.train._num_examples, 2)
+        self.assertEqual(dataset.train.get_features.shape[1], len(extractor.feature_names))
@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+import csv
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from scipy import sparse
+
+from classifiers.galaxy_classifiers.linear_svm_classifier import LinearSVMClassifier
+from classifiers.galaxy_classifiers.multinomial_naive_bayes_classifier import MultinomialNaiveBayesClassifier
+from commons.helpers.dataset.context import Context
+from commons.helpers.dataset.splitter import StratifiedSplitter
+from commons.helpers.dataset.strategies.spam_dataset.feature_strategy import SpamDataSetFeatureStrategy
+
+
+class TestSpamDataSetSparseFeatureStrategy(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "spam.csv")
+
+        # Mostly zero frequencies, the last column is the class.
+        rng = np.random.RandomState(0)
+        self.labels = rng.randint(0, 2, 500)
+        self.features = rng.rand(500, 57) * (rng.rand(500, 57) < 0.1)
+        self.features[:, 0] += self.labels
+
+        with open(self.path, mode="w", newline="") as spam_csv:
+            writer = csv.writer(spam_csv, quoting=csv.QUOTE_NONNUMERIC)
+            for feature_vector, label in zip(self.features, self.labels):
+                writer.writerow(list(feature_vector) + [float(label)])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_load_sparse_dataset(self):
+        context = Context(SpamDataSetFeatureStrategy(sparse=True))
+        dataset = context.load_dataset(csv_file=self.path, one_hot=False, validation_size=np.float32(0.2))
+
+        self.assertTrue(sparse.isspmatrix_csr(dataset.train.get_features))
+        self.assertEqual(dataset.train._num_examples, 400)
+        self.assertEqual(dataset.train.get_features.shape[1], 57)
+
+        features, labels = dataset.train.next_feature_batch(32)
+        self.assertTrue(sparse.issparse(features))
+        self.assertEqual(features.shape[0], 32)
+
+        # The sparse matrix holds exactly the same rows as the CSV file.
+        all_features = sparse.vstack([dataset.train.get_features, dataset.valid.get_features]).toarray()
+        order = np.lexsort(all_features.T[::-1])
+        np.testing.assert_allclose(all_features[order], self.features[np.lexsort(self.features.T[::-1])])
+
+    def test_train_on_sparse_features(self):
+        context = Context(SpamDataSetFeatureStrategy(sparse=True, splitter=StratifiedSplitter(0)))
+        dataset = context.load_dataset(csv_file=self.path, one_hot=False, validation_size=np.float32(0.2))
+
+        for classifier in (MultinomialNaiveBayesClassifier(), LinearSVMClassifier(C=1.0, class_weight=None)):
+            X_train = classifier.standardize(dataset.train.get_features)
+            self.assertTrue(sparse.isspmatrix_csr(X_train))
+            self.assertEqual(X_train.nnz, dataset.train.get_features.nnz)
+
+            classifier.model.fit(X_train, dataset.train.get_labels)
+            score = classifier.model.score(classifier.standardize(dataset.valid.get_features), dataset.valid.get_labels)
+            self.assertGreater(score, 0.8)
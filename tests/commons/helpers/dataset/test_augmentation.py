@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+import numpy as np
+
+from commons.helpers.dataset.augmentation import AffineAugmenter
+from commons.helpers.dataset.dataset import DataSet
+
+
+class ArraySource(object):
+    """ An image source serving images from an array. """
+
+    def __init__(self, images):
+        self.images = images
+
+    def read_many(self, img_ids):
+        return self.images[[int(img_id) for img_id in img_ids]]
+
+
+class TestAffineAugmenter(TestCase):
+
+    def setUp(self):
+        self.images = np.random.RandomState(0).randint(0, 256, (16, 40, 40, 3)).astype(np.uint8)
+
+    def test_identity(self):
+        augmenter = AffineAugmenter(max_angle=0.0, flip=False, max_translation=0.0)
+
+        np.testing.assert_array_equal(augmenter.augment(self.images), self.images)
+
+    def test_flips(self):
+        augmenter = AffineAugmenter(max_angle=0.0, flip=True, max_translation=0.0, random_state=0)
+        augmented = augmenter.augment(self.images)
+
+        flipped = [np.array_equal(a, image[:, ::-1]) for a, image in zip(augmented, self.images)]
+        kept = [np.array_equal(a, image) for a, image in zip(augmented, self.images)]
+        self.assertTrue(all(f or k for f, k in zip(flipped, kept)))
+        self.assertTrue(any(flipped) and any(kept))
+
+    def test_rotation_about_center(self):
+        augmenter = AffineAugmenter(max_angle=180.0, flip=False, max_translation=0.0, random_state=0)
+        matrices = augmenter.sample_matrices(8, 40, 40)
+
+        # The center of the image does not move.
+        np.testing.assert_allclose(matrices.dot([20.0, 20.0, 1.0]), np.full((8, 2), 20.0), atol=1e-4)
+
+    def test_buffer_is_reused(self):
+        augmenter = AffineAugmenter(random_state=0)
+        first = augmenter.augment(self.images)
+        second = augmenter.augment(self.images)
+
+        self.assertIs(first, second)
+        self.assertEqual(first.dtype, np.uint8)
+
+    def test_load_augmented_images(self):
+        batch = np.arange(4).astype(str).reshape(-1, 1)
+        augmenter = AffineAugmenter(max_angle=0.0, flip=False, max_translation=0.0)
+        images = DataSet().withImg_names(batch).load_images(batch, source=ArraySource(self.images),
+                                                            augmenter=augmenter)
+
+        self.assertEqual(images.dtype, np.float32)
+        np.testing.assert_allclose(images, self.images[:4] / 255.0, atol=1e-6)
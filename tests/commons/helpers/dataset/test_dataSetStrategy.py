@@ -0,0 +1,111 @@
+from unittest import TestCase
+
+import csv
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from commons.exceptions.unableToLoadDatasetException import UnableToLoadDatasetException
+from commons.helpers.dataset.context import Context
+from commons.helpers.dataset.parsers import CsvFeatureParser, SparseCsvFeatureParser
+from commons.helpers.dataset.splitter import StratifiedSplitter
+from commons.helpers.dataset.strategies.galaxy_dataset.feature_strategy import GalaxyDataSetFeatureStrategy
+from commons.helpers.dataset.strategies.galaxy_dataset.label_strategy import GalaxyDataSetLabelStrategy
+from commons.helpers.dataset.strategies.spam_dataset.feature_strategy import SpamDataSetFeatureStrategy
+
+
+class TestDataSetStrategy(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        rng = np.random.RandomState(0)
+        self.classes = np.array(["elliptical", "smooth", "spiral"])
+        self.labels = self.classes[rng.randint(0, 3, 300)]
+
+        # Rows of type [ID, 74 features, class].
+        self.features_path = os.path.join(self.directory, "features.csv")
+        with open(self.features_path, mode="w", newline="") as features_csv:
+            writer = csv.writer(features_csv, quoting=csv.QUOTE_NONNUMERIC)
+            for i, label in enumerate(self.labels):
+                writer.writerow([float(i)] + list(rng.rand(74)) + [float(np.searchsorted(self.classes, label))])
+
+        # Rows of type (galaxy ID, class), with a header.
+        self.labels_path = os.path.join(self.directory, "labels.csv")
+        with open(self.labels_path, mode="w", newline="") as labels_csv:
+            writer = csv.writer(labels_csv)
+            writer.writerow(["id", "class"])
+            for i, label in enumerate(self.labels):
+                writer.writerow([str(100000 + i), label])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_labels_stay_integer_coded(self):
+        context = Context(GalaxyDataSetFeatureStrategy())
+        dataset = context.load_dataset(csv_file=self.features_path, one_hot=True, validation_size=np.float32(0.2))
+
+        self.assertEqual(dataset.train._num_examples, 240)
+        self.assertEqual(dataset.valid._num_examples, 60)
+        self.assertEqual(dataset.train.get_features.shape[1], 74)
+        self.assertTrue(np.issubdtype(dataset.train.get_label_codes.dtype, np.integer))
+
+        features, labels = dataset.train.next_feature_batch(32)
+        self.assertEqual(labels.shape, (32, 3))
+        np.testing.assert_array_equal(labels.sum(axis=1), np.ones(32))
+        np.testing.assert_array_equal(dataset.train.get_labels.argmax(axis=1), dataset.train.get_label_codes)
+
+    def test_load_without_one_hot(self):
+        context = Context(GalaxyDataSetLabelStrategy())
+        dataset = context.load_dataset(csv_file=self.labels_path, one_hot=False, validation_size=np.float32(0.5))
+
+        img_names, labels = dataset.train.next_image_batch(10)
+        self.assertEqual(img_names.shape, (10, 1))
+        self.assertEqual(labels.shape, (10, 1))
+
+        # The classes are encoded in sorted order and the split is stratified.
+        for data_set in (dataset.train, dataset.valid):
+            expected = np.searchsorted(self.classes, self.labels[data_set._img_names.ravel().astype(int) - 100000])
+            np.testing.assert_array_equal(data_set.get_labels.ravel(), expected)
+        np.testing.assert_allclose(np.bincount(dataset.train.get_labels.ravel()),
+                                   np.bincount(dataset.valid.get_labels.ravel()), atol=1)
+
+    def test_swap_parser(self):
+        dense = Context(SpamDataSetFeatureStrategy(parser=CsvFeatureParser(slice(1, 75), 75),
+                                                   splitter=StratifiedSplitter(0)))
+        sparse = Context(SpamDataSetFeatureStrategy(parser=SparseCsvFeatureParser(slice(1, 75), 75),
+                                                    splitter=StratifiedSplitter(0)))
+
+        dense_dataset = dense.load_dataset(csv_file=self.features_path, one_hot=False, validation_size=np.float32(0.2))
+        sparse_dataset = sparse.load_dataset(csv_file=self.features_path, one_hot=False,
+                                             validation_size=np.float32(0.2))
+
+        np.testing.assert_allclose(sparse_dataset.train.get_features.toarray(), dense_dataset.train.get_features)
+        np.testing.assert_array_equal(sparse_dataset.train.get_labels, dense_dataset.train.get_labels)
+
+    def test_missing_file(self):
+        context = Context(GalaxyDataSetFeatureStrategy())
+
+        with self.assertRaises(UnableToLoadDatasetException) as raised:
+            context.load_dataset(csv_file=os.path.join(self.directory, "missing.csv"), one_hot=False,
+                                 validation_size=np.float32(0.2))
+        self.assertTrue(str(raised.exception).startswith("Unable to load galaxies data set with cause: "))
+
+    def test_one_hot_batches_from_compact_codes(self):
+        # Keep the ID column to match the batches with the CSV file.
+        context = Context(GalaxyDataSetFeatureStrategy(parser=CsvFeatureParser(slice(0, 75), 75)))
+        dataset = context.load_dataset(csv_file=self.features_path, one_hot=True, validation_size=np.float32(0.2))
+        self.assertEqual(dataset.train.get_label_codes.dtype, np.int8)
+
+        # A whole epoch of batches, then the first batch of the next, shuffled, epoch.
+        seen = list()
+        for i in range(240 // 40 + 1):
+            features, labels = dataset.train.next_feature_batch(40)
+            self.assertEqual(labels.dtype, np.float32)
+            np.testing.assert_array_equal(labels.argmax(axis=1),
+                                          np.searchsorted(self.classes, self.labels[features[:, 0].astype(int)]))
+            seen.append(labels)
+
+        # The one-hot batches share a single buffer.
+        self.assertTrue(all(np.shares_memory(seen[0], labels) for labels in seen))
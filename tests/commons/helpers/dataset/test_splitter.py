@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+import numpy as np
+
+from commons.helpers.dataset.dataset import DataSet
+from commons.helpers.dataset.splitter import StratifiedSplitter
+from commons.helpers.dataset.strategies.galaxy_dataset.feature_strategy import GalaxyDataSetFeatureStrategy
+
+
+class TestStratifiedSplitter(TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.labels = np.repeat([0, 1, 2], [600, 300, 101])
+        rng.shuffle(self.labels)
+        self.features = rng.rand(self.labels.shape[0], 5)
+
+    def test_holdout_is_stratified(self):
+        train_indices, validation_indices = StratifiedSplitter(0).holdout(self.labels, 0.2)
+
+        self.assertEqual(validation_indices.shape[0], int(np.round(0.2 * self.labels.shape[0])))
+        np.testing.assert_array_equal(np.sort(np.concatenate((train_indices, validation_indices))),
+                                      np.arange(self.labels.shape[0]))
+        np.testing.assert_array_equal(np.bincount(self.labels[validation_indices]), [120, 60, 20])
+
+    def test_holdout_with_one_hot_labels(self):
+        one_hot = np.eye(3)[self.labels]
+        _, validation_indices = StratifiedSplitter(0).holdout(one_hot, 0.5)
+
+        np.testing.assert_array_equal(np.bincount(self.labels[validation_indices]), [300, 150, 50])
+
+    def test_empty_validation_set(self):
+        data_sets = GalaxyDataSetFeatureStrategy().create_datasets(self.features, self.labels, np.float32(0.0))
+
+        self.assertEqual(data_sets.train._num_examples, self.labels.shape[0])
+        self.assertEqual(data_sets.valid._num_examples, 0)
+
+    def test_holdout_datasets_are_views(self):
+        data_sets = GalaxyDataSetFeatureStrategy().create_datasets(self.features, self.labels, np.float32(0.2))
+
+        self.assertIs(data_sets.train.get_features.base, data_sets.valid.get_features.base)
+        self.assertEqual(data_sets.train._num_examples + data_sets.valid._num_examples, self.labels.shape[0])
+
+    def test_kfold(self):
+        folds = StratifiedSplitter(0).kfold(self.labels, 10)
+        validation_indices = np.concatenate([validation for _, validation in folds])
+
+        np.testing.assert_array_equal(np.sort(validation_indices), np.arange(self.labels.shape[0]))
+        for train, validation in folds:
+            self.assertEqual(np.intersect1d(train, validation).shape[0], 0)
+            self.assertTrue(np.all(np.abs(np.bincount(self.labels[validation], minlength=3) - [60, 30, 10.1]) <= 1))
+
+    def test_kfold_datasets_share_arrays(self):
+        folds = StratifiedSplitter(0).kfold_datasets(self.features, self.labels, 5)
+
+        for data_sets in folds:
+            self.assertIs(data_sets.train._features, self.features)
+            self.assertEqual(data_sets.train._num_examples + data_sets.valid._num_examples, self.labels.shape[0])
+
+            features, labels = data_sets.valid.next_feature_batch(10)
+            rows = data_sets.valid.get_indices[:10]
+            np.testing.assert_array_equal(features, self.features[rows])
+            np.testing.assert_array_equal(labels, self.labels[rows])
+
+    def test_epoch_shuffle_keeps_the_caller_indices(self):
+        indices = np.arange(0, 100, 2)
+
+        def epochs(random_state):
+            data_set = DataSet(random_state).withFeatures(self.features).withLabels(self.labels).withIndices(indices)
+            return [data_set.next_feature_batch(30)[1] for _ in range(4)]
+
+        first, second = epochs(1), epochs(1)
+        np.testing.assert_array_equal(indices, np.arange(0, 100, 2))
+        for batch1, batch2 in zip(first, second):
+            np.testing.assert_array_equal(batch1, batch2)
+
+    def test_with_indices_accepts_sequences(self):
+        for indices in ([1, 3, 5], range(1, 7, 2)):
+            data_set = DataSet(0).withFeatures(self.features).withLabels(self.labels).withIndices(indices)
+            self.assertEqual(data_set._num_examples, 3)
+            np.testing.assert_array_equal(data_set.get_features, self.features[[1, 3, 5]])
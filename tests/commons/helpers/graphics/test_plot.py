@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from classifiers.galaxy_classifiers.decision_tree_classifier import TreeClassifier
+from commons.helpers.graphics.export import PlotExporter
+from commons.helpers.graphics.plot import Plot
+
+
+class TestPlot(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+        # Three classes of galaxies described by four features, only the first one separating the classes.
+        rng = np.random.RandomState(0)
+        self.y = np.repeat(np.arange(3), 20)
+        self.X = rng.rand(60, 4)
+        self.X[:, 0] += self.y
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_stratified_sample_never_exceeds_max_points(self):
+        # Eleven classes of one sample each and a larger class: one sample per class would draw 12 samples.
+        class_codes = np.concatenate((np.arange(11), np.full(89, 11)))
+
+        for nb_samples in (10, 11, 12, 50):
+            idx = Plot._stratified_sample(class_codes, nb_samples, random_state=0)
+            self.assertEqual(idx.shape[0], nb_samples)
+            self.assertEqual(np.unique(idx).shape[0], nb_samples)
+
+        idx = Plot._stratified_sample(class_codes, 12, random_state=0)
+        np.testing.assert_array_equal(np.unique(class_codes[idx]), np.arange(12))
+
+    def test_sample_mode(self):
+        filename = os.path.join(self.directory, "sample.png")
+        labels = np.array(["smooth", "spiral", "artifact"])[self.y]
+
+        Plot.plot_feature_comparison(self.X[:, 0], self.X[:, 1], labels, filename=filename, mode="sample",
+                                     max_points=10, random_state=0)
+        self.assertTrue(os.path.isfile(filename))
+
+    def test_density_mode(self):
+        image, extent = Plot._density_image(self.X[:, 0], self.X[:, 1], self.y, 3, 8, np.eye(3, dtype=np.float32))
+
+        self.assertEqual(image.shape, (8, 8, 4))
+        self.assertAlmostEqual(image[..., 3].max(), 1.0, places=6)
+        self.assertEqual(extent[0], self.X[:, 0].min())
+
+        filename = os.path.join(self.directory, "density.png")
+        Plot.plot_feature_comparison(self.X[:, 0], self.X[:, 1], self.y, filename=filename, mode="density", bins=8)
+        self.assertTrue(os.path.isfile(filename))
+
+    def test_decision_surface_matches_full_resolution(self):
+        extent, Z = Plot._decision_surface(self.X, self.y, [0, 1], plot_step=0.02, pixel_budget=4000,
+                                           refine_factor=4, chunk_size=100)
+        ny, nx = Z.shape
+        self.assertLessEqual(nx * ny, 2 * 4000)
+
+        # The boundaries of the tree are straight lines, so they cross the coarse cells whose corners differ and are
+        # refined: the surface is the prediction of every point of the grid.
+        clf = TreeClassifier().train(self.X[:, [0, 1]], self.y)
+        xx, yy = np.meshgrid(np.linspace(extent[0], extent[1], nx), np.linspace(extent[2], extent[3], ny))
+        expected = clf.predict(np.c_[xx.ravel(), yy.ravel()]).reshape(Z.shape)
+
+        np.testing.assert_array_equal(Z, expected)
+
+    def test_export_decision_surfaces_in_worker_processes(self):
+        filenames = [os.path.join(self.directory, "tree_%d.png" % i) for i in range(2)]
+
+        with PlotExporter(max_workers=2) as exporter:
+            futures = [Plot.plot_tree_decision_surface(self.X, self.y, "feature 1", "feature 2", filename=filename,
+                                                       pixel_budget=4000, refine_factor=4, n_jobs=1,
+                                                       exporter=exporter)
+                       for filename in filenames]
+            self.assertEqual(exporter.wait(), filenames)
+
+        self.assertEqual([future.result() for future in futures], filenames)
+        for filename in filenames:
+            self.assertGreater(os.path.getsize(filename), 0)
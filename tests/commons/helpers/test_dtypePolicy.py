@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+import csv
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from scipy import sparse
+
+from classifiers.galaxy_classifiers.knn_classifier import KNNClassifier
+from commons.helpers.dataset.context import Context
+from commons.helpers.dataset.strategies.spam_dataset.feature_strategy import SpamDataSetFeatureStrategy
+from commons.helpers.dtype_policy import get_float_type, set_float_type, standardize
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+
+
+class TestDtypePolicy(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "spam.csv")
+
+        rng = np.random.RandomState(0)
+        with open(self.path, mode="w", newline="") as spam_csv:
+            writer = csv.writer(spam_csv, quoting=csv.QUOTE_NONNUMERIC)
+            for i in range(100):
+                writer.writerow(list(rng.rand(10)) + [float(i % 2)])
+
+    def tearDown(self):
+        set_float_type(np.float32)
+        shutil.rmtree(self.directory)
+
+    def test_float32_by_default(self):
+        self.assertIs(get_float_type(), np.float32)
+
+        dataset = Context(SpamDataSetFeatureStrategy()).load_dataset(csv_file=self.path, one_hot=False,
+                                                                     validation_size=np.float32(0.2))
+        X = dataset.train.get_features
+        self.assertEqual(X.dtype, np.float32)
+
+        standardized = KNNClassifier(5, "uniform").standardize(X, copy=False)
+        self.assertIs(standardized, X)
+        np.testing.assert_allclose(X.mean(axis=0), 0.0, atol=1e-5)
+
+        image = np.arange(48, dtype=np.uint8).reshape(4, 4, 3)
+        processor = GalaxyProcessor("")
+        self.assertEqual(processor.rescale(image).dtype, np.float32)
+        self.assertEqual(processor.saturate(image).dtype, np.float32)
+
+    def test_set_float_type(self):
+        set_float_type(np.float64)
+
+        dataset = Context(SpamDataSetFeatureStrategy(sparse=True)).load_dataset(csv_file=self.path, one_hot=False,
+                                                                                validation_size=np.float32(0.2))
+        self.assertEqual(dataset.train.get_features.dtype, np.float64)
+
+        with self.assertRaises(ValueError):
+            set_float_type(np.int32)
+
+    def test_standardize(self):
+        X = np.arange(12, dtype=np.float64).reshape(4, 3)
+
+        standardized = standardize(X)
+        self.assertEqual(standardized.dtype, np.float32)
+        np.testing.assert_allclose(standardized.mean(axis=0), 0.0, atol=1e-6)
+        np.testing.assert_allclose(standardized.std(axis=0), 1.0, rtol=1e-6)
+        self.assertEqual(X[0, 0], 0.0)
+
+    def test_standardize_sparse(self):
+        X = sparse.csr_matrix(np.array([[0.0, 1.0], [2.0, 0.0], [0.0, 3.0], [4.0, 0.0]]))
+
+        standardized = standardize(X)
+        self.assertTrue(sparse.issparse(standardized))
+        self.assertEqual(standardized.nnz, X.nnz)
+        np.testing.assert_allclose(standardized.toarray().std(axis=0), 1.0, rtol=1e-6)
@@ -0,0 +1,19 @@
+import cv2
+import numpy as np
+
+
+def write_synthetic_galaxies(directory, img_ids, seed=0):
+    """ Write synthetic 424x424 galaxy JPEG images: noisy blurred ellipses of random size and orientation.
+
+    Args:
+        directory: The directory of the images, ending with a separator.
+        img_ids: The IDs of the galaxies, which name the image files.
+        seed: The seed of the random sizes, orientations and noise.
+    """
+    rng = np.random.RandomState(seed)
+    for img_id in img_ids:
+        image = np.zeros((424, 424, 3), dtype=np.uint8)
+        cv2.ellipse(image, (212, 212), (int(rng.randint(30, 90)), int(rng.randint(30, 90))),
+                    float(rng.randint(180)), 0, 360, (230, 210, 190), -1)
+        image = np.clip(cv2.GaussianBlur(image, (41, 41), 10) + rng.normal(0, 4, image.shape), 0, 255)
+        cv2.imwrite(directory + str(img_id) + ".jpg", image.astype(np.uint8))
@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import cv2
+import numpy as np
+
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+
+
+class TestCanonicalize(TestCase):
+
+    def setUp(self):
+        self.processor = GalaxyProcessor("")
+
+        # Tilted off-center elliptical galaxies on a rectangular image.
+        self.images = np.zeros((3, 240, 320, 3), dtype=np.uint8)
+        self.masks = np.zeros((3, 240, 320), dtype=np.uint8)
+        for i, (center, angle) in enumerate((((150, 110), 30), ((170, 130), -60), ((160, 120), 80))):
+            cv2.ellipse(self.images[i], center, (60, 20), angle, 0, 360, (200, 150, 100), -1)
+            cv2.circle(self.images[i], center, 5, (255, 255, 255), -1)
+            cv2.ellipse(self.masks[i], center, (60, 20), angle, 0, 360, 255, -1)
+
+    def test_fit_ellipse_matches_svd(self):
+        rng = np.random.RandomState(0)
+        points = rng.randn(500, 2).dot([[30.0, 5.0], [0.0, 10.0]]) + [100.0, 80.0]
+
+        center, axes, angle = self.processor.fit_ellipse(points)
+
+        centered = points - points.mean(axis=0)
+        U, S, V = np.linalg.svd(centered, full_matrices=False)
+        np.testing.assert_allclose(center, points.mean(axis=0))
+        np.testing.assert_allclose(axes, 2 * 1.96 * S / np.sqrt(len(points) - 1))
+        difference = (angle - np.degrees(np.arctan2(V[0, 1], V[0, 0]))) % 180
+        self.assertAlmostEqual(min(difference, 180 - difference), 0.0, places=6)
+
+    def test_fit_ellipse_batch(self):
+        points = [np.column_stack(np.nonzero(mask)[::-1]) for mask in self.masks]
+        centers, axes, angles = self.processor.fit_ellipse_batch(points)
+
+        for i in range(len(points)):
+            center, axis, angle = self.processor.fit_ellipse(points[i])
+            np.testing.assert_allclose(centers[i], center)
+            np.testing.assert_allclose(axes[i], axis)
+            self.assertAlmostEqual(angles[i], angle)
+        np.testing.assert_allclose(angles, [30, -60, 80], atol=1.0)
+
+    def test_matches_rotate_then_crop(self):
+        crop, (center, axes, angle) = self.processor.canonicalize(self.images[0], self.masks[0], crop_size=(100, 100))
+
+        rotated = self.processor.rotate(self.images[0], center[0], center[1], angle)
+        expected = rotated[120 - 50:120 + 50, 160 - 50:160 + 50]
+
+        self.assertEqual(crop.shape, (100, 100, 3))
+        self.assertLessEqual(np.abs(crop.astype(int) - expected).max(), 1)
+
+    def test_batch_writes_into_out(self):
+        out = np.zeros((3, 60, 160, 3), dtype=np.uint8)
+        crops, (centers, axes, angles) = self.processor.canonicalize_batch(self.images, self.masks, crop_size=(160, 60),
+                                                                           out=out)
+
+        self.assertIs(crops, out)
+        for i in range(3):
+            crop, ellipse = self.processor.canonicalize(self.images[i], self.masks[i], crop_size=(160, 60))
+            np.testing.assert_array_equal(crops[i], crop)
+
+        # The galaxies are aligned with the X axis, centered in the crops.
+        np.testing.assert_array_equal(crops[:, 30, 80], 255)
+        self.assertTrue(np.all(crops[:, 30, 25] > 0))
+        self.assertTrue(np.all(crops[:, 5, 80] == 0))
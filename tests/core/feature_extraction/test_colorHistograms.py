@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+import cv2
+import numpy as np
+
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+
+
+class TestColorHistograms(TestCase):
+
+    def setUp(self):
+        self.processor = GalaxyProcessor("")
+        rng = np.random.RandomState(0)
+        self.images = rng.randint(0, 256, (4, 30, 40, 3)).astype(np.uint8)
+
+    def test_get_color_histogram_counts_every_pixel(self):
+        histograms = self.processor.get_color_histogram(self.images[0])
+
+        self.assertEqual(histograms.shape, (3, 256, 1))
+        for channel in range(3):
+            np.testing.assert_array_equal(histograms[channel].ravel(),
+                                          cv2.calcHist([self.images[0]], [channel], None, [256], [0, 256]).ravel())
+            self.assertEqual(histograms[channel].sum(), 30 * 40)
+
+    def test_per_channel_histograms_match_calc_hist(self):
+        for bins in (256, 16, 7):
+            histograms = self.processor.get_color_histograms(self.images, bins=bins)
+
+            self.assertEqual(histograms.shape, (4, 3, bins))
+            for i, image in enumerate(self.images):
+                for channel in range(3):
+                    np.testing.assert_array_equal(histograms[i, channel],
+                                                  cv2.calcHist([image], [channel], None, [bins], [0, 256]).ravel())
+
+    def test_joint_histograms_match_calc_hist(self):
+        histograms = self.processor.get_color_histograms(self.images, bins=8, joint=True)
+
+        self.assertEqual(histograms.shape, (4, 8, 8, 8))
+        for i, image in enumerate(self.images):
+            np.testing.assert_array_equal(histograms[i],
+                                          cv2.calcHist([image], [0, 1, 2], None, [8, 8, 8], [0, 256, 0, 256, 0, 256]))
+
+    def test_mask_and_normalize(self):
+        mask = np.zeros((30, 40), dtype=bool)
+        mask[10:20, 10:30] = True
+
+        histograms = self.processor.get_color_histograms(self.images, bins=4, mask=mask, normalize=True)
+        joint = self.processor.get_color_histograms(self.images, bins=4, joint=True, mask=mask)
+
+        np.testing.assert_allclose(histograms.sum(axis=2), 1.0, rtol=1e-6)
+        np.testing.assert_array_equal(joint.sum(axis=(1, 2, 3)), 200)
+        np.testing.assert_array_equal(joint[0], cv2.calcHist([self.images[0]], [0, 1, 2], mask.astype(np.uint8),
+                                                             [4, 4, 4], [0, 256, 0, 256, 0, 256]))
+
+    def test_opencv_mask(self):
+        mask = np.zeros((30, 40), dtype=np.uint8)
+        cv2.circle(mask, (20, 15), 10, 255, -1)
+
+        histograms = self.processor.get_color_histograms(self.images, bins=16, mask=mask)
+        for i, image in enumerate(self.images):
+            for channel in range(3):
+                np.testing.assert_array_equal(histograms[i, channel],
+                                              cv2.calcHist([image], [channel], mask, [16], [0, 256]).ravel())
+
+    def test_rejects_float_images(self):
+        with self.assertRaises(ValueError):
+            self.processor.get_color_histograms(self.images / 255.0)
@@ -0,0 +1,90 @@
+from unittest import TestCase
+
+import os
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+
+from core.feature_extraction.galaxy.duplicate_index import DuplicateIndex
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+from core.feature_extraction.galaxy.image_decoder import GalaxyImageDecoder
+
+
+class TestDuplicateIndex(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.processor = GalaxyProcessor(self.directory + "/")
+
+        # Synthetic 424x424 galaxies: elliptic blobs of random size and orientation.
+        rng = np.random.RandomState(0)
+        self.images = dict()
+        for img_id in range(100000, 100020):
+            image = np.zeros((424, 424, 3), dtype=np.uint8)
+            axes = tuple(int(a) for a in rng.randint(10, 70, 2))
+            center = tuple(int(c) for c in 212 + rng.randint(-30, 30, 2))
+            cv2.ellipse(image, center, axes, float(rng.randint(180)), 0, 360, (255, 230, 200), -1)
+            self.images[img_id] = cv2.GaussianBlur(image, (31, 31), 8)
+
+        # A re-observation of the first galaxy, with noise.
+        noise = rng.normal(0, 3, (424, 424, 3))
+        self.images[100020] = np.clip(self.images[100000] + noise, 0, 255).astype(np.uint8)
+
+        for img_id, image in self.images.items():
+            cv2.imwrite(os.path.join(self.directory, str(img_id) + ".jpg"), image)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_find_near_duplicates(self):
+        index = DuplicateIndex(self.processor, max_distance=6)
+        duplicates = index.find_duplicates(sorted(self.images))
+
+        self.assertEqual(duplicates, {100020: 100000})
+        self.assertEqual(len(index), 21)
+
+    def test_query_matches_brute_force(self):
+        index = DuplicateIndex(self.processor, max_distance=10)
+        rng = np.random.RandomState(1)
+        hashes = [int(h) for h in rng.randint(0, 2 ** 63, size=2000, dtype=np.int64)]
+
+        # Add near copies of some hashes.
+        for i in range(200):
+            flips = rng.choice(64, rng.randint(0, 13), replace=False)
+            hashes.append(hashes[i] ^ int(sum(1 << int(bit) for bit in flips)))
+
+        for img_id, image_hash in enumerate(hashes):
+            index.add(img_id, image_hash)
+
+        for image_hash in hashes[:50] + hashes[-50:]:
+            expected = sorted(i for i, h in enumerate(hashes) if bin(h ^ image_hash).count("1") <= 10)
+            self.assertEqual(sorted(img_id for img_id, distance in index.query(image_hash)), expected)
+
+    def test_save_and_load(self):
+        index = DuplicateIndex(self.processor)
+        for img_id in self.images:
+            index.add(img_id, index.hash_image(img_id))
+
+        filename = os.path.join(self.directory, "index.npz")
+        index.save(filename)
+        loaded = DuplicateIndex(self.processor).load(filename)
+
+        image_hash = loaded.hash_image(100005)
+        self.assertEqual(loaded.query(image_hash, max_distance=0)[0], (100005, 0))
+
+    def test_query_beyond_the_index_distance(self):
+        index = DuplicateIndex(self.processor, max_distance=4)
+
+        with self.assertRaises(ValueError):
+            index.query(0, max_distance=5)
+
+    def test_hash_image_from_the_image_source(self):
+        # A source decoding only the crop which is hashed gives the same hashes as the full images.
+        source = GalaxyImageDecoder(self.directory + "/", ".jpg", half_size=75)
+        index = DuplicateIndex(GalaxyProcessor(self.directory + "/", image_source=source))
+
+        for img_id in self.images:
+            self.assertEqual(index.hash_image(img_id), index.perceptual_hash(cv2.imread(
+                os.path.join(self.directory, str(img_id) + ".jpg"))))
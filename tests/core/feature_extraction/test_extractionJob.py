@@ -0,0 +1,96 @@
+from unittest import TestCase
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from core.feature_extraction.galaxy.extraction_job import ExtractionJob
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+from tests.core.feature_extraction.galaxy_images import write_synthetic_galaxies
+
+
+class Crash(BaseException):
+    pass
+
+
+class CrashingProcessor(GalaxyProcessor):
+    """ A processor crashing, like a killed job, after extracting a given number of galaxies. """
+
+    def __init__(self, path, nb_extractions=None, **kwargs):
+        super(CrashingProcessor, self).__init__(path, **kwargs)
+        self.nb_extractions = nb_extractions
+        self.extracted = list()
+
+    def get_features(self, img_id):
+        if self.nb_extractions is not None and len(self.extracted) == self.nb_extractions:
+            raise Crash()
+        self.extracted.append(img_id)
+        return super(CrashingProcessor, self).get_features(img_id)
+
+
+class TestExtractionJob(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp() + "/"
+        self.job_directory = os.path.join(self.directory, "job")
+        self.img_ids = [str(img_id) for img_id in range(100000, 100007)]
+
+        # Synthetic 424x424 galaxies, one of them corrupted, and a missing one.
+        write_synthetic_galaxies(self.directory, self.img_ids)
+        with open(self.directory + "100003.jpg", "wb") as corrupted:
+            corrupted.write(b"not a jpeg")
+        self.img_ids.append("missing")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def processor(self, nb_extractions=None):
+        return CrashingProcessor(self.directory, nb_extractions, features=("ratio", "circularity"))
+
+    def test_failures_are_recorded(self):
+        ids, matrix = ExtractionJob(self.processor(), self.job_directory, chunk_size=3).run(self.img_ids).load()
+        failures = ExtractionJob(self.processor(), self.job_directory, chunk_size=3).failures
+
+        self.assertEqual(sorted(failures), ["100003", "missing"])
+        self.assertTrue(failures["missing"].startswith("FileNotFoundException"))
+        self.assertEqual(list(ids), [img_id for img_id in self.img_ids if img_id not in failures])
+        self.assertEqual(matrix.values.shape, (6, 2))
+        np.testing.assert_array_equal(matrix["circularity"][:, 0],
+                                      [self.processor().get_features(img_id)[1] for img_id in ids])
+
+        with open(os.path.join(self.job_directory, ExtractionJob.MANIFEST)) as manifest_file:
+            manifest = json.load(manifest_file)
+        self.assertEqual(sorted(manifest["chunks"]), ["0", "1", "2"])
+        self.assertEqual([manifest["chunks"][index]["nb_failures"] for index in "012"], [0, 1, 1])
+
+    def test_resume_after_crash(self):
+        with self.assertRaises(Crash):
+            ExtractionJob(self.processor(nb_extractions=4), self.job_directory, chunk_size=3).run(self.img_ids)
+
+        self.assertEqual(list(ExtractionJob(self.processor(), self.job_directory, chunk_size=3).manifest["chunks"]),
+                         ["0"])
+        self.assertEqual([name for name in os.listdir(self.job_directory) if name.endswith(".tmp")], [])
+
+        processor = self.processor()
+        ids, matrix = ExtractionJob(processor, self.job_directory, chunk_size=3).run(self.img_ids).load()
+        self.assertEqual(processor.extracted, self.img_ids[3:])
+
+        expected_ids, expected = ExtractionJob(self.processor(), self.directory + "reference", 3).run(
+            self.img_ids).load()
+        np.testing.assert_array_equal(ids, expected_ids)
+        np.testing.assert_array_equal(matrix.values, expected.values)
+
+    def test_resume_with_other_ids_fails(self):
+        ExtractionJob(self.processor(), self.job_directory, chunk_size=3).run(self.img_ids[:3])
+
+        with self.assertRaises(ValueError):
+            ExtractionJob(self.processor(), self.job_directory, chunk_size=3).run(self.img_ids)
+
+    def test_missing_image_features(self):
+        processor = GalaxyProcessor("")
+
+        self.assertEqual(processor.get_ratio_aspect(None)[0], -1)
+        self.assertEqual(processor.calculate_circularity(None), -1)
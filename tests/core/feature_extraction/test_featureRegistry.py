@@ -0,0 +1,118 @@
+from unittest import TestCase
+
+import cv2
+import numpy as np
+
+from core.feature_extraction.galaxy.feature_registry import FeatureRegistry, default_registry
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+
+
+class TestFeatureRegistry(TestCase):
+
+    def setUp(self):
+        self.calls = list()
+
+        def blur(processor, image, scale):
+            self.calls.append(("blur", scale))
+            return image + 1
+
+        def total(processor, blurred, scale, offset):
+            return blurred.sum() + offset
+
+        def extremes(processor, blurred, image, scale):
+            return blurred.min(), image.max()
+
+        def unused(processor, image, scale):
+            self.calls.append(("unused", scale))
+            return image
+
+        self.registry = FeatureRegistry()
+        self.registry.add_intermediate("blur", blur)
+        self.registry.add_intermediate("unused", unused)
+        self.registry.add_feature("total", 1, total, depends=("blur",), parameters=dict(offset=10))
+        self.registry.add_feature("extremes", 2, extremes, depends=("blur", "image"))
+        self.registry.add_feature("size", 1, lambda processor, image, scale: image.size)
+        self.images = {1: np.arange(4.0).reshape(2, 2), 2: np.zeros((1, 1))}
+
+    def test_intermediates_are_computed_once(self):
+        features = self.registry.extract(None, self.images)
+
+        np.testing.assert_array_equal(features, [20, 1, 3, 4])
+        self.assertEqual(self.calls, [("blur", 1)])
+
+    def test_unselected_stages_are_skipped(self):
+        features = self.registry.extract(None, self.images, selection=("size",))
+
+        np.testing.assert_array_equal(features, [4])
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.registry.plan(("size",)), [("image", 1)])
+
+    def test_nodes_are_per_scale(self):
+        features = self.registry.extract(None, self.images, scale_policy={"total": 2})
+
+        np.testing.assert_array_equal(features, [11, 1, 3, 4])
+        self.assertEqual(sorted(self.calls), [("blur", 1), ("blur", 2)])
+        self.assertEqual(self.registry.scales(scale_policy={"total": 2}), [1, 2])
+
+    def test_columns(self):
+        columns = self.registry.columns(("size", "extremes"))
+
+        self.assertEqual(list(columns), ["extremes", "size"])
+        self.assertEqual(columns["extremes"], slice(0, 2))
+        self.assertEqual(columns["size"], slice(2, 3))
+
+    def test_errors(self):
+        with self.assertRaises(KeyError):
+            self.registry.columns(("missing",))
+
+        self.registry.add_intermediate("a", lambda processor, b, scale: b, depends=("b",))
+        self.registry.add_intermediate("b", lambda processor, a, scale: a, depends=("a",))
+        self.registry.add_feature("cyclic", 1, lambda processor, a, scale: 0, depends=("a",))
+        with self.assertRaises(ValueError):
+            self.registry.plan(("cyclic",))
+
+        self.registry.add_feature("wrong", 3, lambda processor, image, scale: 0)
+        with self.assertRaises(ValueError):
+            self.registry.extract(None, self.images, selection=("wrong",))
+
+
+class TestGalaxyProcessorFeatures(TestCase):
+
+    def setUp(self):
+        self.image = np.zeros((300, 300, 3), dtype=np.uint8)
+        cv2.ellipse(self.image, (150, 150), (80, 30), 30, 0, 360, (180, 160, 140), -1)
+        self.image = cv2.GaussianBlur(self.image, (15, 15), 0)
+
+    def test_default_features(self):
+        processor = GalaxyProcessor("")
+        features = processor.compute_features({1: self.image})
+
+        self.assertEqual(list(processor.feature_blocks), ["ratio", "circularity", "ccv"])
+        self.assertEqual(features.shape, (130,))
+        self.assertAlmostEqual(features[0], processor.get_ratio_aspect(self.image)[0], places=5)
+        self.assertAlmostEqual(features[1], processor.calculate_circularity(self.image), places=5)
+        np.testing.assert_allclose(features[2:], np.ravel(processor.get_ccv(self.image, 160 ** 2 * 0.01, 64)))
+
+    def test_selected_features_share_the_gray_image(self):
+        registry = default_registry()
+        processor = GalaxyProcessor("", features=("gini", "entropy", "light_radius"), registry=registry)
+        gray = processor.get_gray_image(self.image)
+        features = processor.compute_features({1: self.image})
+
+        self.assertEqual(registry.plan(processor.features), [("image", 1), ("gray", 1)])
+        np.testing.assert_allclose(features, [processor.gini(gray.astype(np.float32)), processor.get_entropy(gray)] +
+                                   list(processor.get_light_radius(gray)), rtol=1e-6)
+
+    def test_feature_matrix(self):
+        image = self.image
+
+        class Source(object):
+            def read_scales(self, img_id, scales):
+                return dict((scale, image) for scale in scales)
+
+        processor = GalaxyProcessor("", image_source=Source(), features=("ratio", "ccv"))
+        matrix = processor.get_feature_matrix([1, 2])
+
+        self.assertEqual(matrix.values.shape, (2, 129))
+        self.assertEqual(matrix.names[:3], ["ratio", "ccv_0", "ccv_1"])
+        np.testing.assert_array_equal(matrix["ratio"][:, 0], processor.compute_features({1: image})[0])
@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+import cv2
+import numpy as np
+from scipy.stats.mstats import mquantiles
+
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+
+
+class TestHistogramQuantiles(TestCase):
+
+    def setUp(self):
+        self.processor = GalaxyProcessor("")
+        self.rng = np.random.RandomState(0)
+
+    def test_quantiles_match_mquantiles(self):
+        probabilities = [0.0, 0.01, 0.25, 0.5, 0.99, 1.0]
+
+        for size in (1, 2, 3, 10, 1001):
+            values = self.rng.randint(0, 256, size).astype(np.uint8)
+            histogram = self.processor.get_uint8_histograms(values[np.newaxis])[0]
+
+            np.testing.assert_allclose(self.processor.histogram_quantiles(histogram, probabilities),
+                                       mquantiles(values.astype(np.float64), probabilities))
+            self.assertEqual(self.processor.histogram_medians(histogram), np.median(values))
+
+    def test_batched_histograms(self):
+        images = self.rng.randint(0, 256, (4, 20, 20, 3)).astype(np.uint8)
+        mask = self.rng.rand(20, 20, 3) < 0.5
+        histograms = self.processor.get_uint8_histograms(images, mask=mask)
+
+        self.assertEqual(histograms.shape, (4, 256))
+        for image, histogram in zip(images, histograms):
+            np.testing.assert_array_equal(histogram, np.bincount(image[mask], minlength=256))
+        np.testing.assert_allclose(self.processor.histogram_medians(histograms),
+                                   [np.median(image[mask]) for image in images])
+
+    def test_saturate_and_remove_starlight(self):
+        image = self.rng.randint(0, 256, (64, 64, 3)).astype(np.uint8)
+        image[self.rng.rand(64, 64) < 0.3] = 0
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        q = mquantiles(image[np.nonzero(image)].astype(np.float64), [0.01, 0.99])
+        np.testing.assert_allclose(self.processor.saturate(image), np.clip(image, q[0], q[1]))
+
+        t = np.max(np.median(image[np.nonzero(gray)], axis=0))
+        expected = image.copy()
+        expected[expected < t] = t
+        np.testing.assert_array_equal(self.processor.remove_starlight(image.copy(), gray),
+                                      self.processor.rescale(expected).astype("uint8"))
+
+    def test_empty_histograms(self):
+        histogram = np.zeros(256, dtype=np.int64)
+
+        self.assertTrue(np.isnan(self.processor.histogram_quantiles(histogram, [0.01, 0.99])).all())
+        self.assertTrue(np.isnan(self.processor.histogram_medians(histogram)))
+        np.testing.assert_array_equal(self.processor.histogram_medians(np.stack((histogram, np.ones(256)))),
+                                      [np.nan, 127.5])
+
+    def test_black_image_is_unchanged(self):
+        image = np.zeros((16, 16, 3), dtype=np.uint8)
+
+        np.testing.assert_array_equal(self.processor.saturate(image), 0.0)
+        np.testing.assert_array_equal(self.processor.saturate(image.astype(np.float64)), 0.0)
+
+        # Without nonzero gray pixel, no pixel is raised before the rescaling.
+        image[0, 0] = (10, 20, 30)
+        gray = np.zeros((16, 16), dtype=np.uint8)
+        np.testing.assert_array_equal(self.processor.remove_starlight(image.copy(), gray),
+                                      self.processor.rescale(image.copy()).astype("uint8"))
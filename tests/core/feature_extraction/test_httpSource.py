@@ -0,0 +1,124 @@
+from unittest import TestCase
+
+import functools
+import shutil
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import numpy as np
+
+from commons.exceptions.fileNotFoundException import FileNotFoundException
+from commons.helpers.dataset.dataset import DataSet
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+from core.feature_extraction.galaxy.http_source import GalaxyHttpSource
+from core.feature_extraction.galaxy.image_decoder import GalaxyImageDecoder
+from tests.core.feature_extraction.galaxy_images import write_synthetic_galaxies
+
+
+class ObjectStoreHandler(SimpleHTTPRequestHandler):
+    """ Serve the images of a directory, failing the first requests of some paths and forbidding others. """
+
+    protocol_version = "HTTP/1.1"
+    failures = dict()
+    forbidden = set()
+    requests = dict()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.requests[self.path] = self.requests.get(self.path, 0) + 1
+            remaining = self.failures.get(self.path, 0)
+            self.failures[self.path] = remaining - 1
+        if remaining > 0:
+            self.send_error(503)
+            return
+        if self.path in self.forbidden:
+            self.send_error(403)
+            return
+        super(ObjectStoreHandler, self).do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestGalaxyHttpSource(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp() + "/"
+        self.img_ids = [str(img_id) for img_id in range(100000, 100006)]
+
+        write_synthetic_galaxies(self.directory, self.img_ids)
+        shutil.copy(self.directory + "100000.jpg", self.directory + "flaky.jpg")
+        shutil.copy(self.directory + "100000.jpg", self.directory + "forbidden.jpg")
+        with open(self.directory + "corrupted.jpg", "wb") as corrupted:
+            corrupted.write(b"not a jpeg")
+
+        ObjectStoreHandler.failures = {"/flaky.jpg": 2}
+        ObjectStoreHandler.forbidden = {"/forbidden.jpg"}
+        ObjectStoreHandler.requests = dict()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0),
+                                          functools.partial(ObjectStoreHandler, directory=self.directory))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.url = "http://127.0.0.1:%d" % self.server.server_address[1]
+        self.source = GalaxyHttpSource(self.url, max_connections=3, retry_delay=0.01)
+        self.decoder = GalaxyImageDecoder(self.directory)
+
+    def tearDown(self):
+        self.source.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def test_read_matches_decoder(self):
+        for img_id in self.img_ids[:2]:
+            np.testing.assert_array_equal(self.source.read(img_id), self.decoder.read(img_id))
+
+        images = self.source.read_scales(self.img_ids[2], (1, 2, 4))
+        for scale in (1, 2, 4):
+            np.testing.assert_array_equal(images[scale], self.decoder.read(self.img_ids[2], scale))
+
+    def test_read_many_keeps_order(self):
+        images = self.source.read_many(self.img_ids[::-1], scale=2)
+
+        np.testing.assert_array_equal(images, self.decoder.read_many(self.img_ids[::-1], scale=2))
+
+    def test_iter_scales_prefetches_in_order(self):
+        read = list(self.source.iter_scales(self.img_ids, (1,), prefetch=2))
+
+        self.assertEqual([img_id for img_id, images in read], self.img_ids)
+        np.testing.assert_array_equal(read[-1][1][1], self.decoder.read(self.img_ids[-1]))
+
+    def test_retries_and_errors(self):
+        np.testing.assert_array_equal(self.source.read("flaky"), self.decoder.read("100000"))
+
+        with self.assertRaises(FileNotFoundException):
+            self.source.read("missing")
+        with self.assertRaises(FileNotFoundException):
+            self.source.read("corrupted")
+
+        ObjectStoreHandler.failures = {"/flaky.jpg": 5}
+        with GalaxyHttpSource(self.url, max_retries=1, retry_delay=0.01) as source:
+            with self.assertRaises(aiohttp.ClientResponseError):
+                source.read("flaky")
+
+    def test_client_errors_are_not_retried(self):
+        with self.assertRaises(aiohttp.ClientResponseError) as raised:
+            self.source.read("forbidden")
+
+        self.assertEqual(raised.exception.status, 403)
+        self.assertEqual(ObjectStoreHandler.requests["/forbidden.jpg"], 1)
+
+    def test_processor_and_load_images(self):
+        from_http = GalaxyProcessor("", image_source=self.source)
+        from_jpeg = GalaxyProcessor(self.directory)
+
+        matrix = from_http.get_feature_matrix(self.img_ids[:3])
+        for i, img_id in enumerate(self.img_ids[:3]):
+            np.testing.assert_array_equal(matrix.values[i], from_jpeg.get_features(img_id))
+
+        batch = np.array(self.img_ids).reshape(-1, 1)
+        images = DataSet().withImg_names(batch).load_images(batch, source=self.source)
+        self.assertEqual(images.shape, (6, 300, 300, 3))
@@ -0,0 +1,104 @@
+from unittest import TestCase
+
+import math
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+import scipy.ndimage as nd
+
+from commons.exceptions.fileNotFoundException import FileNotFoundException
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+from core.feature_extraction.galaxy.image_decoder import GalaxyImageDecoder, benchmark_policies
+from tests.core.feature_extraction.galaxy_images import write_synthetic_galaxies
+
+
+def baseline_ratio(image):
+    """ The aspect ratio of the original code, computed from the full decoded image. """
+    img = cv2.cvtColor(image[212 - 150:212 + 150, 212 - 150:212 + 150], cv2.COLOR_BGR2GRAY)
+    ret, thresh = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    contours = cv2.findContours(thresh, 2, 2)[-2]
+    rect = cv2.minAreaRect(max(contours, key=lambda cnt: len(cnt)))
+    return rect[1][0] / (rect[1][1] + 0.0000000001)
+
+
+def baseline_circularity(image):
+    """ The circularity of the original code, computed from the full decoded image. """
+    img = image[212 - 85:212 + 85, 212 - 85:212 + 85].copy()
+    img = img - nd.gaussian_laplace(img, sigma=20)
+    ret, thresh = cv2.threshold(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    dilation = cv2.dilate(thresh, np.ones((3, 3), np.uint8), iterations=1)
+    contour = max(cv2.findContours(dilation, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)[-2], key=lambda cnt: len(cnt))
+    return 4 * math.pi * cv2.moments(contour)['m00'] / (cv2.arcLength(contour, True) ** 2)
+
+
+def baseline_ccv(image, threshold=160 ** 2 * 0.01, nb_colors=64):
+    """ The color coherence vector of the original code, computed from the full decoded image. """
+    div = 256 // nb_colors
+    img = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)[212 - 80:212 + 80, 212 - 80:212 + 80]
+    img = cv2.GaussianBlur(img, (3, 3), 0)
+    img = cv2.merge([np.vectorize(lambda x: int(x // div) * div)(ch).astype(np.uint8) for ch in cv2.split(img)])
+    coherent_pixels = np.zeros(nb_colors)
+    incoherent_pixels = np.zeros(nb_colors)
+    for ch in cv2.split(img):
+        ret, th = cv2.threshold(ch, 127, 255, 0)
+        ret, labeled, stat, centroids = cv2.connectedComponentsWithStats(th, None, cv2.CC_STAT_AREA, None,
+                                                                        connectivity=8)
+        for x, y, width, height, area_size in stat:
+            if x < ch.shape[1] and y < ch.shape[0]:
+                bin_idx = int(ch[y, x] // div)
+                if area_size >= threshold:
+                    coherent_pixels[bin_idx] += area_size
+                else:
+                    incoherent_pixels[bin_idx] += area_size
+    return [coherent_pixels, incoherent_pixels]
+
+
+class TestGalaxyImageDecoder(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp() + "/"
+
+        write_synthetic_galaxies(self.directory, range(3))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_read_center_crop(self):
+        decoder = GalaxyImageDecoder(self.directory)
+        full = cv2.imread(self.directory + "0.jpg")
+
+        crop = decoder.read(0)
+        self.assertEqual(crop.shape, (300, 300, 3))
+        np.testing.assert_array_equal(crop, full[62:362, 62:362])
+
+        for scale in (2, 4, 8):
+            self.assertEqual(decoder.read(0, scale).shape[:2], (2 * (150 // scale),) * 2)
+
+        with self.assertRaises(FileNotFoundException):
+            decoder.read(42)
+
+    def test_full_scale_features_are_unchanged_by_the_crop(self):
+        processor = GalaxyProcessor(self.directory)
+        full = cv2.imread(self.directory + "1.jpg")
+
+        np.testing.assert_array_equal(processor.get_features(1), processor.compute_features({1: full}))
+
+    def test_features_match_the_full_decode_path(self):
+        # The original code decoded the whole image, then cropped every feature around the pixel (212, 212).
+        processor = GalaxyProcessor(self.directory, features=("ratio", "circularity", "ccv"))
+
+        for img_id in range(3):
+            full = cv2.imread(self.directory + str(img_id) + ".jpg")
+            expected = np.append([baseline_ratio(full), baseline_circularity(full)], baseline_ccv(full))
+            np.testing.assert_allclose(processor.get_features(img_id), expected, rtol=1e-6)
+
+    def test_benchmark_policies(self):
+        processor = GalaxyProcessor(self.directory)
+        results = benchmark_policies(processor, range(3), {"fast": {"ratio": 2, "circularity": 2, "ccv": 4}})
+
+        self.assertEqual(set(results), {"fast", "full_scale"})
+        self.assertEqual(results["full_scale"]["drift"], {"ratio": 0.0, "circularity": 0.0, "ccv": 0.0})
+        self.assertGreater(results["fast"]["decode_time"], 0.0)
+        self.assertLess(results["fast"]["drift"]["ratio"], 0.5)
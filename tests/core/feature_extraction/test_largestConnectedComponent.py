@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+import cv2
+import numpy as np
+import scipy.ndimage as nd
+
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+
+
+class TestLargestConnectedComponent(TestCase):
+
+    def setUp(self):
+        self.processor = GalaxyProcessor("")
+
+        # A large off-center blob, a smaller centered blob and noise.
+        self.image = np.zeros((200, 200))
+        cv2.circle(self.image, (40, 40), 30, 200, -1)
+        cv2.circle(self.image, (100, 100), 10, 100, -1)
+        rng = np.random.RandomState(0)
+        self.image[rng.rand(200, 200) < 0.05] = 50
+
+    def reference(self, image, labels, nb_labels):
+        """ Select the component with scipy.ndimage, one center at a time. """
+        sizes = np.bincount(labels.flatten(), minlength=nb_labels + 1)
+        centers = nd.center_of_mass(image, labels, range(1, nb_labels + 1))
+        distances = np.array([1.0] + [(image.shape[0] / 2 - x) ** 2 + (image.shape[1] / 2 - y) ** 2
+                                      for y, x in centers])
+        sizes[0] = 0
+        sizes[sizes < 20] = 0
+        return (labels == np.argmax(sizes / (distances + 0.000001))) * 255
+
+    def test_matches_center_of_mass(self):
+        labels, nb_labels = nd.label(self.image > 0)
+        thresholded = self.processor.largest_connected_component(self.image, labels, nb_labels)
+
+        np.testing.assert_array_equal(thresholded, self.reference(self.image, labels, nb_labels))
+        self.assertEqual(thresholded[100, 100], 255)
+
+    def test_opencv_stats(self):
+        nb_labels, labels, stats, centroids = cv2.connectedComponentsWithStats((self.image > 0).astype(np.uint8),
+                                                                               connectivity=4)
+        thresholded = self.processor.largest_connected_component(self.image, labels, nb_labels - 1, stats, centroids)
+
+        self.assertEqual(thresholded[100, 100], 255)
+        self.assertEqual(thresholded[40, 40], 0)
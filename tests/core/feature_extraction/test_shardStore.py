@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+import shutil
+import tempfile
+
+import numpy as np
+
+from commons.exceptions.fileNotFoundException import FileNotFoundException
+from commons.helpers.dataset.dataset import DataSet
+from core.feature_extraction.galaxy.galaxy_processor import GalaxyProcessor
+from core.feature_extraction.galaxy.image_decoder import GalaxyImageDecoder
+from core.feature_extraction.galaxy.shard_store import GalaxyShardWriter
+from tests.core.feature_extraction.galaxy_images import write_synthetic_galaxies
+
+
+class TestGalaxyShardStore(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp() + "/"
+        self.img_ids = [str(img_id) for img_id in range(100000, 100007)]
+
+        write_synthetic_galaxies(self.directory, self.img_ids)
+
+        self.store = GalaxyShardWriter(self.directory + "shards", images_per_shard=3).pack(self.directory, self.img_ids)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_read_packed_crops(self):
+        decoder = GalaxyImageDecoder(self.directory)
+
+        self.assertEqual(len(self.store), 7)
+        self.assertEqual(self.store.nb_shards, 3)
+        for img_id in self.img_ids:
+            np.testing.assert_array_equal(self.store.read(img_id), decoder.read(img_id))
+        self.assertEqual(self.store.read(100004, scale=2).shape, (150, 150, 3))
+
+        with self.assertRaises(FileNotFoundException):
+            self.store.read(42)
+
+    def test_processor_reads_from_shards(self):
+        from_jpeg = GalaxyProcessor(self.directory)
+        from_shards = GalaxyProcessor(self.directory, image_source=self.store)
+
+        for img_id in self.img_ids[:3]:
+            np.testing.assert_array_equal(from_shards.get_features(img_id), from_jpeg.get_features(img_id))
+
+    def test_load_images_from_shards(self):
+        batch = np.array(self.img_ids[::-1]).reshape(-1, 1)
+        images = DataSet().withImg_names(batch).load_images(batch, source=self.store)
+
+        self.assertEqual(images.shape, (7, 300, 300, 3))
+        self.assertEqual(images.dtype, np.float32)
+        np.testing.assert_allclose(images[0], self.store.read(self.img_ids[-1]) / 255.0, atol=1e-6)
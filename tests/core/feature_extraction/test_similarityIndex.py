@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+from collections import OrderedDict
+import shutil
+import tempfile
+
+import numpy as np
+
+from core.feature_extraction.galaxy.feature_registry import FeatureMatrix
+from core.feature_extraction.galaxy.similarity_index import SimilarityIndex
+
+
+class TestSimilarityIndex(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+        # Feature vectors of type [ratio, circularity, ccv], around 20 morphologies.
+        rng = np.random.RandomState(0)
+        prototypes = np.hstack((rng.rand(20, 2), rng.rand(20, 128) * 1000))
+        noise = np.hstack((rng.normal(0, 0.01, (5000, 2)), rng.normal(0, 10, (5000, 128))))
+        self.features = prototypes[rng.randint(0, 20, 5000)] + noise
+        self.ids = np.arange(100000, 105000)[rng.permutation(5000)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_query_matches_exhaustive_search(self):
+        index = SimilarityIndex.build(self.directory, self.features, self.ids, weights={"ccv": 2.0}, batch_size=1000,
+                                      random_state=0)
+        self.assertEqual(len(index), 5000)
+
+        queries = self.features[:20]
+        weighted = index.transform(self.features).astype(np.float64)
+        for query, (ids, distances) in zip(index.transform(queries), index.query(queries, k=5, nprobe=20)):
+            exhaustive = np.sqrt(((weighted - query) ** 2).sum(axis=1))
+            np.testing.assert_allclose(distances, np.sort(exhaustive)[:5], rtol=1e-3, atol=1e-3)
+
+    def test_query_ids(self):
+        SimilarityIndex.build(self.directory, self.features, self.ids, random_state=0)
+        index = SimilarityIndex(self.directory)
+
+        ids, distances = index.query_ids([self.ids[0]], k=3)[0]
+        self.assertNotIn(self.ids[0], ids)
+        self.assertEqual(ids.shape[0], 3)
+        self.assertTrue(np.all(np.diff(distances) >= 0))
+
+        with self.assertRaises(KeyError):
+            index.query_ids([1], k=3)
+
+    def test_blocks_from_feature_matrix(self):
+        columns = OrderedDict((("ratio", slice(0, 1)), ("gini", slice(1, 2)), ("ccv", slice(2, 130))))
+        index = SimilarityIndex.build(self.directory, FeatureMatrix(self.features, columns), self.ids,
+                                      weights={"gini": 4.0}, random_state=0)
+
+        self.assertEqual(index.meta["columns"], {"ratio": [0, 1], "gini": [1, 2], "ccv": [2, 130]})
+        weighted = index.transform(self.features).astype(np.float64)
+        np.testing.assert_allclose(weighted[:, 1].var(), 4.0, rtol=1e-3)
+        np.testing.assert_allclose(weighted[:, 2:].var(axis=0).sum(), 1.0, rtol=1e-3)
+
+    def test_blocks_must_match_the_features(self):
+        with self.assertRaises(ValueError):
+            SimilarityIndex.build(self.directory, self.features[:, :10], self.ids, random_state=0)
+
+        columns = OrderedDict((("ratio", slice(0, 1)), ("ccv", slice(1, 129))))
+        with self.assertRaises(ValueError):
+            SimilarityIndex.build(self.directory, FeatureMatrix(self.features, columns), self.ids, random_state=0)
+
+        with self.assertRaises(ValueError):
+            SimilarityIndex.build(self.directory, self.features, self.ids, weights={"gini": 2.0}, random_state=0)